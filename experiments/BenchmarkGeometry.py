@@ -0,0 +1,59 @@
+import time
+
+import networkx as nx
+import numpy as np
+from math import pi
+
+from gopt.circuit import Circuit
+from gopt.graph.GeometryLayer import GeometryLayer
+from gopt.graph.BitGeometryLayer import BitGeometryLayer
+
+
+def brickwork_graph(angle_matrix: np.ndarray) -> nx.Graph:
+    """
+    Reduced geometry of the random brickwork circuits used in RandomCircuit4
+    """
+    m, n = angle_matrix.shape
+    circuit = Circuit(n)
+    parity = 0
+    for i in range(0, m, 2):
+        for j in range(n):
+            circuit.add_rotation_sequence(j, [angle_matrix[i, j], angle_matrix[i + 1, j]])
+        if parity:
+            for j in range(1, n - 1, 2):
+                circuit.cz(j, j + 1)
+        else:
+            for j in range(0, n - 1, 2):
+                circuit.cz(j, j + 1)
+        parity ^= 1
+    graph = circuit.to_graph_state()
+    graph.eliminate_clifford()
+    return graph.geometry.G
+
+
+def lc_sweep(geometry: GeometryLayer, rounds: int) -> float:
+    """
+    Time the candidate loop of the DFS optimizers: LC, query, undo LC, for every node
+    """
+    nodes = geometry.nodes()
+    start_time = time.time()
+    for _ in range(rounds):
+        for node in nodes:
+            geometry.local_complement(node)
+            max_degree_nodes, _ = geometry.max_degree_nodes()
+            geometry.boundary_nodes(max_degree_nodes)
+            geometry.local_complement(node)
+    return time.time() - start_time
+
+
+rounds = 5
+rng = np.random.default_rng(0)
+for size in range(4, 22, 4):
+    angles = rng.random((1, 2 * size * size))
+    angle_matrix = (np.round(8 * angles - 4) * pi / 4).reshape(2 * size, size)
+    G = brickwork_graph(angle_matrix)
+
+    nx_time = lc_sweep(GeometryLayer(nx.Graph.copy(G)), rounds)
+    bit_time = lc_sweep(BitGeometryLayer(G), rounds)
+    print(f"{size}x{size}: {len(G.nodes())} nodes, {len(G.edges())} edges, "
+          f"networkx {nx_time:.3f}s, bit-packed {bit_time:.3f}s, speedup {nx_time / bit_time:.1f}x")
@@ -0,0 +1,70 @@
+import os
+import time
+
+import numpy as np
+from math import pi
+
+from gopt.circuit import Circuit
+from gopt.optimizers import LCSearch
+from gopt.optimizers.SearchStrategy import DepthFirst, BreadthFirst, BeamSearch, GreedyBestFirst
+
+
+def load_angle_matrix(m: int, n: int, seed: int = 0) -> np.ndarray:
+    """
+    Load the angle matrix of the isomorphism benchmark, generating it from a seed and saving it if missing
+    """
+    filename = f"benchmark/isomorphism/angles_iso_{m}_{n}.npy"
+    if os.path.exists(filename):
+        with open(filename, 'rb') as f:
+            return np.load(f)
+    angles = np.random.default_rng(seed).random((1, 2 * m * n))
+    angle_matrix = (np.round(8 * angles - 4) * pi / 4).reshape(2 * m, n)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'wb') as f:
+        np.save(f, angle_matrix)
+    return angle_matrix
+
+
+def reduced_graph_state(angle_matrix: np.ndarray):
+    """
+    Reduced graph state of the random brickwork circuits used in Isomorphism
+    """
+    m, n = angle_matrix.shape
+    circuit = Circuit(n)
+    parity = 0
+    for i in range(0, m, 2):
+        for j in range(n):
+            circuit.add_rotation_sequence(j, [angle_matrix[i, j], angle_matrix[i + 1, j]])
+        if parity:
+            for j in range(1, n - 1, 2):
+                circuit.cz(j, j + 1)
+        else:
+            for j in range(0, n - 1, 2):
+                circuit.cz(j, j + 1)
+        parity ^= 1
+    graph = circuit.to_graph_state()
+    graph.eliminate_clifford()
+    return graph
+
+
+max_depth = 1000
+strategies = {
+    "dfs": lambda: DepthFirst(),
+    "bfs": lambda: BreadthFirst(),
+    "beam-4": lambda: BeamSearch(width=4),
+    "beam-16": lambda: BeamSearch(width=16),
+    "greedy-best-first": lambda: GreedyBestFirst(max_frontier=256),
+}
+for size in (6, 8, 10):
+    angle_matrix = load_angle_matrix(size, size)
+    root_size = reduced_graph_state(angle_matrix).schedule()[1]
+    print(f"{size}x{size}: register size {root_size} before optimization")
+    for name, strategy in strategies.items():
+        graph = reduced_graph_state(angle_matrix)
+        search = LCSearch(graph, objective='reg_size', strategy=strategy(), max_depth=max_depth, rev=True)
+        start_time = time.time()
+        search.execute()
+        peak = getattr(search.strategy, "peak_frontier", "-")
+        print(f"  {name:>17}: register size {search.min_reg_size}, edges {search.min_edge_size}, "
+              f"LC sequence length {len(search.optimized_lc_sequence())}, peak frontier {peak}, "
+              f"time {time.time() - start_time:.2f}s")
@@ -13,17 +13,12 @@ def is_pauli_angle(angle: float) -> bool:
 
 def process_outcomes(outome_counts: Dict[str, int], creg_map: Dict[any, int],
                      outputs: List[any]):
-    output_reg = [creg_map[node] for node in outputs]
-    processed_counts: Dict[str, int] = dict()
-    for word, count in outome_counts.items():
-        masked_word = ''
-        for reg_id in output_reg:
-            masked_word += word[::-1][reg_id]
-        if masked_word in processed_counts:
-            processed_counts[masked_word] += count
-        else:
-            processed_counts[masked_word] = count
-    return processed_counts
+    """
+    Project measurement outcomes onto some outputs, the first output as the first character.
+    :param outome_counts: counts of bitstrings, or raw shots as packed words or a bit matrix, see OutcomeCounter.
+    """
+    from .graph.OutcomeCounter import OutcomeCounter
+    return OutcomeCounter([creg_map[node] for node in outputs], first_last=False).process(outome_counts)
 
 
 def dependency_map(dependency_graph) -> Dict[any, Set[any]]:
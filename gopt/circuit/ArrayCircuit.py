@@ -0,0 +1,183 @@
+from math import pi
+from typing import List, Tuple
+
+import numpy as np
+
+from .Circuit import Circuit
+
+
+class ArrayCircuit(Circuit):
+    """
+    Array-backed circuit with batched gate application.
+    Angles are kept in one NumPy buffer row per wire. Correction sources are integer indexed and the
+    correction frame of each wire is a pair of bit rows packed little-endian over the sources, the X
+    and the Z parts: a frame update of Circuit is then a XOR of rows, a Hadamard swaps the rows and
+    a quarter turn about Z adds the X row to the Z row. Signs are not tracked as they never reach the
+    dependencies. Sources are numbered and dependencies ordered as the gate-by-gate path would create
+    them, so to_graph_state gives the same graph state as Circuit does for the same gates.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.angles: np.ndarray = np.zeros((size, 16))
+        self.stack_ptrs: np.ndarray = np.ones(size, dtype=np.int64)
+        self.x_bits: np.ndarray = np.zeros((size, 8), dtype=np.uint8)
+        self.z_bits: np.ndarray = np.zeros((size, 8), dtype=np.uint8)
+        self.source_wires: np.ndarray = np.zeros(64, dtype=np.int64)
+        self.source_ptrs: np.ndarray = np.zeros(64, dtype=np.int64)
+        self.n_sources: int = 0
+
+        # Chunks of (control wires, control pointers, target wires, target pointers) in gate order
+        self._edges: List[Tuple[np.ndarray, ...]] = []
+        # Chunks of (sources, target wires, target pointers) in gate order
+        self._dependencies: List[Tuple[np.ndarray, ...]] = []
+        self._finalized = False
+
+    def _reserve(self, depth: int, sources: int) -> None:
+        """
+        Grow the buffers to hold the given number of nodes per wire and of sources.
+        """
+        if depth > self.angles.shape[1]:
+            angles = np.zeros((self.size, max(depth, 2 * self.angles.shape[1])))
+            angles[:, :self.angles.shape[1]] = self.angles
+            self.angles = angles
+        if sources > 8 * self.x_bits.shape[1]:
+            width = max((sources + 7) // 8, 2 * self.x_bits.shape[1])
+            for name in ("x_bits", "z_bits"):
+                bits = np.zeros((self.size, width), dtype=np.uint8)
+                bits[:, :getattr(self, name).shape[1]] = getattr(self, name)
+                setattr(self, name, bits)
+        if sources > len(self.source_wires):
+            length = max(sources, 2 * len(self.source_wires))
+            self.source_wires = np.resize(self.source_wires, length)
+            self.source_ptrs = np.resize(self.source_ptrs, length)
+
+    def _sources(self, bits: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        Get the set bits of some frame rows.
+        :return: row and source index of each set bit
+        """
+        rows, sources = np.nonzero(np.unpackbits(bits, axis=1, count=self.n_sources, bitorder='little'))
+        return rows, sources
+
+    def add_layer(self, angles: np.ndarray, wires: np.ndarray = None) -> None:
+        """
+        Add a series of rotations to several wires at once, alternating in Z and X base.
+        Same as add_rotation_sequence on each wire in turn.
+        :param angles: rotation angles, one row per wire or a single angle per wire.
+        :param wires: the qubit indices to rotate, all of them by default.
+        """
+        wires = np.arange(self.size) if wires is None else np.asarray(wires, dtype=np.int64)
+        angles = np.asarray(angles, dtype=float).reshape(len(wires), -1)
+        if len(np.unique(wires)) != len(wires):
+            raise ValueError("Wires of a layer must be distinct")
+        pauli = np.mod(angles, pi / 2) == 0
+        odd = (np.rint(angles / (pi / 2)).astype(np.int64) & 1).astype(bool) & pauli
+        # Number the new sources wire by wire as the gate-by-gate path would
+        new_sources = self.n_sources + np.cumsum(~pauli).reshape(pauli.shape) - 1
+        total = self.n_sources + int(np.count_nonzero(~pauli))
+        self._reserve(int(self.stack_ptrs[wires].max()) + angles.shape[1] + 1, total)
+        self.n_sources = total
+
+        positions = np.arange(len(wires))
+        ptrs = self.stack_ptrs[wires]
+        dependencies = []
+        for k in range(angles.shape[1]):
+            self.angles[wires, ptrs] = angles[:, k]
+            # Propagate corrections through Pauli rotations
+            rows = wires[odd[:, k]]
+            self.z_bits[rows] ^= self.x_bits[rows]
+            # Add dependencies on the sources in X or Y base if non-Pauli
+            rows = wires[~pauli[:, k]]
+            if len(rows):
+                i, sources = self._sources(self.x_bits[rows])
+                dependencies.append((sources, positions[~pauli[:, k]][i], self.stack_ptrs[rows][i]))
+                # Add new correction sources in Z base
+                ids = new_sources[~pauli[:, k], k]
+                self.source_wires[ids] = rows
+                self.source_ptrs[ids] = self.stack_ptrs[rows]
+                self.z_bits[rows, ids >> 3] |= (1 << (ids & 7)).astype(np.uint8)
+            # Rotate upon Hadamard
+            self.x_bits[wires], self.z_bits[wires] = self.z_bits[wires], self.x_bits[wires].copy()
+            ptrs = ptrs + 1
+            self.stack_ptrs[wires] = ptrs
+        self._add_dependencies(dependencies, wires)
+
+    def _add_dependencies(self, dependencies: List[Tuple[np.ndarray, ...]], wires: np.ndarray) -> None:
+        """
+        Record the dependencies added by a layer.
+        :param dependencies: chunks of (sources, positions of the target wires, target pointers).
+        :param wires: the wires of the layer.
+        """
+        if not dependencies:
+            return
+        sources, positions, ptrs = (np.concatenate(arrays) for arrays in zip(*dependencies))
+        # Wire by wire as the gate-by-gate path would
+        order = np.lexsort((ptrs, positions))
+        self._dependencies.append((sources[order], wires[positions[order]], ptrs[order]))
+
+    def add_rotation_sequence(self, wire_id: int, angles: list[float]) -> None:
+        if len(angles):
+            self.add_layer(np.asarray(angles, dtype=float).reshape(1, -1), [wire_id])
+
+    def cz_layer(self, pairs) -> None:
+        """
+        Add CZ gates on pairs of wires at once, same as cz on each pair in turn.
+        :param pairs: (control, target) pairs of wires.
+        """
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        if not len(pairs):
+            return
+        controls, targets = pairs[:, 0], pairs[:, 1]
+        self._edges.append((controls, self.stack_ptrs[controls], targets, self.stack_ptrs[targets]))
+        # CZ leaves the X rows, so every pair reads the same rows and the updates commute
+        x_controls, x_targets = self.x_bits[controls], self.x_bits[targets]
+        np.bitwise_xor.at(self.z_bits, targets, x_controls)
+        np.bitwise_xor.at(self.z_bits, controls, x_targets)
+
+    def cz(self, control_id: int, target_id: int):
+        self.cz_layer([(control_id, target_id)])
+
+    def cnot(self, control_id: int, target_id: int) -> None:
+        self._edges.append((np.array([control_id]), self.stack_ptrs[[control_id]],
+                            np.array([target_id]), self.stack_ptrs[[target_id]] - 1))
+        self.x_bits[target_id] ^= self.x_bits[control_id]
+        self.z_bits[control_id] ^= self.z_bits[target_id]
+        # Add margin
+        self.add_rotation_sequence(target_id, [0, 0])
+        self.add_rotation_sequence(control_id, [0, 0])
+
+    def add_outputs(self) -> None:
+        if self._finalized:
+            return
+        self._reserve(int(self.stack_ptrs.max()) + 1, self.n_sources)
+        wires, sources = self._sources(self.x_bits)
+        self._add_dependencies([(sources, wires, self.stack_ptrs[wires])], np.arange(self.size))
+        self._finalized = True
+
+    def to_circuit(self) -> Circuit:
+        """
+        Convert to a gate-by-gate circuit holding the same cluster and dependencies.
+        Its correction frames are left empty, so no more gates should be added to it; the output
+        dependencies are only included once add_outputs has been called here.
+        """
+        retval = Circuit(self.size)
+        ptrs = self.stack_ptrs.tolist()
+        retval.stack_ptrs = list(ptrs)
+        retval.cluster_stacks = [self.angles[i, :ptrs[i]].tolist() for i in range(self.size)]
+        for controls, control_ptrs, targets, target_ptrs in self._edges:
+            for c, p, t, q in zip(controls.tolist(), control_ptrs.tolist(), targets.tolist(), target_ptrs.tolist()):
+                retval.entanglement_edges.add(((c, p), (t, q)))
+        labels = list(zip(self.source_wires[:self.n_sources].tolist(), self.source_ptrs[:self.n_sources].tolist()))
+        retval.dependencies = {label: set() for label in labels}
+        for sources, wires, ptrs in self._dependencies:
+            for s, w, p in zip(sources.tolist(), wires.tolist(), ptrs.tolist()):
+                retval.dependencies[labels[s]].add((w, p))
+        return retval
+
+    def to_graph_state(self):
+        self.add_outputs()
+        return self.to_circuit().to_graph_state()
+
+    def save(self, filename):
+        self.to_circuit().save(filename)
@@ -3,7 +3,7 @@ import networkx as nx
 
 from ..graph import GraphState
 from ..Utils import is_pauli_angle
-from ..core import BlochSphere
+from ..core.PauliFrame import PauliFrame, ROTATIONS, H, quarter_turns
 
 
 class Circuit:
@@ -16,7 +16,7 @@ class Circuit:
         self.cluster_stacks: list[list[float]] = [[0] for _ in range(size)]
         self.stack_ptrs: list[int] = [1] * size
         self.entanglement_edges: set[((int, int), (int, int))] = set()
-        self.corrections: list[dict[(int, int), BlochSphere]] = [dict() for _ in range(size)]
+        self.corrections: list[PauliFrame] = [PauliFrame() for _ in range(size)]
         self.dependencies: dict[(int, int), set[(int, int)]] = dict()
 
         self._finalized = False
@@ -32,22 +32,20 @@ class Circuit:
             # Process corrections
             if is_pauli_angle(angle):
                 # Propagate corrections if Pauli
-                for source in self.corrections[wire_id].keys():
-                    self.corrections[wire_id][source].rotate_z(-angle)
-                    self.corrections[wire_id][source].rotate_h()
+                self.corrections[wire_id].transform(ROTATIONS['z'][quarter_turns(-angle)])
+                self.corrections[wire_id].transform(H)
             else:
                 # Add dependencies if non-Pauli
-                for source, correction in self.corrections[wire_id].items():
-                    if correction.pauli_base() != 'z':
+                for source in self.corrections[wire_id].keys():
+                    if self.corrections[wire_id].pauli_base(source) != 'z':
                         self.dependencies[source].add(
                             (wire_id, self.stack_ptrs[wire_id]))
                 # Add new correction source
                 new_source = (wire_id, self.stack_ptrs[wire_id])
-                self.corrections[wire_id][new_source] = BlochSphere('z')
+                self.corrections[wire_id].add(new_source, 'z')
                 self.dependencies[new_source] = set()
                 # Rotate upon Hadamard
-                for source in self.corrections[wire_id].keys():
-                    self.corrections[wire_id][source].rotate_h()
+                self.corrections[wire_id].transform(H)
             # Update stack pointer
             self.stack_ptrs[wire_id] += 1
 
@@ -61,24 +59,24 @@ class Circuit:
              (target_id, self.stack_ptrs[target_id] - 1))
         )
         # Process corrections
-        for source, correction in list(self.corrections[control_id].items()):
-            if correction.pauli_base() != 'z':
+        for source in list(self.corrections[control_id].keys()):
+            if self.corrections[control_id].pauli_base(source) != 'z':
                 if source in self.corrections[target_id]:
-                    if self.corrections[target_id][source].pauli_base() == 'x':
+                    if self.corrections[target_id].pauli_base(source) == 'x':
                         self.corrections[target_id].pop(source)
                     else:
-                        self.corrections[target_id][source].rotate_sqrt_x(1)
+                        self.corrections[target_id].rotate_sqrt_x(source, 1)
                 else:
-                    self.corrections[target_id][source] = BlochSphere('x')
-        for source, correction in list(self.corrections[target_id].items()):
-            if correction.pauli_base() != 'x':
+                    self.corrections[target_id].add(source, 'x')
+        for source in list(self.corrections[target_id].keys()):
+            if self.corrections[target_id].pauli_base(source) != 'x':
                 if source in self.corrections[control_id]:
-                    if self.corrections[control_id][source].pauli_base() == 'z':
+                    if self.corrections[control_id].pauli_base(source) == 'z':
                         self.corrections[control_id].pop(source)
                     else:
-                        self.corrections[control_id][source].rotate_sqrt_z(1)
+                        self.corrections[control_id].rotate_sqrt_z(source, 1)
                 else:
-                    self.corrections[control_id][source] = BlochSphere('z')
+                    self.corrections[control_id].add(source, 'z')
         # Add margin
         self.add_rotation_sequence(target_id, [0, 0])
         self.add_rotation_sequence(control_id, [0, 0])
@@ -93,24 +91,24 @@ class Circuit:
              (target_id, self.stack_ptrs[target_id]))
         )
         # Process corrections
-        for source, correction in list(self.corrections[control_id].items()):
-            if correction.pauli_base() != 'z':
+        for source in list(self.corrections[control_id].keys()):
+            if self.corrections[control_id].pauli_base(source) != 'z':
                 if source in self.corrections[target_id]:
-                    if self.corrections[target_id][source].pauli_base() == 'z':
+                    if self.corrections[target_id].pauli_base(source) == 'z':
                         self.corrections[target_id].pop(source)
                     else:
-                        self.corrections[target_id][source].rotate_sqrt_z(1)
+                        self.corrections[target_id].rotate_sqrt_z(source, 1)
                 else:
-                    self.corrections[target_id][source] = BlochSphere('z')
-        for source, correction in list(self.corrections[target_id].items()):
-            if correction.pauli_base() != 'z':
+                    self.corrections[target_id].add(source, 'z')
+        for source in list(self.corrections[target_id].keys()):
+            if self.corrections[target_id].pauli_base(source) != 'z':
                 if source in self.corrections[control_id]:
-                    if self.corrections[control_id][source].pauli_base() == 'z':
+                    if self.corrections[control_id].pauli_base(source) == 'z':
                         self.corrections[control_id].pop(source)
                     else:
-                        self.corrections[control_id][source].rotate_sqrt_z(1)
+                        self.corrections[control_id].rotate_sqrt_z(source, 1)
                 else:
-                    self.corrections[control_id][source] = BlochSphere('z')
+                    self.corrections[control_id].add(source, 'z')
 
     def rx(self, wire_id: int, angle: float) -> None:
         """
@@ -170,8 +168,8 @@ class Circuit:
         else:
             for i in range(self.size):
                 # Process measurement dependencies
-                for source, correction in self.corrections[i].items():
-                    if correction.pauli_base() != 'z':
+                for source in self.corrections[i].keys():
+                    if self.corrections[i].pauli_base(source) != 'z':
                         self.dependencies[source].add((i, self.stack_ptrs[i]))
                 self._finalized = True
 
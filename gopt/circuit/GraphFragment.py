@@ -0,0 +1,28 @@
+from typing import Dict, List, Set, Tuple
+
+
+class GraphFragment:
+    """
+    A piece of a reduced graph state emitted by a streaming circuit.
+    Nodes are emitted once and never change afterwards. An edge is emitted with the first of its two
+    nodes, so it may lead to a node of a later fragment. Dependencies are emitted with their targets,
+    sources may belong to any fragment or be parity sources. A parity source stands for the XOR of the
+    outcomes of its members and is emitted before or with the first dependency on it.
+    """
+
+    def __init__(self) -> None:
+        # Measurement base of each node, as saved by MeasurementBaseLayer.save
+        self.bases: Dict[any, any] = dict()
+        # Correction frame code of each node with dependencies
+        self.corrections: Dict[any, int] = dict()
+        self.edges: List[Tuple[any, any]] = []
+        self.dependencies: Dict[any, Set[any]] = dict()
+        self.outputs: List[any] = []
+        # Members of each parity source defined since the previous fragment, nodes or earlier parity sources
+        self.parities: Dict[any, Set[any]] = dict()
+
+    def nodes(self) -> List[any]:
+        return list(self.bases.keys())
+
+    def __len__(self) -> int:
+        return len(self.bases)
@@ -0,0 +1,77 @@
+import networkx as nx
+
+from ..graph import GraphState
+from .GraphFragment import GraphFragment
+
+
+class GraphStateSink:
+    """
+    Sink collecting the fragments of a streaming circuit back into a whole graph state.
+    Meant for circuits small enough to hold, other sinks only need an add method taking a fragment.
+    """
+
+    def __init__(self) -> None:
+        self.G: nx.Graph = nx.Graph()
+        self.bases: dict[any, any] = dict()
+        self.corrections: dict[any, int] = dict()
+        self.dependencies: dict[any, set[any]] = dict()
+        self.outputs: list[any] = []
+        self.parities: dict[any, set[any]] = dict()
+
+    def add(self, fragment: GraphFragment) -> None:
+        self.G.add_nodes_from(fragment.nodes())
+        self.G.add_edges_from(fragment.edges)
+        self.bases.update(fragment.bases)
+        self.corrections.update(fragment.corrections)
+        for target, sources in fragment.dependencies.items():
+            self.dependencies[target] = set(sources)
+        self.outputs.extend(fragment.outputs)
+        self.parities.update(fragment.parities)
+
+    def _expand(self) -> dict[any, set[any]]:
+        """
+        Expand the parity sources of the dependencies into nodes, members appearing an even number of times
+        cancel out.
+        """
+        index: dict[any, int] = dict()
+        labels: list[any] = []
+
+        def word(source) -> int:
+            if source in words:
+                return words[source]
+            if source not in index:
+                index[source] = len(labels)
+                labels.append(source)
+            return 1 << index[source]
+
+        # Members are defined before their parity sources, so a single pass in order resolves them all
+        words: dict[any, int] = dict()
+        for parity, members in self.parities.items():
+            retval = 0
+            for member in members:
+                retval ^= word(member)
+            words[parity] = retval
+        dependencies = dict()
+        for target, sources in self.dependencies.items():
+            retval = 0
+            for source in sources:
+                retval ^= word(source)
+            dependencies[target] = set()
+            while retval:
+                low = retval & -retval
+                dependencies[target].add(labels[low.bit_length() - 1])
+                retval ^= low
+        return dependencies
+
+    def to_graph_state(self) -> GraphState:
+        """
+        Assemble the fragments received so far into a graph state.
+        """
+        dependencies = self._expand()
+        graph_state = GraphState(self.G.copy(), dependencies, {label: 0 for label in self.bases},
+                                 list(self.outputs))
+        for label, state in self.bases.items():
+            graph_state.bases.restore(label, state)
+        for label, code in self.corrections.items():
+            graph_state.dependency.restore(label, code)
+        return graph_state
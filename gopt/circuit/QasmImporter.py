@@ -0,0 +1,347 @@
+import ast
+import math
+import operator
+import re
+from math import pi
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from .Circuit import Circuit
+
+_BINARY = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+           ast.Pow: operator.pow}
+_UNARY = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+_FUNCTIONS = {'sin': math.sin, 'cos': math.cos, 'tan': math.tan, 'exp': math.exp, 'ln': math.log,
+              'sqrt': math.sqrt, 'asin': math.asin, 'acos': math.acos, 'atan': math.atan}
+_CONSTANTS = {'pi': pi, 'π': pi, 'tau': 2 * pi, 'τ': 2 * pi, 'euler': math.e, 'ℇ': math.e}
+# Statements without any effect on the cluster
+_IGNORED = {'OPENQASM', 'include', 'creg', 'bit', 'barrier', 'measure', 'id', 'gphase', 'opaque'}
+
+
+class QasmImporter:
+    """
+    OpenQASM 2 and 3 importer feeding gates straight into a circuit.
+    The source is read line by line and every gate is decomposed into the gates of Circuit as soon as
+    its statement is complete, so no intermediate circuit object is built. Supported are the gates of
+    qelib1.inc and stdgates.inc up to three qubits that are made of Clifford+rotation gates (h, x, y, z,
+    s, sdg, t, tdg, sx, sxdg, rx, ry, rz, p, u1, u2, u3, U, cx, cy, cz, cp, crz, swap, ccx), register
+    broadcasting and user gate definitions. Classical control, resets and loops are not supported.
+    Measurements are ignored, every qubit is an output of the circuit.
+    Controlled phases follow controlled_phase of experiments/Toffoli.py, all gates are exact up to a
+    global phase.
+    """
+
+    def __init__(self) -> None:
+        self.registers: Dict[str, Tuple[int, int]] = dict()  # name to offset and size
+        self.size: int = 0
+        self.definitions: Dict[str, Tuple[List[str], List[str], List[str]]] = dict()
+        self.line: int = 0
+        self._started = False
+
+    def read(self, filename: str, circuit_factory: Callable[[int], Circuit] = Circuit) -> Circuit:
+        """
+        Import a QASM file.
+        :param filename: path to the file.
+        :param circuit_factory: builds the circuit from the number of qubits, e.g. ArrayCircuit or
+            a StreamingCircuit with its sink.
+        :return: the circuit with all the gates of the file
+        """
+        with open(filename) as file:
+            return self.load(file, circuit_factory)
+
+    def loads(self, source: str, circuit_factory: Callable[[int], Circuit] = Circuit) -> Circuit:
+        return self.load(source.splitlines(), circuit_factory)
+
+    def load(self, lines: Iterable[str], circuit_factory: Callable[[int], Circuit] = Circuit) -> Circuit:
+        """
+        Import QASM source lines.
+        :return: the circuit with all the gates of the source
+        """
+        circuit = None
+        for name, *args in self.gates(lines):
+            if circuit is None:
+                circuit = circuit_factory(self.size)
+            getattr(circuit, name)(*args)
+        return circuit if circuit is not None else circuit_factory(self.size)
+
+    def gates(self, lines: Iterable[str]) -> Iterator[tuple]:
+        """
+        Translate QASM source lines into gates of Circuit.
+        The registers have to be declared before the first gate, the size is known from then on.
+        :param lines: source lines, e.g. an open file.
+        :return: generator of tuples of a Circuit method name and its arguments
+        """
+        for statement in self.statements(lines):
+            yield from self._statement(statement)
+
+    def statements(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Split source lines into statements, gate definitions included with their bodies.
+        """
+        buffer = ''
+        comment = False
+        for self.line, line in enumerate(lines, 1):
+            if comment:
+                if '*/' not in line:
+                    continue
+                line = line[line.index('*/') + 2:]
+                comment = False
+            line = re.sub(r'/\*.*?\*/', ' ', line.split('//')[0])
+            if '/*' in line:
+                line, comment = line[:line.index('/*')], True
+            buffer += ' ' + line
+            while True:
+                stripped = buffer.lstrip()
+                if re.match(r'gate\b', stripped):
+                    end = stripped.find('}')
+                else:
+                    end = stripped.find(';')
+                if end < 0:
+                    break
+                buffer = stripped[end + 1:]
+                if stripped[:end + 1].strip() != ';':
+                    yield stripped[:end + 1].strip()
+        if buffer.strip():
+            raise ValueError(f"Unterminated statement at line {self.line}: {buffer.strip()}")
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"{message} at line {self.line}")
+
+    def _statement(self, statement: str) -> Iterator[tuple]:
+        keyword = re.match(r'[A-Za-z_]\w*', statement)
+        keyword = keyword.group(0) if keyword else ''
+        if keyword in ('qreg', 'qubit'):
+            self._declare(statement)
+        elif keyword == 'gate':
+            self._define(statement)
+        elif keyword in _IGNORED or re.match(r'[\w\[\]\s]+=\s*measure\b', statement):
+            return
+        elif keyword in ('reset', 'if', 'for', 'while', 'def', 'let', 'input', 'output', 'const') or \
+                '@' in statement:
+            raise self._error(f"Unsupported statement {keyword}")
+        else:
+            name, params, args = self._split(statement)
+            params = [self.evaluate(param) for param in params]
+            operands = [self._operand(arg) for arg in args]
+            self._started = True
+            # Broadcast over whole registers
+            width = max(len(operand) for operand in operands) if operands else 0
+            if any(len(operand) not in (1, width) for operand in operands):
+                raise self._error(f"Registers of different sizes in {name}")
+            for i in range(width):
+                qubits = [operand[i] if len(operand) > 1 else operand[0] for operand in operands]
+                yield from self._gate(name, params, qubits)
+
+    def _declare(self, statement: str) -> None:
+        if self._started:
+            raise self._error("Registers have to be declared before the first gate")
+        match = re.fullmatch(r'qreg\s+(\w+)\s*\[\s*(\d+)\s*\]\s*;', statement) or \
+            re.fullmatch(r'qubit\s*\[\s*(\d+)\s*\]\s*(\w+)\s*;', statement) or \
+            re.fullmatch(r'qubit\s+(\w+)\s*;', statement)
+        if match is None:
+            raise self._error(f"Invalid declaration {statement}")
+        groups = match.groups()
+        if statement.startswith('qreg'):
+            name, size = groups[0], int(groups[1])
+        elif len(groups) == 2:
+            name, size = groups[1], int(groups[0])
+        else:
+            name, size = groups[0], 1
+        self.registers[name] = (self.size, size)
+        self.size += size
+
+    def _define(self, statement: str) -> None:
+        match = re.fullmatch(r'gate\s+(\w+)\s*(?:\(([^)]*)\))?\s*([^{]*)\{(.*)\}', statement, re.S)
+        if match is None:
+            raise self._error(f"Invalid gate definition {statement}")
+        name, params, args, body = match.groups()
+        params = [param.strip() for param in (params or '').split(',') if param.strip()]
+        args = [arg.strip() for arg in args.split(',') if arg.strip()]
+        body = [line.strip() for line in body.split(';') if line.strip()]
+        self.definitions[name] = (params, args, body)
+
+    @staticmethod
+    def _split(statement: str) -> (str, List[str], List[str]):
+        """
+        Split a gate statement into its name, parameter expressions and operands.
+        """
+        match = re.fullmatch(r'([A-Za-z_]\w*)\s*(?:\((.*)\))?\s*([^()]*?)\s*;?', statement, re.S)
+        if match is None:
+            raise ValueError(f"Invalid statement {statement}")
+        name, params, args = match.groups()
+        params = QasmImporter._split_params(params) if params else []
+        args = [arg.strip() for arg in args.split(',') if arg.strip()]
+        return name, params, args
+
+    @staticmethod
+    def _split_params(params: str) -> List[str]:
+        # Split on the commas outside of parentheses
+        retval, depth, start = [], 0, 0
+        for i, char in enumerate(params):
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                retval.append(params[start:i])
+                start = i + 1
+        retval.append(params[start:])
+        return [param.strip() for param in retval if param.strip()]
+
+    def _operand(self, arg: str) -> List[int]:
+        match = re.fullmatch(r'(\w+)\s*(?:\[\s*(\d+)\s*\])?', arg)
+        if match is None or match.group(1) not in self.registers:
+            raise self._error(f"Unknown qubit {arg}")
+        offset, size = self.registers[match.group(1)]
+        if match.group(2) is None:
+            return list(range(offset, offset + size))
+        index = int(match.group(2))
+        if index >= size:
+            raise self._error(f"Qubit {arg} out of range")
+        return [offset + index]
+
+    def evaluate(self, expression: str, variables: Dict[str, float] = None) -> float:
+        """
+        Safely evaluate a parameter expression.
+        :param expression: arithmetic over numbers, pi and the usual functions.
+        :param variables: values of the gate parameters in scope.
+        """
+        variables = variables or dict()
+
+        def visit(node):
+            if isinstance(node, ast.Expression):
+                return visit(node.body)
+            elif isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+                return node.value
+            elif isinstance(node, ast.Name):
+                if node.id in variables:
+                    return variables[node.id]
+                elif node.id in _CONSTANTS:
+                    return _CONSTANTS[node.id]
+            elif isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+                return _BINARY[type(node.op)](visit(node.left), visit(node.right))
+            elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+                return _UNARY[type(node.op)](visit(node.operand))
+            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and \
+                    node.func.id in _FUNCTIONS and len(node.args) == 1:
+                return _FUNCTIONS[node.func.id](visit(node.args[0]))
+            raise self._error(f"Invalid expression {expression}")
+
+        try:
+            tree = ast.parse(expression.replace('^', '**'), mode='eval')
+        except SyntaxError:
+            raise self._error(f"Invalid expression {expression}")
+        return visit(tree)
+
+    def _gate(self, name: str, params: List[float], qubits: List[int]) -> Iterator[tuple]:
+        """
+        Decompose a gate into gates of Circuit.
+        """
+        if name in self.definitions:
+            names, args, body = self.definitions[name]
+            if len(names) != len(params) or len(args) != len(qubits):
+                raise self._error(f"Wrong number of arguments to {name}")
+            variables = dict(zip(names, params))
+            mapping = dict(zip(args, qubits))
+            for statement in body:
+                inner, inner_params, inner_args = self._split(statement)
+                if inner in _IGNORED:
+                    continue
+                try:
+                    inner_qubits = [mapping[arg] for arg in inner_args]
+                except KeyError:
+                    raise self._error(f"Unknown argument in the definition of {name}")
+                yield from self._gate(inner, [self.evaluate(param, variables) for param in inner_params],
+                                      inner_qubits)
+            return
+        arity = _ARITY.get(name)
+        if arity is None:
+            raise self._error(f"Unsupported gate {name}")
+        if arity != (len(params), len(qubits)):
+            raise self._error(f"Wrong number of arguments to {name}")
+        if len(set(qubits)) != len(qubits):
+            raise self._error(f"Repeated qubit in {name}")
+        if name in _SINGLE:
+            yield (_SINGLE[name], *qubits)
+        elif name in ('rx', 'rz'):
+            yield name, qubits[0], params[0]
+        elif name in ('p', 'u1', 'phase'):
+            yield 'rz', qubits[0], params[0]
+        elif name == 'y':
+            yield 'z', qubits[0]
+            yield 'x', qubits[0]
+        elif name == 'sx':
+            yield 'rx', qubits[0], pi / 2
+        elif name == 'sxdg':
+            yield 'rx', qubits[0], -pi / 2
+        elif name == 'ry':
+            yield from self._ry(qubits[0], params[0])
+        elif name in ('u', 'U', 'u3'):
+            yield from self._u(qubits[0], *params)
+        elif name == 'u2':
+            yield from self._u(qubits[0], pi / 2, *params)
+        elif name in ('cx', 'CX', 'cnot'):
+            yield 'cnot', qubits[0], qubits[1]
+        elif name == 'cz':
+            yield 'cz', qubits[0], qubits[1]
+        elif name == 'cy':
+            yield 's_dagger', qubits[1]
+            yield 'cnot', qubits[0], qubits[1]
+            yield 's', qubits[1]
+        elif name == 'swap':
+            yield 'cnot', qubits[0], qubits[1]
+            yield 'cnot', qubits[1], qubits[0]
+            yield 'cnot', qubits[0], qubits[1]
+        elif name == 'crz':
+            yield from self._crz(qubits[0], qubits[1], params[0])
+        elif name in ('cp', 'cu1', 'cphase'):
+            yield from self._crz(qubits[0], qubits[1], params[0])
+            yield 'rz', qubits[0], params[0] / 2
+        elif name in ('ccx', 'toffoli'):
+            yield from self._ccx(*qubits)
+
+    @staticmethod
+    def _ry(qubit: int, angle: float) -> Iterator[tuple]:
+        yield 's_dagger', qubit
+        yield 'rx', qubit, angle
+        yield 's', qubit
+
+    @staticmethod
+    def _u(qubit: int, theta: float, phi: float, lam: float) -> Iterator[tuple]:
+        yield 'rz', qubit, lam
+        yield from QasmImporter._ry(qubit, theta)
+        yield 'rz', qubit, phi
+
+    @staticmethod
+    def _crz(control: int, target: int, angle: float) -> Iterator[tuple]:
+        yield 'rz', target, angle / 2
+        yield 'cnot', control, target
+        yield 'rz', target, -angle / 2
+        yield 'cnot', control, target
+
+    @staticmethod
+    def _ccx(a: int, b: int, c: int) -> Iterator[tuple]:
+        yield 'h', c
+        yield 'cnot', b, c
+        yield 't_dagger', c
+        yield 'cnot', a, c
+        yield 't', c
+        yield 'cnot', b, c
+        yield 't_dagger', c
+        yield 'cnot', a, c
+        yield 't', b
+        yield 't', c
+        yield 'h', c
+        yield 'cnot', a, b
+        yield 't', a
+        yield 't_dagger', b
+        yield 'cnot', a, b
+
+
+_SINGLE = {'h': 'h', 'x': 'x', 'z': 'z', 's': 's', 'sdg': 's_dagger', 't': 't', 'tdg': 't_dagger'}
+# Number of parameters and qubits of each gate
+_ARITY = {**{name: (0, 1) for name in (*_SINGLE, 'y', 'sx', 'sxdg')},
+          **{name: (1, 1) for name in ('rx', 'ry', 'rz', 'p', 'u1', 'phase')},
+          'u': (3, 1), 'U': (3, 1), 'u3': (3, 1), 'u2': (2, 1),
+          **{name: (0, 2) for name in ('cx', 'CX', 'cnot', 'cz', 'cy', 'swap')},
+          **{name: (1, 2) for name in ('crz', 'cp', 'cu1', 'cphase')},
+          'ccx': (0, 3), 'toffoli': (0, 3)}
@@ -0,0 +1,280 @@
+from typing import Dict, Iterable, List, Set
+
+import networkx as nx
+
+from ..core.Exceptions import BaseException
+from ..core.PauliFrame import X_BIT, Z_BIT
+from ..graph import GraphState
+from .Circuit import Circuit
+from .GraphFragment import GraphFragment
+from .GraphStateSink import GraphStateSink
+
+
+class StreamingCircuit(Circuit):
+    """
+    Circuit that builds its reduced graph state on the fly and hands it to a sink in fragments,
+    so that memory is bounded by the active frontier rather than the circuit depth.
+    Only a window of the cluster is held as a graph state. Node (i, j) is final once wire i has
+    moved past (i, j + 1), since gates only ever attach to the last two nodes of a wire.
+    Eliminating a Pauli node only touches nodes within distance 2 of it, so a Pauli node is eliminated as
+    soon as all of them are final. A node is emitted once every node within the horizon is final and
+    not a pending Pauli node; emitted nodes are never touched again; an elimination that would have to
+    touch one raises instead, which calls for a larger horizon.
+    The correction frames of the wires are tracked as in Circuit. Over GF(2) and up to signs they map the
+    outcomes of their sources linearly onto a Pauli per wire, so once a flush finds more than four sources
+    per wire they are folded into at most two parity sources per wire, labelled (k,), each standing for the
+    XOR of the outcomes of some earlier sources. Parity sources are emitted with the next fragment and only
+    ever appear in dependencies, so the frames and the dependency map stay bounded by the width.
+    """
+
+    def __init__(self, size, sink=None, horizon: int = 3, batch: int = None):
+        """
+        :param size: number of qubits.
+        :param sink: object whose add method receives each GraphFragment, a GraphStateSink by default.
+        :param horizon: distance to the frontier and pending Pauli nodes before a node is emitted, at least 2.
+        :param batch: number of nodes to finalize between eliminations and emissions, the size by default.
+        """
+        if horizon < 2:
+            raise ValueError("The horizon must be at least 2")
+        self.sink = sink if sink is not None else GraphStateSink()
+        self.horizon = horizon
+        self.batch = batch if batch is not None else size
+        # Window of the cluster not emitted yet, outputs kept in wire order
+        self.window: GraphState = GraphState(nx.Graph(), dict(), dict(), dict())
+        self.pending: Dict[any, None] = dict()  # Pauli nodes to eliminate, in order
+        self.emitted: int = 0
+        self.peak: int = 0  # largest window in nodes
+        self._ptrs: List[int] = [0] * size
+        self._emitted_degree: Dict[any, int] = dict()  # number of emitted neighbours of window nodes
+        self._closed = False
+        self._finalized_since_flush = 0
+        self._parities: Dict[any, Set[any]] = dict()  # parity sources not emitted yet
+        self._parity_count = 0
+        super().__init__(size)
+        self._sync(*range(size))
+
+    def add_rotation_sequence(self, wire_id: int, angles: list[float]) -> None:
+        super().add_rotation_sequence(wire_id, angles)
+        self._sync(wire_id)
+
+    def cnot(self, control_id: int, target_id: int) -> None:
+        super().cnot(control_id, target_id)
+        self._sync(control_id, target_id)
+
+    def cz(self, control_id: int, target_id: int):
+        super().cz(control_id, target_id)
+        self._sync(control_id, target_id)
+
+    def add_outputs(self) -> None:
+        if self._finalized:
+            return
+        super().add_outputs()
+        for i in range(self.size):
+            label = (i, self._ptrs[i])
+            self.window.bases.add(label, None)
+            self.window.output_layer[label] = None
+        self._sync(*range(self.size))
+
+    def consume(self, gates: Iterable[tuple]) -> 'StreamingCircuit':
+        """
+        Add gates from an iterable such as a generator, one at a time.
+        :param gates: tuples of a gate method name followed by its arguments, e.g. ('cnot', 0, 1).
+        :return: the circuit itself
+        """
+        for name, *args in gates:
+            getattr(self, name)(*args)
+        return self
+
+    def close(self):
+        """
+        Add the outputs, eliminate the remaining Pauli nodes and emit everything left.
+        :return: the sink
+        """
+        if not self._closed:
+            self.add_outputs()
+            self._closed = True
+            self.flush()
+        return self.sink
+
+    def to_graph_state(self) -> GraphState:
+        """
+        Close the stream and assemble the emitted fragments, the sink has to be a GraphStateSink.
+        """
+        return self.close().to_graph_state()
+
+    def save(self, filename):
+        raise BaseException("A streaming circuit does not keep its cluster, save the graph state of its sink "
+                            "instead")
+
+    def window_size(self) -> int:
+        return len(self.window.geometry.G)
+
+    def _sync(self, *wires: int) -> None:
+        """
+        Move the rotations, entanglement edges and dependencies recorded by Circuit into the window.
+        """
+        for i in wires:
+            count = self.stack_ptrs[i] - self._ptrs[i]
+            if count == 0:
+                continue
+            angles = self.cluster_stacks[i][len(self.cluster_stacks[i]) - count:]
+            for j, angle in enumerate(angles, self._ptrs[i]):
+                self.window.bases.add((i, j), angle)
+                self.window.geometry.add_edge((i, j), (i, j + 1))
+                if self.window.bases.pauli_base((i, j)) != 't':
+                    self.pending[(i, j)] = None
+            self._ptrs[i] = self.stack_ptrs[i]
+            self._finalized_since_flush += count
+            self.cluster_stacks[i] = []
+        for u, v in self.entanglement_edges:
+            self.window.geometry.add_edge(u, v)
+        self.entanglement_edges.clear()
+        for source, targets in self.dependencies.items():
+            for target in targets:
+                self.window.dependency.add_dependency(target, source)
+            targets.clear()
+        if self._finalized_since_flush >= self.batch:
+            self.flush()
+
+    def _frontier(self) -> List[any]:
+        """
+        Get the nodes of the window that are not final yet, the last two of each wire.
+        """
+        if self._closed:
+            return []
+        G = self.window.geometry.G
+        return [(i, j) for i in range(self.size) for j in (self._ptrs[i] - 1, self._ptrs[i]) if (i, j) in G]
+
+    def _reach(self, sources: Iterable[any], radius: int) -> Set[any]:
+        """
+        Get the nodes of the window within a distance of any of the sources.
+        """
+        adj = self.window.geometry.G.adj
+        retval = set(sources)
+        layer = list(retval)
+        for _ in range(radius):
+            layer = [neighbour for node in layer for neighbour in adj[node] if neighbour not in retval]
+            retval.update(layer)
+        return retval
+
+    def flush(self) -> None:
+        """
+        Eliminate the Pauli nodes whose neighbourhood is final and emit the nodes out of reach.
+        """
+        self._finalized_since_flush = 0
+        self.peak = max(self.peak, self.window_size())
+        self._eliminate()
+        self._emit()
+        # Only the sources still on some wire can gain dependencies
+        live = list(dict.fromkeys(source for correction in self.corrections for source in correction.keys()))
+        if not self._closed and len(live) > 4 * self.size:
+            live = self._fold(live)
+        self.dependencies = {source: self.dependencies.get(source, set()) for source in live}
+
+    def _fold(self, sources: List[any]) -> List[any]:
+        """
+        Fold the sources of the correction frames into a parity source per vector of a basis of their patterns.
+        The pattern of a source holds the X and Z bits of its Pauli on every wire. In a reduced row echelon basis
+        the coefficient of a basis vector in a pattern is its bit at the pivot of the vector, so the parity
+        source of a vector is the XOR of the sources whose pattern has the pivot bit set.
+        :param sources: sources of the frames.
+        :return: the sources the frames are left with
+        """
+        patterns = dict()
+        for source in sources:
+            pattern = 0
+            for i, correction in enumerate(self.corrections):
+                if source in correction:
+                    pattern |= (correction.code(source) & (X_BIT | Z_BIT)) << (2 * i)
+            patterns[source] = pattern
+        # Reduced row echelon basis over GF(2), keyed by pivot bit
+        basis: Dict[int, int] = dict()
+        for pattern in patterns.values():
+            for pivot, row in basis.items():
+                if pattern >> pivot & 1:
+                    pattern ^= row
+            if pattern:
+                pivot = (pattern & -pattern).bit_length() - 1
+                for other, row in basis.items():
+                    if row >> pivot & 1:
+                        basis[other] = row ^ pattern
+                basis[pivot] = pattern
+        for correction in self.corrections:
+            for source in list(correction.keys()):
+                correction.pop(source)
+        retval = []
+        for pivot, row in basis.items():
+            members = [source for source, pattern in patterns.items() if pattern >> pivot & 1]
+            if len(members) == 1 and patterns[members[0]] == row:
+                label = members[0]
+            else:
+                label = (self._parity_count,)
+                self._parity_count += 1
+                self._parities[label] = set(members)
+            for i, correction in enumerate(self.corrections):
+                if row >> (2 * i) & (X_BIT | Z_BIT):
+                    correction.set_code(label, row >> (2 * i) & (X_BIT | Z_BIT))
+            retval.append(label)
+        return retval
+
+    def _eliminate(self) -> None:
+        progress = True
+        while progress:
+            frontier = self._frontier()
+            blocked = self._reach(frontier, 2)
+            progress = False
+            for label in [label for label in self.pending if label not in blocked]:
+                # An elimination may pull the frontier closer to the next ones
+                if progress and not self._reach([label], 2).isdisjoint(frontier):
+                    continue
+                self._measure(label)
+                self.pending.pop(label)
+                progress = True
+
+    def _measure(self, label) -> None:
+        window = self.window
+        if self._emitted_degree.get(label, 0):
+            raise BaseException(f"Pauli node {label} is adjacent to an emitted node, increase the horizon")
+        if window.bases.pauli_base(label) == 'x' and window.geometry.degree(label) > 0:
+            # Pivot on a neighbour off the emitted boundary, preferably not an output whose readout would
+            # keep the rotations, then of minimum degree
+            pivots = [node for node in window.geometry.neighbours(label) if not self._emitted_degree.get(node, 0)]
+            if not pivots:
+                raise BaseException(f"Pauli node {label} has no pivot off the emitted nodes, increase the horizon")
+            window.x_measurement(label, min(pivots, key=lambda node: (node in window.output_layer,
+                                                                      window.geometry.degree(node), node)))
+        else:
+            window.measure(label)
+
+    def _emit(self) -> None:
+        window = self.window
+        fragment = GraphFragment()
+        blocked = self._reach(self._frontier() + list(self.pending), self.horizon)
+        for label in window.geometry.nodes():
+            if label in blocked:
+                continue
+            fragment.bases[label] = window.bases.save(label)
+            if label in window.dependency.correction:
+                fragment.corrections[label] = window.dependency.save(label)
+                fragment.dependencies[label] = set(window.dependency.dep_map[label])
+        if not len(fragment):
+            return
+        fragment.outputs = [label for label in window.output_layer if label in fragment.bases]
+        for label in fragment.bases:
+            for neighbour in window.geometry.neighbours(label):
+                if neighbour not in fragment.bases:
+                    fragment.edges.append((label, neighbour))
+                    self._emitted_degree[neighbour] = self._emitted_degree.get(neighbour, 0) + 1
+                elif label < neighbour:
+                    fragment.edges.append((label, neighbour))
+        for label in fragment.bases:
+            window.geometry.cutoff(label)
+            window.bases.cutoff(label)
+            if label in window.dependency.correction:
+                window.dependency.correction.pop(label)
+            window.dependency.dep_map.pop(label, None)
+            window.output_layer.pop(label, None)
+            self._emitted_degree.pop(label, None)
+        fragment.parities, self._parities = self._parities, dict()
+        self.emitted += len(fragment)
+        self.sink.add(fragment)
@@ -1 +1,5 @@
-from .Circuit import Circuit
\ No newline at end of file
+from .Circuit import Circuit
+from .ArrayCircuit import ArrayCircuit
+from .StreamingCircuit import StreamingCircuit
+from .QasmImporter import QasmImporter
+from .GraphStateSink import GraphStateSink
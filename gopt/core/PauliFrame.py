@@ -0,0 +1,227 @@
+from math import pi
+from typing import Dict, List
+
+import numpy as np
+
+from .Exceptions import BaseException
+
+# A Pauli base is packed into three bits: the X component, the Z component and the sign.
+# X = (1, 0), Y = (1, 1) and Z = (0, 1); code 0 marks an empty slot and is a fixed point of every table.
+X_BIT, Z_BIT, SIGN_BIT = 1, 2, 4
+
+
+def _encode(vector: (int, int, int)) -> int:
+    x, y, z = vector
+    if x:
+        return X_BIT | (SIGN_BIT if x < 0 else 0)
+    elif y:
+        return X_BIT | Z_BIT | (SIGN_BIT if y < 0 else 0)
+    elif z:
+        return Z_BIT | (SIGN_BIT if z < 0 else 0)
+    return 0
+
+
+def _decode(code: int) -> (int, int, int):
+    sign = -1 if code & SIGN_BIT else 1
+    axis = code & (X_BIT | Z_BIT)
+    if axis == X_BIT:
+        return sign, 0, 0
+    elif axis == X_BIT | Z_BIT:
+        return 0, sign, 0
+    elif axis == Z_BIT:
+        return 0, 0, sign
+    return 0, 0, 0
+
+
+def _table(transform) -> bytes:
+    """
+    Tabulate a signed permutation of the Bloch sphere axes over all codes.
+    :param transform: map of a Bloch vector, as in the rotations of BlochSphere.
+    :return: lookup table from a code to the transformed code
+    """
+    return bytes(_encode(transform(*_decode(code))) for code in range(8))
+
+
+def _compose(*tables: bytes) -> bytes:
+    """
+    Compose lookup tables, applied from left to right.
+    """
+    retval = bytes(range(8))
+    for table in tables:
+        retval = bytes(table[code] for code in retval)
+    return retval
+
+
+SQRT_X = {1: _table(lambda x, y, z: (x, -z, y)), -1: _table(lambda x, y, z: (x, z, -y))}
+SQRT_Y = {1: _table(lambda x, y, z: (z, y, -x)), -1: _table(lambda x, y, z: (-z, y, x))}
+SQRT_Z = {1: _table(lambda x, y, z: (-y, x, z)), -1: _table(lambda x, y, z: (y, -x, z))}
+FLIP_X = _table(lambda x, y, z: (x, -y, -z))
+FLIP_Y = _table(lambda x, y, z: (-x, y, -z))
+FLIP_Z = _table(lambda x, y, z: (-x, -y, z))
+H = _compose(SQRT_X[1], SQRT_Z[1], SQRT_X[1])
+# Rotations by k quarter turns about each axis
+ROTATIONS = {base: [_compose(*[sqrt[1]] * k) for k in range(4)]
+             for base, sqrt in (('x', SQRT_X), ('y', SQRT_Y), ('z', SQRT_Z))}
+
+_BASES = {X_BIT: 'x', X_BIT | Z_BIT: 'y', Z_BIT: 'z'}
+_CODES = {'x': X_BIT, 'y': X_BIT | Z_BIT, 'z': Z_BIT}
+
+
+def quarter_turns(angle: float, precision_digit: int = 8) -> int:
+    """
+    Resolve a Clifford rotation angle.
+    :param angle: rotation angle.
+    :param precision_digit: number of digits the angle is compared with.
+    :return: the number of quarter turns modulo 4, or None if the angle is not a multiple of pi/2
+    """
+    turns = round(angle / (pi / 2))
+    if round(angle - turns * pi / 2, precision_digit) != 0:
+        return None
+    return turns % 4
+
+
+class PauliFrame:
+    """
+    Exact Pauli frame of a collection of labelled qubits.
+    Every label owns one byte of a packed code array, so single updates are table lookups and updates
+    of the whole frame are vectorised over the array.
+    """
+
+    def __init__(self, bases: Dict[any, str] = None):
+        self.index: Dict[any, int] = dict()
+        self.codes: bytearray = bytearray()
+        self._free: List[int] = []
+        if bases is not None:
+            for label, base in bases.items():
+                self.add(label, base)
+
+    def add(self, label: any, base: str = 'z', sign: int = 1) -> None:
+        """
+        Add a label to the frame, overwriting its base if it is already present.
+        :param label: label of the qubit.
+        :param base: Pauli base, x, y or z.
+        :param sign: sign of the base, 1 or -1.
+        """
+        code = _CODES[base] | (SIGN_BIT if sign < 0 else 0)
+        if label in self.index:
+            self.codes[self.index[label]] = code
+        elif self._free:
+            self.index[label] = self._free.pop()
+            self.codes[self.index[label]] = code
+        else:
+            self.index[label] = len(self.codes)
+            self.codes.append(code)
+
+    def pop(self, label: any) -> None:
+        i = self.index.pop(label)
+        self.codes[i] = 0
+        self._free.append(i)
+
+    def keys(self):
+        return self.index.keys()
+
+    def __contains__(self, label: any) -> bool:
+        return label in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def code(self, label: any) -> int:
+        return self.codes[self.index[label]]
+
+    def set_code(self, label: any, code: int) -> None:
+        """
+        Overwrite the packed code of a label, adding the label if it is not in the frame.
+        """
+        if label not in self.index:
+            self.add(label)
+        self.codes[self.index[label]] = code
+
+    def pauli_base(self, label: any) -> str:
+        return _BASES[self.codes[self.index[label]] & (X_BIT | Z_BIT)]
+
+    def pauli_sign(self, label: any) -> int:
+        return -1 if self.codes[self.index[label]] & SIGN_BIT else 1
+
+    def vector(self, label: any) -> np.ndarray:
+        """
+        Get the Bloch vector of a label.
+        :param label: label of the qubit.
+        :return: the base as a float vector
+        """
+        return np.array(_decode(self.codes[self.index[label]]), dtype=float)
+
+    def plane(self, label: any) -> str:
+        """
+        Get the measurement plane, following BlochSphere.plane.
+        """
+        return "zy" if self.pauli_base(label) == 'z' else "xy"
+
+    def plane_angle(self, label: any) -> float:
+        """
+        Get the measurement angle in the measurement plane, following BlochSphere.plane_angle.
+        """
+        x, y, z = _decode(self.codes[self.index[label]])
+        return np.angle(z + y * 1j) if z else np.angle(x + y * 1j)
+
+    def transform(self, table: bytes, labels=None) -> None:
+        """
+        Apply a lookup table to some labels of the frame.
+        :param table: one of the tables of this module.
+        :param labels: labels to transform, all labels if None.
+        """
+        if labels is None:
+            codes = np.frombuffer(self.codes, dtype=np.uint8)
+            codes[:] = np.frombuffer(table, dtype=np.uint8)[codes]
+            del codes
+        else:
+            for label in labels:
+                i = self.index[label]
+                self.codes[i] = table[self.codes[i]]
+
+    def rotate(self, label: any, angle: float, base: str) -> None:
+        """
+        Rotate a label by a Clifford angle.
+        :param label: label of the qubit.
+        :param angle: rotation angle, a multiple of pi/2.
+        :param base: rotation base.
+        """
+        turns = quarter_turns(angle)
+        if turns is None:
+            raise BaseException(f"{angle} is not a Clifford rotation angle")
+        if base not in ROTATIONS:
+            raise BaseException("Invalid base")
+        i = self.index[label]
+        self.codes[i] = ROTATIONS[base][turns][self.codes[i]]
+
+    def rotate_sqrt_x(self, label: any, direction: int) -> None:
+        i = self.index[label]
+        self.codes[i] = SQRT_X[direction][self.codes[i]]
+
+    def rotate_sqrt_y(self, label: any, direction: int) -> None:
+        i = self.index[label]
+        self.codes[i] = SQRT_Y[direction][self.codes[i]]
+
+    def rotate_sqrt_z(self, label: any, direction: int) -> None:
+        i = self.index[label]
+        self.codes[i] = SQRT_Z[direction][self.codes[i]]
+
+    def rotate_h(self, label: any) -> None:
+        i = self.index[label]
+        self.codes[i] = H[self.codes[i]]
+
+    def flip_x(self, label: any) -> None:
+        i = self.index[label]
+        self.codes[i] = FLIP_X[self.codes[i]]
+
+    def flip_y(self, label: any) -> None:
+        i = self.index[label]
+        self.codes[i] = FLIP_Y[self.codes[i]]
+
+    def flip_z(self, label: any) -> None:
+        i = self.index[label]
+        self.codes[i] = FLIP_Z[self.codes[i]]
+
+    def __repr__(self):
+        return "Pauli frame object with bases {}".format(
+            {label: ('-' if self.pauli_sign(label) < 0 else '+') + self.pauli_base(label) for label in self.index})
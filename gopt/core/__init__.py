@@ -1 +1,2 @@
-from .BlochSphere import BlochSphere
\ No newline at end of file
+from .BlochSphere import BlochSphere
+from .PauliFrame import PauliFrame
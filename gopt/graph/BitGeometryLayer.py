@@ -0,0 +1,218 @@
+from collections.abc import Hashable
+
+import networkx as nx
+import numpy as np
+
+from .GeometryLayer import GeometryLayer
+
+
+class BitGeometryLayer(GeometryLayer):
+    """
+    Geometry layer backed by bit-packed adjacency rows.
+    Every node is assigned a dense index and its neighbourhood is stored as a Python big-int
+    whose i-th bit is set iff the node is adjacent to the node of index i.
+    """
+
+    def __init__(self, geometry_graph: nx.Graph):
+        self.label2idx: dict[any, int] = dict()
+        self.idx2label: list[any] = []
+        self.rows: list[int] = []
+        self._graph: nx.Graph = None
+        self._buckets: dict[int, set[any]] = None
+        self._max_degree: int = 0
+        self._degree_sum: int = 0
+        self._degree_square_sum: int = 0
+        self.version: int = 0
+        self._exports: dict[str, any] = dict()
+
+        for node in geometry_graph.nodes():
+            self.add_node(node)
+        for u, v in geometry_graph.edges():
+            i, j = self.label2idx[u], self.label2idx[v]
+            self.rows[i] |= 1 << j
+            self.rows[j] |= 1 << i
+
+    @classmethod
+    def from_rows(cls, labels: list[any], rows: list[int]) -> 'BitGeometryLayer':
+        """
+        Build a geometry layer from packed adjacency rows.
+        :param labels: node labels in index order.
+        :param rows: adjacency row of each node.
+        :return: the geometry layer
+        """
+        retval = cls(nx.Graph())
+        for label in labels:
+            retval.add_node(label)
+        retval.rows = list(rows)
+        retval._touch()
+        return retval
+
+    @property
+    def G(self) -> nx.Graph:
+        """
+        Read-only NetworkX view of the geometry, rebuilt lazily after each mutation.
+        The view is frozen, since edits to it would not reach the packed rows: mutate through the layer
+        or work on a copy.
+        """
+        if self._graph is None:
+            graph = nx.Graph()
+            graph.add_nodes_from(self.nodes())
+            for i in self.label2idx.values():
+                for j in self._indices(self.rows[i] >> (i + 1) << (i + 1)):
+                    graph.add_edge(self.idx2label[i], self.idx2label[j])
+            self._graph = nx.freeze(graph)
+        return self._graph
+
+    @staticmethod
+    def _indices(mask: int):
+        """
+        Iterate through the indices of the set bits in ascending order.
+        :param mask: bitset to iterate.
+        """
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _labels(self, mask: int) -> set[any]:
+        return {self.idx2label[i] for i in self._indices(mask)}
+
+    def mask(self, nodes) -> int:
+        """
+        Pack a collection of node labels into a bitset.
+        :param nodes: labels to pack.
+        :return: bitset with the bits of the given nodes set
+        """
+        retval = 0
+        for node in nodes:
+            retval |= 1 << self.label2idx[node]
+        return retval
+
+    def add_node(self, label: any) -> None:
+        """
+        Register a new isolated node with the next free index.
+        :param label: label of the node to add.
+        """
+        if label in self.label2idx:
+            return
+        self.label2idx[label] = len(self.idx2label)
+        self.idx2label.append(label)
+        self.rows.append(0)
+        self._move_degrees([(label, None, 0)])
+        self._graph = None
+        self._touch()
+
+    def local_complement(self, label: any) -> None:
+        """
+        Local complement the graph geometry about the node with given label.
+        Every neighbour row is XORed with the neighbourhood mask, excluding its own bit.
+        :param label: label to perform local complementation about.
+        """
+        neighbourhood = self.rows[self.label2idx[label]]
+        for i in self._indices(neighbourhood):
+            degree = self.rows[i].bit_count()
+            self.rows[i] ^= neighbourhood ^ (1 << i)
+            if self._buckets is not None:
+                self._move_degrees([(self.idx2label[i], degree, self.rows[i].bit_count())])
+        self._graph = None
+        self._touch()
+
+    def cutoff(self, label: any) -> None:
+        """
+        Cutoff the node with given label.
+        Its index is retired rather than reused so that the node order is preserved.
+        :param label: label of the node to cutoff.
+        """
+        i = self.label2idx.pop(label)
+        bit = 1 << i
+        self._move_degrees([(label, self.rows[i].bit_count(), None)])
+        for j in self._indices(self.rows[i]):
+            self._move_degrees([(self.idx2label[j], self.rows[j].bit_count(), self.rows[j].bit_count() - 1)])
+            self.rows[j] &= ~bit
+        self.rows[i] = 0
+        self._graph = None
+        self._touch()
+
+    def add_edge(self, u: any, v: any) -> None:
+        i, j = self.label2idx[u], self.label2idx[v]
+        if not self.rows[i] >> j & 1:
+            self._move_edge(u, v, 1)
+        self.rows[i] |= 1 << j
+        self.rows[j] |= 1 << i
+        self._graph = None
+        self._touch()
+
+    def remove_edge(self, u: any, v: any) -> None:
+        i, j = self.label2idx[u], self.label2idx[v]
+        if self.rows[i] >> j & 1:
+            self._move_edge(u, v, -1)
+        self.rows[i] &= ~(1 << j)
+        self.rows[j] &= ~(1 << i)
+        self._graph = None
+        self._touch()
+
+    def lc_delta(self, label: any) -> (int, dict[any, int], int):
+        neighbourhood = self.rows[self.label2idx[label]]
+        indices = list(self._indices(neighbourhood))
+        common = {self.idx2label[i]: (self.rows[i] & neighbourhood).bit_count() for i in indices}
+        degrees = {self.idx2label[i]: self.rows[i].bit_count() for i in indices}
+        return self._lc_delta(common, degrees)
+
+    def adjacency_rows(self) -> list[int]:
+        if len(self.label2idx) == len(self.idx2label):
+            # No index has been retired, the rows are already over the label register
+            return self.rows
+        return super().adjacency_rows()
+
+    def adjacency_packed(self) -> np.ndarray:
+        if len(self.label2idx) != len(self.idx2label):
+            return super().adjacency_packed()
+
+        def build():
+            width = (len(self.rows) + 7) // 8
+            data = b"".join(row.to_bytes(width, 'little') for row in self.rows)
+            return np.frombuffer(data, dtype=np.uint8).reshape(len(self.rows), width)
+        return self._export("packed", build)
+
+    def adjacency_dense(self) -> np.ndarray:
+        if len(self.label2idx) != len(self.idx2label):
+            return super().adjacency_dense()
+        n = len(self.rows)
+        return self._export("dense", lambda: np.unpackbits(self.adjacency_packed(), axis=1, count=n, bitorder='little'))
+
+    def boundary_nodes(self, nodes: set[any]) -> set[any]:
+        boundary = 0
+        for node in nodes:
+            boundary |= self.rows[self.label2idx[node]]
+        return self._labels(boundary)
+
+    def neighbours(self, node: any) -> set[any]:
+        return self._labels(self.rows[self.label2idx[node]])
+
+    def isolated(self, label):
+        return self.rows[self.label2idx[label]] == 0
+
+    def nodes(self) -> list[any]:
+        return list(self.label2idx.keys())
+
+    def degree(self, nodes: any) -> any:
+        # A single label, tuple labels included, as NetworkX tells it from a collection of labels
+        if isinstance(nodes, Hashable) and nodes in self.label2idx:
+            return self.rows[self.label2idx[nodes]].bit_count()
+        return [(node, self.rows[self.label2idx[node]].bit_count()) for node in nodes]
+
+    def max_degree_nodes(self, search_set=None) -> (set[any], int):
+        if search_set is None:
+            return super().max_degree_nodes()
+
+        nodes: set[any] = set()
+        max_degree: int = 0
+        for node in search_set:
+            node_degree: int = self.rows[self.label2idx[node]].bit_count()
+            if node_degree > max_degree:
+                max_degree = node_degree
+                nodes.clear()
+            if node_degree == max_degree:
+                nodes.add(node)
+
+        return nodes, max_degree
@@ -0,0 +1,176 @@
+import time
+from typing import Dict, List, Set
+
+import networkx as nx
+
+from .GeometryLayer import GeometryLayer
+from .MeasurementSequenceScheduler import MeasurementSequenceScheduler
+from .RegisterSizeBound import RegisterSizeBound
+
+
+class BranchAndBoundScheduler:
+    """
+    Exact measurement sequence scheduler.
+    Measuring node v after the set S loads the closed neighbourhood of v, so the register then holds
+    the unmeasured nodes adjacent to S or v plus v itself: the register size of a sequence only depends
+    on its prefix sets, a pathwidth-like quantity constrained by the dependency DAG.
+    Bounds k are tried upwards from a lower bound (see RegisterSizeBound), each by a depth-first search over measured sets
+    packed into bitsets that never exceeds k qubits and never revisits a set. A node whose neighbours
+    are all loaded or measured is measured right away, which never increases the register later on.
+    A failed search proves k + 1 to be a lower bound and the first successful one is optimal.
+    The greedy sequence is the initial upper bound and is returned if the time limit is hit first.
+    """
+
+    def __init__(self, geometry: GeometryLayer, dep_map: Dict[any, Set[any]], time_limit: float = None):
+        if isinstance(geometry, nx.Graph):
+            geometry = GeometryLayer(geometry)
+        self.geometry: GeometryLayer = geometry
+        self.dep_map: Dict[any, Set[any]] = dep_map
+        self.time_limit = time_limit  # seconds
+
+        self.labels: List[any] = geometry.nodes()
+        label2idx = {label: i for i, label in enumerate(self.labels)}
+        self.rows: List[int] = [self._mask(geometry.neighbours(label), label2idx) for label in self.labels]
+        # Dependency sources of each node, restricted to the nodes of the geometry
+        self.sources: List[int] = [self._mask(dep_map.get(label, ()), label2idx) for label in self.labels]
+        self.full: int = (1 << len(self.labels)) - 1
+
+        self.sequence: List[any] = []
+        self.size: int = 0
+        self.lower_bound: int = 0
+        self.optimal: bool = False
+        self.expanded: int = 0  # number of measured sets expanded
+
+        self._deadline: float = None
+
+    @staticmethod
+    def _mask(nodes, label2idx: Dict[any, int]) -> int:
+        retval = 0
+        for node in nodes:
+            if node in label2idx:
+                retval |= 1 << label2idx[node]
+        return retval
+
+    def register_size(self, sequence: List[any]) -> int:
+        """
+        Compute the register size required by a measurement sequence.
+        :param sequence: labels in measurement order.
+        :return: the register size
+        """
+        label2idx = {label: i for i, label in enumerate(self.labels)}
+        measured, loaded, retval = 0, 0, 0
+        for label in sequence:
+            i = label2idx[label]
+            measured |= 1 << i
+            loaded |= self.rows[i]
+            retval = max(retval, (loaded & ~measured).bit_count() + 1)
+        return retval
+
+    def check_acyclic(self) -> None:
+        """
+        Check that the dependencies among the nodes of the geometry are acyclic, as no sequence exists otherwise.
+        Raises ValueError naming a cycle.
+        """
+        nodes = set(self.labels)
+        dag = nx.DiGraph()
+        dag.add_edges_from((source, label) for label in self.labels
+                           for source in self.dep_map.get(label, ()) if source in nodes)
+        try:
+            cycle = nx.find_cycle(dag)
+        except nx.NetworkXNoCycle:
+            return
+        raise ValueError("Cyclic dependencies, no measurement sequence exists: " +
+                         " -> ".join(str(source) for source, _ in cycle) + f" -> {cycle[0][0]}")
+
+    def initial_lower_bound(self) -> int:
+        """
+        The first node measured loads its whole closed neighbourhood, and the MMD+ bound holds regardless.
+        """
+        if not self.labels:
+            return 0
+        first = min((self.rows[i].bit_count() for i in range(len(self.labels)) if self.sources[i] == 0),
+                    default=None)
+        if first is None:
+            # Every node waits on another one
+            self.check_acyclic()
+        return max(1 + first, RegisterSizeBound.mmd_plus(self.geometry))
+
+    def _moves(self, measured: int, loaded: int, bound: int):
+        """
+        Get the measurements available after a measured set within a register bound.
+        :param measured: bitset of the measured nodes.
+        :param loaded: bitset of the nodes loaded so far, measured or not.
+        :param bound: largest register size allowed.
+        :return: (node index, measured set, loaded set) of each move, the most promising first
+        """
+        boundary = loaded & ~measured
+        moves = []
+        for i in range(len(self.labels)):
+            bit = 1 << i
+            if measured & bit or self.sources[i] & ~measured:
+                continue
+            after = measured | bit
+            after_loaded = loaded | self.rows[i]
+            size = (after_loaded & ~after).bit_count() + 1
+            if size > bound:
+                continue
+            if self.rows[i] & ~measured & ~boundary == 0:
+                # Loads nothing beyond the node itself, measuring it now dominates measuring it later
+                return [(i, after, after_loaded)]
+            moves.append((size, 0 if boundary & bit else 1, i, after, after_loaded))
+        moves.sort()
+        return [move[2:] for move in moves]
+
+    def _search(self, bound: int) -> List[int]:
+        """
+        Search for a measurement sequence within a register bound.
+        :param bound: largest register size allowed.
+        :return: node indices of the sequence, None if there is none, raises TimeoutError past the deadline
+        """
+        if self.full == 0:
+            return []
+        visited: Set[int] = set()
+        path: List[int] = []
+        stack = [iter(self._moves(0, 0, bound))]
+        while stack:
+            move = next(stack[-1], None)
+            if move is None:
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            i, measured, loaded = move
+            if measured == self.full:
+                return path + [i]
+            if measured in visited:
+                continue
+            visited.add(measured)
+            self.expanded += 1
+            if self._deadline is not None and self.expanded % 256 == 0 and time.time() > self._deadline:
+                raise TimeoutError
+            path.append(i)
+            stack.append(iter(self._moves(measured, loaded, bound)))
+        return None
+
+    def schedule(self) -> (List[any], int):
+        """
+        Schedule a measurement sequence of minimum register size within the time limit.
+        :return: a queue of nodes as measurement sequence and the size of register required
+        """
+        self._deadline = time.time() + self.time_limit if self.time_limit is not None else None
+        self.check_acyclic()
+        self.sequence, self.size = MeasurementSequenceScheduler(self.geometry, self.dep_map).schedule()
+        self.lower_bound = self.initial_lower_bound()
+        try:
+            while self.lower_bound < self.size:
+                indices = self._search(self.lower_bound)
+                if indices is not None:
+                    self.sequence = [self.labels[i] for i in indices]
+                    self.size = self.register_size(self.sequence)
+                    break
+                self.lower_bound += 1
+            self.optimal = True
+            self.lower_bound = self.size
+        except TimeoutError:
+            pass
+        return list(self.sequence), self.size
@@ -1,5 +1,5 @@
 from typing import Dict, Set
-from ..core import BlochSphere
+from ..core.PauliFrame import PauliFrame
 import networkx as nx
 import matplotlib.pyplot as plt
 
@@ -7,11 +7,20 @@ import matplotlib.pyplot as plt
 class MeasurementDependencyLayer:
     def __init__(self, dependency_map: Dict[any, Set[any]]):
         self.dep_map: Dict[any, Set[any]] = dependency_map
-        self.correction: Dict[any, BlochSphere] = {node: BlochSphere('x') for node in self.dep_map.keys()}
+        self.correction: PauliFrame = PauliFrame({node: 'x' for node in self.dep_map.keys()})
+
+    def add_dependency(self, target, source):
+        """
+        Make a node depend on the outcome of a source, with a correction in X base on its first source.
+        """
+        if target not in self.dep_map:
+            self.dep_map[target] = set()
+            self.correction.add(target, 'x')
+        self.dep_map[target].add(source)
 
     def correction_base(self, node):
         if node in self.correction:
-            return self.correction[node].pauli_base()
+            return self.correction.pauli_base(node)
         else:
             return ""
 
@@ -20,14 +29,21 @@ class MeasurementDependencyLayer:
 
     def rotate_sqrt_x(self, node, direction):
         if node in self.correction:
-            self.correction[node].rotate_sqrt_x(direction)
+            self.correction.rotate_sqrt_x(node, direction)
 
     def rotate_sqrt_z(self, node, direction):
         if node in self.correction:
-            self.correction[node].rotate_sqrt_z(direction)
+            self.correction.rotate_sqrt_z(node, direction)
+
+    def save(self, node):
+        return self.correction.code(node) if node in self.correction else None
+
+    def restore(self, node, code):
+        if code is not None:
+            self.correction.set_code(node, code)
 
     def cutoff(self, node):
-        if node in self.correction.keys():
+        if node in self.correction:
             self.correction.pop(node)
         if node in self.dep_map.keys():
             self.dep_map.pop(node)
@@ -35,6 +51,20 @@ class MeasurementDependencyLayer:
             if node in sources:
                 self.dep_map[target].remove(node)
 
+    def cutoff_nodes(self, nodes):
+        """
+        Cutoff a batch of nodes in a single pass over the dependency map.
+        :param nodes: labels of the nodes to cutoff.
+        """
+        nodes = set(nodes)
+        for node in nodes:
+            if node in self.correction:
+                self.correction.pop(node)
+            if node in self.dep_map:
+                self.dep_map.pop(node)
+        for sources in self.dep_map.values():
+            sources.difference_update(nodes)
+
     def to_dag(self):
         dag = nx.DiGraph()
         for node, sources in self.dep_map.items():
@@ -1,3 +1,5 @@
+from math import sqrt
+
 import networkx as nx
 import numpy as np
 
@@ -5,6 +7,16 @@ import numpy as np
 class GeometryLayer:
     def __init__(self, geometry_graph: nx.Graph):
         self.G: nx.Graph = geometry_graph
+        self._buckets: dict[int, set[any]] = None  # degree -> nodes of that degree, built on the first query
+        self._max_degree: int = 0
+        self._degree_sum: int = 0
+        self._degree_square_sum: int = 0
+        self.version: int = 0  # bumped by every mutation through the layer
+        self._exports: dict[str, any] = dict()  # adjacency exports of the current version
+
+    def _touch(self) -> None:
+        self.version += 1
+        self._exports.clear()
 
     def local_complement(self, label: any) -> None:
         """
@@ -12,6 +24,8 @@ class GeometryLayer:
         :param label: label to perform local complementation about.
         """
         neighbours = list(self.G.neighbors(label))
+        adjacency = self.G.adj
+        degrees = [len(adjacency[node]) for node in neighbours] if self._buckets is not None else None
         edges = self.G.edges()
         for i in range(len(neighbours)):
             ni = neighbours[i]
@@ -21,18 +35,152 @@ class GeometryLayer:
                     self.G.remove_edge(ni, nj)
                 else:
                     self.G.add_edge(ni, nj)
+        if degrees is not None:
+            self._move_degrees((node, degree, len(adjacency[node])) for node, degree in zip(neighbours, degrees))
+        self._touch()
 
     def cutoff(self, label: any) -> None:
         """
         Cutoff the node with given label.
         :param label: label of the node to cutoff.
         """
+        if self._buckets is not None:
+            self._move_degrees([(label, self.G.degree(label), None)] +
+                               [(node, self.G.degree(node), self.G.degree(node) - 1)
+                                for node in self.G.neighbors(label) if node != label])
         self.G.remove_node(label)
+        self._touch()
+
+    def add_edge(self, u: any, v: any) -> None:
+        if self._buckets is not None and not self.G.has_edge(u, v):
+            self._move_edge(u, v, 1)
+        self.G.add_edge(u, v)
+        self._touch()
+
+    def remove_edge(self, u: any, v: any) -> None:
+        if self._buckets is not None and self.G.has_edge(u, v):
+            self._move_edge(u, v, -1)
+        self.G.remove_edge(u, v)
+        self._touch()
+
+    def _move_edge(self, u: any, v: any, direction: int) -> None:
+        if u == v:
+            # A self loop counts twice towards the degree
+            self._move_degrees([(u, self.degree(u), self.degree(u) + 2 * direction)])
+        else:
+            self._move_degrees([(u, self.degree(u), self.degree(u) + direction),
+                                (v, self.degree(v), self.degree(v) + direction)])
+
+    def _move_degrees(self, moves) -> None:
+        """
+        Update the degree index, if built, for nodes changing degree.
+        :param moves: (node, old degree, new degree) of each node, None for a node added or removed.
+        """
+        if self._buckets is None:
+            return
+        for node, old, new in moves:
+            if old == new:
+                continue
+            if old is not None:
+                bucket = self._buckets[old]
+                bucket.discard(node)
+                if not bucket:
+                    del self._buckets[old]
+                self._degree_sum -= old
+                self._degree_square_sum -= old * old
+            if new is not None:
+                if new in self._buckets:
+                    self._buckets[new].add(node)
+                else:
+                    self._buckets[new] = {node}
+                self._degree_sum += new
+                self._degree_square_sum += new * new
+                self._max_degree = max(self._max_degree, new)
+        while self._max_degree > 0 and self._max_degree not in self._buckets:
+            self._max_degree -= 1
+
+    def _index(self) -> dict[int, set[any]]:
+        """
+        Get the degree buckets, building them on the first call.
+        They are maintained through the mutations of the layer from then on.
+        """
+        if self._buckets is None:
+            self._buckets = dict()
+            self._degree_sum = 0
+            self._degree_square_sum = 0
+            for node in self.nodes():
+                degree = self.degree(node)
+                self._buckets.setdefault(degree, set()).add(node)
+                self._degree_sum += degree
+                self._degree_square_sum += degree * degree
+            self._max_degree = max(self._buckets, default=0)
+        return self._buckets
+
+    def degree_histogram(self) -> dict[int, int]:
+        """
+        Get the number of nodes of each degree.
+        :return: degree -> number of nodes
+        """
+        return {degree: len(nodes) for degree, nodes in self._index().items()}
+
+    def max_degree(self) -> int:
+        self._index()
+        return self._max_degree
+
+    def edge_size(self) -> int:
+        self._index()
+        return self._degree_sum // 2
+
+    def degree_square_sum(self) -> int:
+        self._index()
+        return self._degree_square_sum
+
+    def degree_norm(self) -> float:
+        return sqrt(self.degree_square_sum())
+
+    def lc_delta(self, label: any) -> (int, dict[any, int], int):
+        """
+        Compute the effect of local complementing about a node without mutating the graph.
+        Only the edges among the neighbours are toggled, so a neighbour sharing c of the d neighbours of
+        the node changes degree by d - 1 - 2c, and only the neighbourhood of the node is read.
+        :param label: label to perform local complementation about.
+        :return: change of the edge count, degree change of each neighbour, max degree after the LC
+        """
+        adjacency = self.G.adj
+        neighbours = set(adjacency[label])
+        common = {node: len(neighbours.intersection(adjacency[node])) for node in neighbours}
+        degrees = {node: len(adjacency[node]) for node in neighbours}
+        return self._lc_delta(common, degrees)
+
+    def _lc_delta(self, common: dict[any, int], degrees: dict[any, int]) -> (int, dict[any, int], int):
+        """
+        :param common: number of common neighbours of each neighbour with the node.
+        :param degrees: degree of each neighbour.
+        """
+        size = len(common)
+        degree_delta = {node: size - 1 - 2 * c for node, c in common.items()}
+        edge_delta = size * (size - 1) // 2 - sum(common.values())
+        return edge_delta, degree_delta, self._max_degree_after(degree_delta, degrees)
+
+    def _max_degree_after(self, degree_delta: dict[any, int], degrees: dict[any, int]) -> int:
+        buckets = self._index()
+        moved: dict[int, int] = dict()
+        retval = 0
+        for node, delta in degree_delta.items():
+            if delta != 0:
+                degree = degrees[node]
+                moved[degree] = moved.get(degree, 0) + 1
+                retval = max(retval, degree + delta)
+        # Highest degree still held by a node left unchanged
+        max_degree = self._max_degree
+        while max_degree > retval and len(buckets.get(max_degree, ())) == moved.get(max_degree, 0):
+            max_degree -= 1
+        return max(retval, max_degree)
 
     def boundary_nodes(self, nodes: set[any]) -> set[any]:
         boundary: set[any] = set()
         for node in nodes:
-            boundary = boundary.union(self.neighbours(node))
+            boundary.update(self.neighbours(node))
         return boundary
 
     def neighbours(self, node: any) -> set[any]:
@@ -48,12 +196,12 @@ class GeometryLayer:
         return self.G.degree(nodes)
 
     def max_degree_nodes(self, search_set=None) -> (set[any], int):
-        nodes: set[any] = set()
-        max_degree: int = 0
-
         if search_set is None:
-            search_set = self.nodes()
+            buckets = self._index()
+            return set(buckets.get(self._max_degree, ())), self._max_degree
 
+        nodes: set[any] = set()
+        max_degree: int = 0
         for node in search_set:
             node_degree: int = self.degree(node)
             if node_degree > max_degree:
@@ -67,26 +215,108 @@ class GeometryLayer:
     def is_isomorphic(self, H: nx.Graph) -> bool:
         return nx.is_isomorphic(self.G, H)
 
+    # Adjacency exports, cached until the next mutation through the layer and returned read-only
+    def _export(self, name: str, build) -> any:
+        if name not in self._exports:
+            value = build()
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._exports[name] = value
+        return self._exports[name]
+
+    def label_register(self) -> tuple:
+        """
+        Get the labels indexing the rows and columns of the adjacency exports.
+        """
+        return self._export("labels", lambda: tuple(self.nodes()))
+
+    def _edge_index(self) -> (np.ndarray, np.ndarray):
+        def build():
+            label2idx = {label: i for i, label in enumerate(self.label_register())}
+            pairs = np.array([(label2idx[u], label2idx[v]) for u, v in self.G.edges()], dtype=np.int64)
+            return pairs.reshape(-1, 2)
+        pairs = self._export("edges", build)
+        return pairs[:, 0], pairs[:, 1]
+
+    def adjacency_dense(self) -> np.ndarray:
+        """
+        Export the adjacency as a dense GF(2) matrix.
+        :return: n x n uint8 matrix over the label register
+        """
+        def build():
+            n = len(self.label_register())
+            retval = np.zeros((n, n), dtype=np.uint8)
+            i, j = self._edge_index()
+            retval[i, j] = 1
+            retval[j, i] = 1
+            return retval
+        return self._export("dense", build)
+
+    def _adjacency_lists(self) -> (np.ndarray, np.ndarray):
+        """
+        Get the neighbour indices of every node, grouped by node.
+        :return: the neighbour indices and the offset of each node's group, n + 1 offsets
+        """
+        n = len(self.label_register())
+        i, j = self._edge_index()
+        sources, targets = np.concatenate([i, j]), np.concatenate([j, i])
+        order = np.argsort(sources, kind='stable')
+        return targets[order], np.searchsorted(sources[order], np.arange(n + 1))
+
+    def adjacency_packed(self) -> np.ndarray:
+        """
+        Export the adjacency as bit-packed GF(2) rows, bit j of row i being byte j // 8, bit j % 8 (little endian).
+        :return: n x ceil(n / 8) uint8 matrix over the label register
+        """
+        def build():
+            n = len(self.label_register())
+            retval = np.zeros((n, (n + 7) // 8), dtype=np.uint8)
+            i, j = self._edge_index()
+            np.bitwise_or.at(retval, (i, j >> 3), (1 << (j & 7)).astype(np.uint8))
+            np.bitwise_or.at(retval, (j, i >> 3), (1 << (i & 7)).astype(np.uint8))
+            return retval
+        return self._export("packed", build)
+
+    def adjacency_rows(self) -> list[int]:
+        """
+        Export the adjacency rows as big-ints, bit j of row i being set iff nodes i and j are adjacent.
+        The list is shared, not copied: it must not be modified and is only valid until the next mutation.
+        """
+        def build():
+            n = len(self.label_register())
+            neighbours, offsets = self._adjacency_lists()
+            retval = []
+            # One packed row at a time, so that no n x n matrix is held besides the rows themselves
+            row = np.zeros((n + 7) // 8, dtype=np.uint8)
+            for k in range(n):
+                columns = neighbours[offsets[k]:offsets[k + 1]]
+                row[:] = 0
+                np.bitwise_or.at(row, columns >> 3, (1 << (columns & 7)).astype(np.uint8))
+                retval.append(int.from_bytes(row.tobytes(), 'little'))
+            return retval
+        return self._export("rows", build)
+
+    def adjacency_csr(self):
+        """
+        Export the adjacency as a SciPy CSR matrix, scipy being imported on first use.
+        :return: n x n uint8 CSR matrix over the label register
+        """
+        def build():
+            from scipy.sparse import csr_matrix
+            n = len(self.label_register())
+            i, j = self._edge_index()
+            data = np.ones(2 * len(i), dtype=np.uint8)
+            retval = csr_matrix((data, (np.concatenate([i, j]), np.concatenate([j, i]))), shape=(n, n))
+            retval.data.flags.writeable = False
+            return retval
+        return self._export("csr", build)
+
     def extract_edge_matrix(self) -> (np.ndarray, list[any]):
         """
         Extract the edge matrix of the graph state.
         :return: nxn matrix, label register
         """
-        n: int = self.G.size()
-        retval: np.ndarray = np.zeros((n, n))
-        label2idx: dict[any, int] = dict()
-        label_reg: list[any] = list()
-        i = 0
-        for node in self.G.nodes():
-            label2idx[node] = i
-            label_reg.append(node)
-            i += 1
-        for u, v in self.G.edges():
-            u = label2idx[u]
-            v = label2idx[v]
-            retval[u][v] = 1
-            retval[v][u] = 1
-        return retval, label_reg
+        return self.adjacency_dense().astype(float), list(self.label_register())
 
     def draw(self):
         nx.draw(self.G, pos=nx.circular_layout(self.G),
@@ -0,0 +1,136 @@
+import sys
+from typing import Dict, Tuple
+
+import networkx as nx
+import numpy as np
+
+# Base code of a node measured in a non-Pauli base, out of the range of the Pauli codes
+VECTOR = 0xff
+
+
+class GraphSnapshot:
+    """
+    Compact immutable snapshot of a geometry, optionally with the Pauli frames of a graph state.
+    Over a fixed label order, the adjacency is stored as the upper triangle of the adjacency matrix
+    packed eight entries per byte, and the frames as one packed code per label. Snapshots are hashable
+    and compare equal iff they hold the same labelled graph and frames.
+    Snapshots of states sharing a node set should share the labels tuple, it is not copied.
+    """
+    __slots__ = ("labels", "edges", "bases", "corrections", "vectors", "_hash")
+
+    def __init__(self, labels: Tuple[any, ...], edges: bytes, bases: bytes = b"", corrections: bytes = b"",
+                 vectors: bytes = b""):
+        self.labels = labels
+        self.edges = edges
+        self.bases = bases  # code of each Pauli base, VECTOR for non-Pauli bases, 0 for nodes without one
+        self.corrections = corrections  # code of each correction, 0 for nodes without one
+        self.vectors = vectors  # float64 Bloch vectors of the non-Pauli bases, in label order
+        self._hash = hash((len(labels), edges, bases, corrections, vectors))
+
+    @staticmethod
+    def _triangle_index(i: np.ndarray, j: np.ndarray, n: int) -> np.ndarray:
+        # Position of the entry (i, j), i < j, in the row-major upper triangle
+        return i * n - i * (i + 1) // 2 + j - i - 1
+
+    @classmethod
+    def from_graph(cls, G: nx.Graph, labels: Tuple[any, ...] = None,
+                   label2idx: Dict[any, int] = None) -> 'GraphSnapshot':
+        """
+        Snapshot the adjacency of a graph.
+        :param G: graph to snapshot.
+        :param labels: label order to use, the node order of G if None.
+        :param label2idx: position of each label, derived from labels if None.
+        :return: the snapshot
+        """
+        if labels is None:
+            labels = tuple(G.nodes())
+        if label2idx is None:
+            label2idx = {label: i for i, label in enumerate(labels)}
+        n = len(labels)
+        bits = np.zeros(n * (n - 1) // 2, dtype=np.uint8)
+        if G.number_of_edges():
+            pairs = np.array([(label2idx[u], label2idx[v]) for u, v in G.edges()], dtype=np.int64)
+            i, j = pairs.min(axis=1), pairs.max(axis=1)
+            bits[cls._triangle_index(i, j, n)] = 1
+        return cls(labels, np.packbits(bits).tobytes())
+
+    @classmethod
+    def from_graph_state(cls, graph_state, labels: Tuple[any, ...] = None,
+                         label2idx: Dict[any, int] = None) -> 'GraphSnapshot':
+        """
+        Snapshot the geometry, the bases and the corrections of a graph state.
+        Bases of non-Clifford angles are captured as their Bloch vectors.
+        """
+        retval = cls.from_graph(graph_state.geometry.G, labels, label2idx)
+        paulis, vectors = graph_state.bases.paulis, graph_state.bases.bases
+        correction = graph_state.dependency.correction
+        bases = bytes(paulis.code(label) if label in paulis else VECTOR if label in vectors else 0
+                      for label in retval.labels)
+        vectors = np.array([vectors[label].vector for label in retval.labels if label in vectors], dtype=np.float64)
+        corrections = bytes(correction.code(label) if label in correction else 0 for label in retval.labels)
+        return cls(retval.labels, retval.edges, bases, corrections, vectors.tobytes())
+
+    def edge_list(self):
+        """
+        Iterate through the edges as pairs of labels.
+        """
+        n = len(self.labels)
+        bits = np.unpackbits(np.frombuffer(self.edges, dtype=np.uint8), count=n * (n - 1) // 2)
+        i, j = np.triu_indices(n, 1)
+        for k in np.flatnonzero(bits):
+            yield self.labels[i[k]], self.labels[j[k]]
+
+    def graph(self) -> nx.Graph:
+        """
+        Rebuild the geometry as a networkx graph, nodes in label order.
+        """
+        retval = nx.Graph()
+        retval.add_nodes_from(self.labels)
+        retval.add_edges_from(self.edge_list())
+        return retval
+
+    def restore(self, graph_state) -> None:
+        """
+        Write the snapshot back into a graph state over the same nodes.
+        Only the edges that differ are toggled; bases and corrections of every node are restored if captured.
+        """
+        geometry = graph_state.geometry
+        target = set(self.edge_list())
+        for u, v in list(geometry.G.edges()):
+            if (u, v) not in target and (v, u) not in target:
+                geometry.remove_edge(u, v)
+            else:
+                target.discard((u, v))
+                target.discard((v, u))
+        for u, v in target:
+            geometry.add_edge(u, v)
+        bases, correction = graph_state.bases, graph_state.dependency.correction
+        vectors = iter(np.frombuffer(self.vectors, dtype=np.float64).reshape(-1, 3))
+        for label, code in zip(self.labels, self.bases):
+            if code == VECTOR:
+                bases.restore(label, next(vectors).copy())
+            elif code:
+                bases.restore(label, code)
+            elif label in bases.paulis or label in bases.bases:
+                bases.cutoff(label)
+        for label, code in zip(self.labels, self.corrections):
+            if code:
+                correction.set_code(label, code)
+            elif label in correction:
+                correction.pop(label)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the snapshot, excluding the shared labels.
+        """
+        return sys.getsizeof(self) + sys.getsizeof(self.edges) + sys.getsizeof(self.bases) + \
+            sys.getsizeof(self.corrections) + sys.getsizeof(self.vectors)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GraphSnapshot) and self._hash == other._hash and self.edges == other.edges and \
+            self.bases == other.bases and self.corrections == other.corrections and \
+            self.vectors == other.vectors and (self.labels is other.labels or self.labels == other.labels)
+
+    def __hash__(self) -> int:
+        return self._hash
@@ -1,12 +1,19 @@
-from typing import Dict, Set, List
+from typing import Dict, Set, List, Tuple
 
 import numpy as np
-from qiskit import QuantumCircuit, transpile
-from qiskit.providers.aer import QasmSimulator
 
 from .GeometryLayer import GeometryLayer
+from .BitGeometryLayer import BitGeometryLayer
 from .MeasurementBaseLayer import MeasurementBaseLayer
 from .DependencyLayer import MeasurementDependencyLayer
+from .MeasurementSequenceScheduler import MeasurementSequenceScheduler
+from .BranchAndBoundScheduler import BranchAndBoundScheduler
+from .PauliEliminator import PauliEliminator
+from .GraphSnapshot import GraphSnapshot
+from .RegisterSimulator import RegisterSimulator
+from .StabilizerSimulator import StabilizerSimulator
+from .OutcomeCounter import OutcomeCounter
+from .MBQCProgram import MBQCProgram
 import networkx as nx
 from math import pi
 
@@ -16,17 +23,24 @@ class GraphState:
                  geometry_graph: nx.Graph,
                  dependency_map: Dict[any, Set[any]],
                  angle_map: Dict[any, float], output: List[any],
-                 verbose: int = 0):
-        self.geometry = GeometryLayer(geometry_graph)
+                 verbose: int = 0,
+                 bit_packed: bool = False):
+        self.geometry = BitGeometryLayer(geometry_graph) if bit_packed else GeometryLayer(geometry_graph)
         self.dependency: MeasurementDependencyLayer = MeasurementDependencyLayer(dependency_map)
         self.bases: MeasurementBaseLayer = MeasurementBaseLayer(angle_map)
         self.output_layer = output
 
         self._verbose = verbose
         self._reduced = False
+        # Local complementations since the outermost checkpoint with the prior bases and corrections
+        # of the nodes they rotate, None when not recording
+        self._undo_log: List[Tuple[any, List[Tuple[any, any, any]]]] = None
 
     def local_complement(self, label, direction=1):
         neighbours = self.geometry.neighbours(label)
+        if self._undo_log is not None:
+            self._undo_log.append((label, [(node, self.bases.save(node), self.dependency.save(node))
+                                           for node in [label, *neighbours]]))
         self.geometry.local_complement(label)
 
         # Corrections on bases and corrections
@@ -36,6 +50,71 @@ class GraphState:
             self.bases.rotate_sqrt_z(node, -direction)
             self.dependency.rotate_sqrt_z(node, -direction)
 
+    def checkpoint(self) -> int:
+        """
+        Start recording local complementations so that they can be rolled back.
+        Checkpoints nest, rolling back to one discards the changes made after it only.
+        Only local complementations are recorded, measurements must not happen until commit.
+        :return: the checkpoint to roll back to
+        """
+        if self._undo_log is None:
+            self._undo_log = []
+        return len(self._undo_log)
+
+    def apply(self, moves: List[any], direction: int = 1) -> None:
+        """
+        Local complement about a sequence of nodes.
+        :param moves: labels to perform local complementation about, in order.
+        :param direction: direction of the basis rotations.
+        """
+        for label in moves:
+            self.local_complement(label, direction)
+
+    def rollback(self, checkpoint: int = 0) -> List[any]:
+        """
+        Undo the local complementations made after a checkpoint, restoring the geometry, bases and
+        corrections exactly. Each one costs its own edge flips and frame changes.
+        :param checkpoint: checkpoint returned by checkpoint, the outermost one by default.
+        :return: labels of the undone local complementations, latest first
+        """
+        if self._undo_log is None:
+            raise ValueError("No checkpoint to roll back to, call checkpoint before the local complementations")
+        retval = []
+        while len(self._undo_log) > checkpoint:
+            label, saved = self._undo_log.pop()
+            # The neighbourhood of the node itself is unchanged, so the same edges flip back
+            self.geometry.local_complement(label)
+            for node, base, correction in saved:
+                self.bases.restore(node, base)
+                self.dependency.restore(node, correction)
+            retval.append(label)
+        return retval
+
+    @property
+    def recording(self) -> bool:
+        """
+        Whether local complementations are recorded since a checkpoint.
+        """
+        return self._undo_log is not None
+
+    def commit(self) -> None:
+        """
+        Keep all changes and stop recording.
+        """
+        self._undo_log = None
+
+    def snapshot(self) -> GraphSnapshot:
+        """
+        Take a compact immutable snapshot of the geometry, the bases and the corrections.
+        """
+        return GraphSnapshot.from_graph_state(self)
+
+    def restore(self, snapshot: GraphSnapshot) -> None:
+        """
+        Restore a snapshot taken over the same nodes.
+        """
+        snapshot.restore(self)
+
     def z_measurement(self, label):
         direction = self.bases.pauli_sign(label)
         neighbours = self.geometry.neighbours(label)
@@ -63,7 +142,8 @@ class GraphState:
             self.z_measurement(label)
         else:
             if b is None:
-                b = self.geometry.neighbours(label).pop()
+                # The neighbour of lowest degree, the smallest label among ties, as PauliEliminator does
+                b = min(self.geometry.neighbours(label), key=lambda node: (self.geometry.degree(node), node))
                 if self._verbose >= 1:
                     print(f"{b} is selected to perform LC")
             self.local_complement(b, -1)
@@ -99,11 +179,16 @@ class GraphState:
         self.eliminate_disconnected()
         self.fuse_nodes()
 
-    def eliminate_pauli(self):
+    def eliminate_pauli(self, batched: bool = True):
         # self.draw()
         # plt.title(f"Initial graph state with {len(self.geometry.nodes())} nodes")
         # plt.show()
 
+        if batched:
+            flag = PauliEliminator(self).run()
+            self._reduced = self._reduced or flag
+            return flag
+
         flag = False
         # Step 1 eliminate pauli
         for node in self.geometry.nodes():
@@ -164,69 +249,17 @@ class GraphState:
         Schedule an optimized measurement sequence
         :return: a queue of nodes as measurement sequence and the size of register required
         """
-        # Allocate space for helper data
-        geometry: nx.Graph = nx.Graph.copy(self.geometry.G)
-        dep_map: Dict[any, Set[any]] = {node: self.dependency.dep_map[node].copy() for node in
-                                        self.dependency.dep_map.keys()}
-        qreg: Set[any] = set()  # virtual register
-        queue: Set[any] = set()  # measurable queue
-        sequence: List[any] = []  # measurement sequence
-        size: int = 0  # qubits required
-
-        # loop until everything is measured
-        while len(geometry.nodes()) > 0:
-            # Search for all measurable qubit
-            for node in geometry.nodes():
-                if node not in dep_map or len(dep_map[node]) == 0:
-                    queue.add(node)
-
-            # Search for the qubit to measure
-            delta: int = np.inf
-            node_min: any = None
-            delta_set_min: Set[any] = set()
-            for node in queue:
-                delta_set = set(geometry.neighbors(node))
-                delta_set.add(node)
-                delta_set = delta_set.difference(qreg)
-                # CASE 1: delta = 0
-                if len(delta_set) == 0 and (node_min is None or geometry.degree(node) > geometry.degree(node_min)):
-                    node_min = node
-                    delta = 0
-
-                elif len(delta_set) < delta:
-                    delta = len(delta_set)
-                    node_min = node
-                    delta_set_min = delta_set
+        return MeasurementSequenceScheduler(self.geometry, self.dependency.dep_map).schedule()
 
-            # Compute the resource required
-            size = max(size, len(qreg) + delta)
-            # print(f"{node_min} is measured with delta={delta} and register size {size}")
-
-            # Add the node and neighbours to the virtual register
-            for node in delta_set_min:
-                qreg.add(node)
-            for node in geometry.nodes():
-                if node in dep_map:
-                    if node_min in dep_map[node]:
-                        dep_map[node].remove(node_min)
-
-            # Remove node from graph and push the node to the measurement sequence
-            geometry.remove_node(node_min)
-            qreg.remove(node_min)
-            queue.remove(node_min)
-            sequence.append(node_min)
-
-        # Verify sequence
-        for i in range(len(sequence)):
-            if sequence[i] in dep_map:
-                for source in dep_map[sequence[i]]:
-                    if source in sequence[i:]:
-                        print(f"error: {sequence[i]} measured before {source}")
-                        break
-
-        # print(f"scheduled with size {size}")
-
-        return sequence, size
+    def schedule_exact(self, time_limit: float = None) -> (List[any], int, int):
+        """
+        Schedule a measurement sequence of minimum register size by branch and bound
+        :param time_limit: seconds to search for, unlimited if None.
+        :return: the best measurement sequence found, its register size and a proven lower bound
+        """
+        scheduler = BranchAndBoundScheduler(self.geometry, self.dependency.dep_map, time_limit)
+        sequence, size = scheduler.schedule()
+        return sequence, size, scheduler.lower_bound
 
     def schedule_2(self) -> (List[any], int):
         """
@@ -304,10 +337,11 @@ class GraphState:
 
         return sequence, size
 
-    def compile(self) -> (QuantumCircuit, Dict[any, int]):
+    def compile(self) -> (MBQCProgram, Dict[any, int]):
         """
         Compile measurement sequence into measurement-based quantum circuit
-        :return:
+        :return: the instructions, to be serialised by to_qasm3 or converted by to_qiskit, and the classical bit
+        of each node
         """
 
         nodes = self.geometry.nodes()
@@ -321,7 +355,7 @@ class GraphState:
 
         sequence, reg_size = self.schedule()
 
-        circuit = QuantumCircuit(reg_size, graph_size)
+        program = MBQCProgram(reg_size, graph_size)
         qreg_map = dict()
         creg_map = {sequence[i]: i for i in range(graph_size)}
         free_qubit = set(range(reg_size))
@@ -330,65 +364,67 @@ class GraphState:
             # Allocate memory
             if node not in qreg_map:
                 qreg_map[node] = free_qubit.pop()
-                circuit.reset(qreg_map[node])
-                circuit.h(qreg_map[node])
+                program.alloc(qreg_map[node])
 
             # Construct partial graph state
             for next_node in geometry.neighbors(node):
                 if next_node not in qreg_map:
                     qreg_map[next_node] = free_qubit.pop()
-                    circuit.reset(qreg_map[next_node])
-                    circuit.h(qreg_map[next_node])
-                circuit.cz(qreg_map[node], qreg_map[next_node])
+                    program.alloc(qreg_map[next_node])
+                program.cz(qreg_map[node], qreg_map[next_node])
 
-            # Process correction
-            correction = circuit.x if correction_bases[node] == 'x' \
-                else circuit.y if correction_bases[node] == 'y' else circuit.z
-            if node in correction_mask:
-                for prev_node in correction_mask[node]:
-                    correction(qreg_map[node]).c_if(creg_map[prev_node], 1)
+            # Process correction once on the parity of the source outcomes
+            if correction_mask.get(node):
+                program.pauli(qreg_map[node], correction_bases[node],
+                              sorted(creg_map[prev_node] for prev_node in correction_mask[node]))
 
             # Measure node
-            if measurement_planes[node] == "xy":
-                circuit.rz(-measurement_angles[node], qreg_map[node])
-                circuit.h(qreg_map[node])
-            elif measurement_planes[node] == "zy":
-                circuit.rx(measurement_angles[node], qreg_map[node])
-            else:
-                circuit.ry(measurement_angles[node], qreg_map[node])
-                circuit.h(qreg_map[node])
-            circuit.measure(qreg_map[node], creg_map[node])
+            program.rotate(qreg_map[node], measurement_planes[node], measurement_angles[node])
+            program.measure(qreg_map[node], creg_map[node])
 
             # Deallocate memory
             reg_id = qreg_map.pop(node)
             free_qubit.add(reg_id)
-            circuit.barrier()
+            program.free(reg_id)
             geometry.remove_node(node)
 
-        return circuit, creg_map
+        return program, creg_map
 
     def process_outcomes(self,
                          outome_counts: Dict[str, int],
                          creg_map: Dict[any, int]):
-        output_reg = [creg_map[node] for node in self.output_layer]
-        processed_counts: Dict[str, int] = dict()
-        for word, count in outome_counts.items():
-            word = word[::-1]
-            masked_word = ''
-            for reg_id in output_reg:
-                masked_word += word[reg_id]
-            masked_word = masked_word[::-1]
-            if masked_word in processed_counts:
-                processed_counts[masked_word] += count
-            else:
-                processed_counts[masked_word] = count
-        return processed_counts
+        """
+        Project measurement outcomes onto the output layer, the first output as the last character.
+        :param outome_counts: counts of bitstrings, or raw shots as packed words or a bit matrix, see OutcomeCounter.
+        :param creg_map: classical bit of each node.
+        :return: counts of the output bitstrings
+        """
+        return OutcomeCounter([creg_map[node] for node in self.output_layer]).process(outome_counts)
 
-    def run(self, shot):
-        circuit, creg_map = self.compile()
-        simulator = QasmSimulator()
+    def run(self, shot, backend: str = "stabilizer", seed=None):
+        """
+        Sample the outputs of the graph state.
+        :param shot: number of shots.
+        :param backend: stabilizer for the StabilizerSimulator, which expands a few non-Clifford measurements into
+        a sum of stabilizer terms and falls back to numpy for more, numpy for the register-bounded
+        RegisterSimulator, qiskit to run the compiled circuit.
+        :param seed: seed of the stabilizer and numpy backends.
+        :return: counts of the output bitstrings
+        """
+        if backend == "stabilizer":
+            return StabilizerSimulator(self, seed=seed).run(shot)
+        elif backend == "numpy":
+            return RegisterSimulator(self, seed=seed).run(shot)
+        elif backend != "qiskit":
+            raise ValueError(f"Unknown backend {backend}")
+        from qiskit import transpile
+        from qiskit_aer import AerSimulator
+
+        program, creg_map = self.compile()
+        circuit = program.to_qiskit()
+        simulator = AerSimulator()
         qasm_circuit = transpile(circuit, simulator)
-        job = simulator.run(qasm_circuit, shot=shot)
+        job = simulator.run(qasm_circuit, shots=shot)
         result = job.result()
         counts = result.get_counts(qasm_circuit)
         return self.process_outcomes(counts, creg_map)
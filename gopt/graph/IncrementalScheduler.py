@@ -0,0 +1,132 @@
+import heapq
+from typing import List, Set
+
+from .MeasurementSequenceScheduler import MeasurementSequenceScheduler
+
+
+class IncrementalScheduler(MeasurementSequenceScheduler):
+    """
+    Incremental counterpart of GraphState.schedule for local complementation searches.
+    The sequence and register trace of the last run are kept. A local complementation only changes
+    the adjacency among the neighbours of the complemented node, and the greedy choices made before
+    any of these neighbours became measurable only read unchanged adjacency. Rescheduling therefore
+    replays the recorded prefix and resumes the greedy loop from the first affected step.
+    Local complementations made through the scheduler only change the geometry, never the bases and
+    corrections of the graph state, so complementing twice about the same node is the identity. They are
+    logged by the scheduler itself between a checkpoint and its rollback.
+    """
+
+    def __init__(self, graph_state, arrival_order: bool = False):
+        self.graph_state = graph_state
+
+        self.qreg_trace: List[Set[any]] = []  # nodes loaded into the register at each step
+        self.size_trace: List[int] = []  # register size required up to each step
+        self.touched: Set[any] = set()  # nodes whose neighbourhood changed since the last run
+        self._undo_log: List[any] = None  # labels complemented about since the outermost checkpoint
+        self._opened: List[bool] = []  # whether each open checkpoint started the undo log
+
+        super().__init__(graph_state.geometry, graph_state.dependency.dep_map, arrival_order)
+
+    def invalidate(self) -> None:
+        """
+        Drop the recorded trace, e.g. after nodes or dependencies of the graph state changed.
+        """
+        self.sequence = []
+        self.qreg_trace = []
+        self.size_trace = []
+        self.enter_step = dict()
+        self.touched = set()
+        self.prepare()
+
+    def touch(self, nodes) -> None:
+        """
+        Mark nodes whose neighbourhood has been modified outside of this scheduler.
+        :param nodes: labels of the modified nodes.
+        """
+        self.touched.update(nodes)
+
+    def local_complement(self, label: any) -> None:
+        """
+        Local complement the geometry about the given node and record the modified neighbourhood.
+        The bases and corrections of the graph state are left as they are.
+        :param label: label to perform local complementation about.
+        """
+        self.touched.update(self.geometry.neighbours(label))
+        self.geometry.local_complement(label)
+        if self._undo_log is not None:
+            self._undo_log.append(label)
+
+    def checkpoint(self) -> int:
+        """
+        Start recording the local complementations made through this scheduler.
+        Checkpoints nest and each one is closed by a rollback, innermost first.
+        :return: the checkpoint to roll back to
+        """
+        self._opened.append(self._undo_log is None)
+        if self._undo_log is None:
+            self._undo_log = []
+        return len(self._undo_log)
+
+    def rollback(self, checkpoint: int) -> None:
+        """
+        Undo the local complementations made after the innermost open checkpoint and record the restored
+        neighbourhoods. Closing the checkpoint that started recording also stops it.
+        :param checkpoint: checkpoint returned by checkpoint.
+        """
+        if not self._opened:
+            raise ValueError("No checkpoint to roll back to, call checkpoint before the local complementations")
+        while len(self._undo_log) > checkpoint:
+            # The neighbourhood of the node itself is unchanged, so the same edges flip back
+            label = self._undo_log.pop()
+            self.touched.update(self.geometry.neighbours(label))
+            self.geometry.local_complement(label)
+        if self._opened.pop():
+            self._undo_log = None
+
+    def first_affected_step(self) -> int:
+        """
+        Find the first step of the recorded trace whose measurable queue meets a touched node.
+        :return: index of the step to resume the greedy loop from
+        """
+        step = len(self.sequence)
+        for node in self.touched:
+            if node not in self.enter_step:
+                return 0
+            step = min(step, self.enter_step[node])
+        return step
+
+    def schedule(self) -> (List[any], int):
+        """
+        Schedule the measurement sequence, identical to GraphState.schedule.
+        :return: a queue of nodes as measurement sequence and the size of register required
+        """
+        if self.geometry.nodes() != self._nodes:
+            self.invalidate()
+        start = self.first_affected_step()
+        for node in self.touched:
+            self._adjacency[node] = self.geometry.neighbours(node)
+        self.touched = set()
+        sequence, qreg_trace, size_trace = self.sequence, self.qreg_trace, self.size_trace
+
+        # Replay the unaffected prefix without maintaining the heap
+        self.reset()
+        self._heap = None
+        for step in range(start):
+            for node in qreg_trace[step]:
+                self._load(node)
+            self.sequence.append(sequence[step])
+            self._measure(sequence[step])
+        if self.arrival_order:
+            self._heap = [(self.key(node), node) for node in self.queue]
+            heapq.heapify(self._heap)
+        self.qreg_trace = qreg_trace[:start]
+        self.size_trace = size_trace[:start]
+        self.size = size_trace[start - 1] if start > 0 else 0
+
+        # Resume the greedy loop
+        while len(self.measured) < len(self._nodes):
+            _, delta_set = self.step()
+            self.qreg_trace.append(delta_set)
+            self.size_trace.append(self.size)
+
+        return list(self.sequence), self.size
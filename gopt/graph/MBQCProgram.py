@@ -0,0 +1,154 @@
+from array import array
+from typing import Dict, List
+
+import numpy as np
+
+# Opcodes
+ALLOC, CZ, PAULI, ROTATE, MEASURE, FREE = range(6)
+PAULIS = ('x', 'y', 'z')
+PLANES = ('xy', 'zy', 'xz')
+
+
+class MBQCProgram:
+    """
+    Instruction list of a compiled measurement sequence, kept in flat typed arrays.
+    Instruction i is ops[i] on qubit qubits[i] with argument args[i]: the other qubit of a CZ, the classical
+    bit of a measurement, the index in PAULIS of a Pauli or the index in PLANES of a rotation, whose angle is
+    angles[i]. A Pauli is applied on the parity of the classical bits conditions[ptrs[i]:ptrs[i + 1]].
+    ALLOC prepares a qubit in |+>, ROTATE maps the measurement base of a plane and an angle onto Z and FREE
+    releases a measured qubit for a later ALLOC.
+    """
+
+    def __init__(self, reg_size: int, creg_size: int) -> None:
+        self.reg_size = reg_size
+        self.creg_size = creg_size
+        self.ops = array('B')
+        self.qubits = array('i')
+        self.args = array('i')
+        self.angles = array('d')
+        self.ptrs = array('i', [0])
+        self.conditions = array('i')
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def _append(self, op: int, qubit: int, arg: int = 0, angle: float = 0.0) -> None:
+        self.ops.append(op)
+        self.qubits.append(qubit)
+        self.args.append(arg)
+        self.angles.append(angle)
+        self.ptrs.append(len(self.conditions))
+
+    def alloc(self, qubit: int) -> None:
+        self._append(ALLOC, qubit)
+
+    def cz(self, qubit: int, other: int) -> None:
+        self._append(CZ, qubit, other)
+
+    def pauli(self, qubit: int, base: str, clbits: List[int]) -> None:
+        """
+        Apply a Pauli on the parity of some classical bits.
+        :param base: x, y or z, z for any other value.
+        """
+        self.conditions.extend(clbits)
+        self._append(PAULI, qubit, PAULIS.index(base) if base in PAULIS else 2)
+
+    def rotate(self, qubit: int, plane: str, angle: float) -> None:
+        """
+        Rotate the measurement base of a plane and an angle onto Z, xz for any plane but xy and zy.
+        """
+        self._append(ROTATE, qubit, PLANES.index(plane) if plane in PLANES else 2, angle)
+
+    def measure(self, qubit: int, clbit: int) -> None:
+        self._append(MEASURE, qubit, clbit)
+
+    def free(self, qubit: int) -> None:
+        self._append(FREE, qubit)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get NumPy views of the instruction arrays, without copy.
+        """
+        return {name: np.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode)
+                for name in ("ops", "qubits", "args", "angles", "ptrs", "conditions") if len(getattr(self, name))}
+
+    def condition(self, i: int) -> List[int]:
+        return self.conditions[self.ptrs[i]:self.ptrs[i + 1]].tolist()
+
+    def to_qasm3(self) -> str:
+        """
+        Serialise into OpenQASM 3 with dynamic circuit syntax.
+        """
+        lines = ['OPENQASM 3.0;', 'include "stdgates.inc";',
+                 f'qubit[{self.reg_size}] q;', f'bit[{self.creg_size}] c;']
+        for i in range(len(self.ops)):
+            op, q, arg = self.ops[i], self.qubits[i], self.args[i]
+            if op == ALLOC:
+                lines.append(f'reset q[{q}];')
+                lines.append(f'h q[{q}];')
+            elif op == CZ:
+                lines.append(f'cz q[{q}], q[{arg}];')
+            elif op == PAULI:
+                clbits = self.condition(i)
+                if clbits:
+                    parity = ' ^ '.join(f'c[{clbit}]' for clbit in clbits)
+                    parity = parity if len(clbits) == 1 else f'({parity})'
+                    lines.append(f'if ({parity} == 1) {PAULIS[arg]} q[{q}];')
+            elif op == ROTATE:
+                angle = self.angles[i]
+                if PLANES[arg] == 'xy':
+                    lines.append(f'rz({-angle!r}) q[{q}];')
+                    lines.append(f'h q[{q}];')
+                elif PLANES[arg] == 'zy':
+                    lines.append(f'rx({angle!r}) q[{q}];')
+                else:
+                    lines.append(f'ry({angle!r}) q[{q}];')
+                    lines.append(f'h q[{q}];')
+            elif op == MEASURE:
+                lines.append(f'c[{arg}] = measure q[{q}];')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, filename):
+        file = open(filename, "w")
+        file.write(self.to_qasm3())
+        file.close()
+
+    def to_qiskit(self):
+        """
+        Convert into a qiskit circuit, qiskit is only imported here.
+        A Pauli on the parity of several classical bits becomes a single if_test on their XOR.
+        """
+        from qiskit import QuantumCircuit
+        from qiskit.circuit.classical import expr
+
+        circuit = QuantumCircuit(self.reg_size, self.creg_size)
+        for i in range(len(self.ops)):
+            op, q, arg = self.ops[i], self.qubits[i], self.args[i]
+            if op == ALLOC:
+                circuit.reset(q)
+                circuit.h(q)
+            elif op == CZ:
+                circuit.cz(q, arg)
+            elif op == PAULI:
+                clbits = self.condition(i)
+                if len(clbits) == 1:
+                    getattr(circuit, PAULIS[arg])(q).c_if(clbits[0], 1)
+                elif clbits:
+                    parity = circuit.clbits[clbits[0]]
+                    for clbit in clbits[1:]:
+                        parity = expr.bit_xor(parity, circuit.clbits[clbit])
+                    with circuit.if_test(parity):
+                        getattr(circuit, PAULIS[arg])(q)
+            elif op == ROTATE:
+                angle = self.angles[i]
+                if PLANES[arg] == 'xy':
+                    circuit.rz(-angle, q)
+                    circuit.h(q)
+                elif PLANES[arg] == 'zy':
+                    circuit.rx(angle, q)
+                else:
+                    circuit.ry(angle, q)
+                    circuit.h(q)
+            elif op == MEASURE:
+                circuit.measure(q, arg)
+        return circuit
@@ -1,45 +1,122 @@
 from typing import Dict
 
+import numpy as np
+
 from gopt.core.BlochSphere import BlochSphere
+from gopt.core.PauliFrame import PauliFrame, quarter_turns
 
 
 class MeasurementBaseLayer:
+    """
+    Measurement bases of a graph state.
+    Pauli bases are tracked exactly in a Pauli frame, only bases of non-Clifford angles are kept as float vectors.
+    """
+
     def __init__(self, angle_map: Dict[any, float]) -> None:
+        self.paulis: PauliFrame = PauliFrame()
         self.bases: Dict[(int, int), BlochSphere] = dict()
         for label, angle in angle_map.items():
-            if angle is None:
-                self.bases[label] = BlochSphere()
-            else:
-                self.bases[label] = BlochSphere('x')
-                self.bases[label].rotate_z(-angle)
+            self.add(label, angle)
+
+    def add(self, label: (int, int), angle: float) -> None:
+        """
+        Add the base of a node measured at an angle in the XY-plane, in Z base if the angle is None.
+        """
+        if angle is None:
+            self.paulis.add(label, 'z')
+        elif quarter_turns(angle) is not None:
+            self.paulis.add(label, 'x')
+            self.paulis.rotate(label, -angle, 'z')
+        else:
+            self.bases[label] = BlochSphere('x')
+            self.bases[label].rotate_z(-angle)
 
     def rotate(self, label: (int, int), angle: float, base: str) -> None:
+        if label in self.paulis:
+            if quarter_turns(angle) is not None:
+                self.paulis.rotate(label, angle, base)
+                return
+            # Leave the frame for a non-Clifford rotation
+            self.bases[label] = BlochSphere()
+            self.bases[label].vector = self.paulis.vector(label)
+            self.paulis.pop(label)
         self.bases[label].rotate(angle, base)
+        vector = np.round(self.bases[label].vector, self.bases[label]._precision_digit)
+        if np.count_nonzero(vector) == 1:
+            # Back to the frame once the base is Pauli again
+            axis = int(np.flatnonzero(vector)[0])
+            self.paulis.add(label, 'xyz'[axis], int(np.sign(vector[axis])))
+            self.bases.pop(label)
 
     def flip_z(self, label: (int, int)) -> None:
-        self.bases[label].flip_z()
+        if label in self.paulis:
+            self.paulis.flip_z(label)
+        else:
+            self.bases[label].flip_z()
 
     def rotate_sqrt_x(self, label: (int, int), direction: int):
-        self.bases[label].rotate_sqrt_x(direction)
+        if label in self.paulis:
+            self.paulis.rotate_sqrt_x(label, direction)
+        else:
+            self.bases[label].rotate_sqrt_x(direction)
 
     def rotate_sqrt_z(self, label: (int, int), direction: int):
-        self.bases[label].rotate_sqrt_z(direction)
+        if label in self.paulis:
+            self.paulis.rotate_sqrt_z(label, direction)
+        else:
+            self.bases[label].rotate_sqrt_z(direction)
+
+    def save(self, label: (int, int)) -> any:
+        """
+        Save the base of a label to restore it later.
+        :return: the frame code of a Pauli base, a copy of the Bloch vector otherwise
+        """
+        if label in self.paulis:
+            return self.paulis.code(label)
+        elif label in self.bases:
+            return self.bases[label].vector.copy()
+        return None
+
+    def restore(self, label: (int, int), state: any) -> None:
+        """
+        Restore the base of a label from save.
+        """
+        if state is None:
+            return
+        elif isinstance(state, int):
+            self.bases.pop(label, None)
+            self.paulis.set_code(label, state)
+        else:
+            if label in self.paulis:
+                self.paulis.pop(label)
+            if label not in self.bases:
+                self.bases[label] = BlochSphere()
+            self.bases[label].vector = state
 
     def cutoff(self, label: (int, int)):
-        self.bases.pop(label)
+        if label in self.paulis:
+            self.paulis.pop(label)
+        else:
+            self.bases.pop(label)
 
     def pauli_base(self, label):
-        base = self.bases[label].pauli_base()
-        if base:
-            return base
+        if label in self.paulis:
+            return self.paulis.pauli_base(label)
         else:
             return "t"
 
     def pauli_sign(self, label):
-        return self.bases[label].pauli_sign()
+        if label in self.paulis:
+            return self.paulis.pauli_sign(label)
+        else:
+            return None
 
     def angle(self, label):
+        if label in self.paulis:
+            return self.paulis.plane_angle(label)
         return self.bases[label].plane_angle()
 
     def measurement_plane(self, label):
+        if label in self.paulis:
+            return self.paulis.plane(label)
         return self.bases[label].plane()
@@ -0,0 +1,209 @@
+import heapq
+from typing import Dict, List, Set
+
+import numpy as np
+
+import networkx as nx
+
+from .GeometryLayer import GeometryLayer
+
+
+class MeasurementSequenceScheduler:
+    """
+    Greedy measurement sequence scheduler.
+    A node is measured once all nodes it depends on are measured, and measuring it loads its unmeasured
+    neighbours into the register. Each round measures the measurable node loading the fewest new qubits,
+    preferring among nodes loading none the one of highest degree. Unloaded-neighbour counts, degrees and
+    pending dependencies are maintained incrementally.
+    By default ties are broken as GraphState.schedule always did, by the iteration order of the measurable
+    set, including its quirk of loading the delta set of the last nonzero-delta candidate when a zero-delta
+    node of higher degree takes over. Set iteration order cannot be expressed as a heap key, so this mode scans
+    the measurable set each round and gives the same sequence and size as before.
+    With arrival_order, measurable nodes sit in a heap keyed by delta, negated degree for zero-delta nodes and
+    the order in which they became measurable, and a pick only loads its own neighbourhood. Rounds are then
+    logarithmic in the measurable set and the result no longer depends on hashing, but sequences and sizes
+    differ from the default, sometimes for the worse.
+    """
+
+    def __init__(self, geometry: GeometryLayer, dep_map: Dict[any, Set[any]], arrival_order: bool = False):
+        """
+        :param geometry: geometry of the graph state, or a networkx graph.
+        :param dep_map: dependency sources of each node.
+        :param arrival_order: break ties by arrival order in a heap instead of reproducing GraphState.schedule.
+        """
+        if isinstance(geometry, nx.Graph):
+            geometry = GeometryLayer(geometry)
+        self.geometry: GeometryLayer = geometry
+        self.dep_map: Dict[any, Set[any]] = dep_map
+        self.arrival_order: bool = arrival_order
+
+        self.qreg: Set[any] = set()  # virtual register
+        self.queue: Set[any] = set()  # measurable queue
+        self.measured: Set[any] = set()
+        self.sequence: List[any] = []  # measurement sequence
+        self.size: int = 0  # qubits required
+
+        self._nodes: List[any] = []
+        self._position: Dict[any, int] = dict()
+        self._adjacency: Dict[any, Set[any]] = dict()
+        self._dependents: Dict[any, List[any]] = dict()
+
+        # Helper data of the greedy loop
+        self._pending: Dict[any, int] = dict()  # unmeasured dependency sources
+        self._outside: Dict[any, int] = dict()  # unloaded nodes in the closed neighbourhood
+        self._degree: Dict[any, int] = dict()  # degree in the unmeasured subgraph
+        self._arrival: Dict[any, int] = dict()  # order in which nodes became measurable
+        self._heap: List[((int, int, int), any)] = []  # None while the keys are not maintained
+        self.enter_step: Dict[any, int] = dict()  # step at which nodes became measurable
+
+        self.prepare()
+
+    def prepare(self) -> None:
+        """
+        Read the nodes, adjacency and dependencies to schedule.
+        """
+        self._nodes = self.geometry.nodes()
+        self._position = {node: i for i, node in enumerate(self._nodes)}
+        self._adjacency = {node: self.geometry.neighbours(node) for node in self._nodes}
+        self._dependents = dict()
+        for target, sources in self.dep_map.items():
+            for source in sources:
+                if source not in self._dependents:
+                    self._dependents[source] = []
+                self._dependents[source].append(target)
+
+    def reset(self) -> None:
+        """
+        Reset the helper data to the state before the first measurement.
+        """
+        self.qreg = set()
+        self.queue = set()
+        self.measured = set()
+        self.sequence = []
+        self.size = 0
+
+        self._pending = {node: len(sources) for node, sources in self.dep_map.items()}
+        self._outside = {node: len(neighbours) + 1 for node, neighbours in self._adjacency.items()}
+        self._degree = {node: len(neighbours) for node, neighbours in self._adjacency.items()}
+        self._arrival = dict()
+        self._heap = [] if self.arrival_order else None
+        self.enter_step = dict()
+
+        for node in self._nodes:
+            if self._pending.get(node, 0) == 0:
+                self._enqueue(node)
+
+    def key(self, node: any) -> (int, int, int):
+        """
+        Priority of a measurable node, the smallest one is measured first.
+        :param node: label of a measurable node.
+        :return: register delta, negated degree if the delta is zero, arrival order
+        """
+        delta = self._outside[node]
+        return delta, -self._degree[node] if delta == 0 else 0, self._arrival[node]
+
+    def _push(self, node: any) -> None:
+        if self._heap is not None:
+            heapq.heappush(self._heap, (self.key(node), node))
+
+    def _enqueue(self, node: any) -> None:
+        self._arrival[node] = len(self._arrival)
+        self.enter_step[node] = len(self.measured)
+        self.queue.add(node)
+        self._push(node)
+
+    def _pop(self) -> any:
+        """
+        Pop the measurable node of smallest key, skipping stale entries.
+        """
+        while True:
+            key, node = heapq.heappop(self._heap)
+            if node in self.queue and key == self.key(node):
+                return node
+
+    def _load(self, node: any) -> None:
+        """
+        Load a node into the virtual register.
+        """
+        self.qreg.add(node)
+        self._outside[node] -= 1
+        if node in self.queue:
+            self._push(node)
+        for neighbour in self._adjacency[node]:
+            self._outside[neighbour] -= 1
+            if neighbour in self.queue:
+                self._push(neighbour)
+
+    def _measure(self, node: any) -> None:
+        """
+        Measure a loaded node and queue up the nodes it releases.
+        """
+        self.qreg.remove(node)
+        self.queue.remove(node)
+        self.measured.add(node)
+        for neighbour in self._adjacency[node]:
+            self._degree[neighbour] -= 1
+            if neighbour in self.queue and self._outside[neighbour] == 0:
+                self._push(neighbour)
+
+        if node in self._dependents:
+            released = []
+            for target in self._dependents[node]:
+                self._pending[target] -= 1
+                if self._pending[target] == 0 and target in self._position and target not in self.measured:
+                    released.append(target)
+            released.sort(key=self._position.get)
+            for target in released:
+                self._enqueue(target)
+
+    def _scan(self) -> (any, int, any):
+        """
+        Pick the next node by scanning the measurable set in iteration order, as GraphState.schedule did.
+        :return: the picked node, its register delta and the node whose delta set is loaded, if any
+        """
+        delta: int = np.inf
+        node_min: any = None
+        degree_min: int = 0
+        delta_node: any = None
+        for node in self.queue:
+            # CASE 1: delta = 0
+            if self._outside[node] == 0 and (node_min is None or self._degree[node] > degree_min):
+                node_min = node
+                degree_min = self._degree[node]
+                delta = 0
+
+            elif self._outside[node] < delta:
+                delta = self._outside[node]
+                node_min = node
+                degree_min = self._degree[node]
+                delta_node = node
+        return node_min, delta, delta_node
+
+    def step(self) -> (any, Set[any]):
+        """
+        Measure the next node of the sequence.
+        :return: the measured node and the nodes loaded into the register for it
+        """
+        if self.arrival_order:
+            node = delta_node = self._pop()
+        else:
+            node, _, delta_node = self._scan()
+        delta_set = set() if delta_node is None else \
+            self._adjacency[delta_node].union({delta_node}).difference(self.qreg).difference(self.measured)
+        # The register grows by the delta of the picked node, the quirk may load more ahead of time
+        self.size = max(self.size, len(self.qreg) + self._outside[node])
+        for loaded in delta_set:
+            self._load(loaded)
+        self.sequence.append(node)
+        self._measure(node)
+        return node, delta_set
+
+    def schedule(self) -> (List[any], int):
+        """
+        Schedule an optimized measurement sequence
+        :return: a queue of nodes as measurement sequence and the size of register required
+        """
+        self.reset()
+        while len(self.measured) < len(self._nodes):
+            self.step()
+        return list(self.sequence), self.size
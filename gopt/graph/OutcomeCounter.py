@@ -0,0 +1,145 @@
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Largest projected width counted in a dense table of 2^width entries
+_DENSE_WIDTH = 20
+
+
+class OutcomeCounter:
+    """
+    Counter of measurement outcomes projected onto the output registers.
+    Outcomes come as counts of bitstrings, classical bit 0 rightmost as qiskit reports them, or as raw shots,
+    either packed integers whose bit i is classical bit i or uint8 bit matrices whose column i is classical bit i.
+    They are projected with NumPy bit operations and counted by bincount in a dense table for up to 20 outputs,
+    by np.unique otherwise. Outcomes can be added chunk by chunk, memory is then bounded by the number of
+    distinct projected outcomes rather than the number of shots.
+    """
+
+    def __init__(self, registers: List[int], first_last: bool = True) -> None:
+        """
+        :param registers: classical bit of each output, in output order.
+        :param first_last: whether the first output is the last character of the counted bitstrings, or the first.
+        """
+        self.registers: np.ndarray = np.asarray(registers, dtype=np.int64)
+        self.width: int = len(self.registers)
+        # Position of each output in the projected words
+        self.positions: np.ndarray = np.arange(self.width) if first_last else np.arange(self.width)[::-1]
+        self.shots: int = 0
+        self._table: np.ndarray = np.zeros(1 << self.width, dtype=np.int64) if self.width <= _DENSE_WIDTH else None
+        self._values: np.ndarray = None
+        self._tallies: np.ndarray = None
+
+    def add(self, outcomes, counts=None) -> 'OutcomeCounter':
+        """
+        Count a chunk of outcomes.
+        :param outcomes: dict of bitstring counts, list of bitstrings, 1D array of packed words or 2D bit matrix.
+        :param counts: number of shots of each word or row, one each if None.
+        :return: the counter itself
+        """
+        if isinstance(outcomes, dict):
+            outcomes, counts = list(outcomes.keys()), np.fromiter(outcomes.values(), dtype=np.int64,
+                                                                  count=len(outcomes))
+        if isinstance(outcomes, (list, tuple)) and (not outcomes or isinstance(outcomes[0], str)):
+            outcomes = self._bit_matrix(outcomes)
+        outcomes = np.asarray(outcomes)
+        if len(outcomes) == 0:
+            return self
+        if counts is not None:
+            counts = np.asarray(counts, dtype=np.int64)
+        if outcomes.ndim == 2:
+            words = self._project_bits(outcomes)
+        else:
+            words = self._project_words(outcomes)
+        self.shots += int(counts.sum()) if counts is not None else len(words)
+        if self._table is not None:
+            self._table += np.bincount(words, weights=counts, minlength=len(self._table)).astype(np.int64)
+            return self
+        values, inverse = np.unique(words, return_inverse=True, axis=0 if words.ndim == 2 else None)
+        tallies = np.bincount(inverse.ravel(), weights=counts, minlength=len(values)).astype(np.int64)
+        if self._values is not None:
+            values, inverse = np.unique(np.concatenate([self._values, values]), return_inverse=True,
+                                        axis=0 if words.ndim == 2 else None)
+            tallies = np.bincount(inverse.ravel(), weights=np.concatenate([self._tallies, tallies]),
+                                  minlength=len(values)).astype(np.int64)
+        self._values, self._tallies = values, tallies
+        return self
+
+    def consume(self, chunks: Iterable) -> 'OutcomeCounter':
+        """
+        Count outcomes from an iterable such as a generator, each chunk either outcomes or (outcomes, counts).
+        :return: the counter itself
+        """
+        for chunk in chunks:
+            if isinstance(chunk, tuple):
+                self.add(*chunk)
+            else:
+                self.add(chunk)
+        return self
+
+    @staticmethod
+    def _bit_matrix(words: List[str]) -> np.ndarray:
+        """
+        Convert bitstrings to a bit matrix, classical bit 0 as the rightmost character and column 0.
+        """
+        words = [word.replace(' ', '') for word in words]
+        if not words:
+            return np.zeros((0, 0), dtype=np.uint8)
+        bits = np.frombuffer(''.join(words).encode(), dtype=np.uint8).reshape(len(words), -1) - ord('0')
+        return bits[:, ::-1]
+
+    def _project_bits(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Project a bit matrix onto the outputs.
+        :return: packed words if narrow enough, else a bit matrix with the outputs in word positions
+        """
+        bits = bits[:, self.registers].astype(np.uint8)
+        if self.width < 63:
+            return (bits.astype(np.int64) << self.positions).sum(axis=1)
+        retval = np.empty_like(bits)
+        retval[:, self.positions] = bits
+        return retval
+
+    def _project_words(self, words: np.ndarray) -> np.ndarray:
+        """
+        Project packed words onto the outputs.
+        """
+        words = words.astype(np.int64)
+        if self.width >= 63:
+            return self._project_bits((words[:, None] >> np.arange(63)) & 1)
+        if self.width and np.array_equal(self.registers - self.registers[0], self.positions):
+            # Outputs on consecutive classical bits in order, a single shift and mask
+            return (words >> int(self.registers[0])) & ((1 << self.width) - 1)
+        retval = np.zeros(len(words), dtype=np.int64)
+        for register, position in zip(self.registers.tolist(), self.positions.tolist()):
+            retval |= ((words >> register) & 1) << position
+        return retval
+
+    def arrays(self) -> (np.ndarray, np.ndarray):
+        """
+        Get the distinct projected outcomes counted so far and their counts.
+        :return: words or rows of bits, output at word position i as bit i or column i, and their counts
+        """
+        if self._table is not None:
+            values = np.flatnonzero(self._table)
+            return values, self._table[values]
+        if self._values is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return self._values, self._tallies
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Get the counts of the projected bitstrings, word position 0 as the rightmost character.
+        """
+        values, tallies = self.arrays()
+        if values.ndim == 2:
+            words = np.ascontiguousarray(values[:, ::-1] + ord('0')).view(f'S{self.width}').ravel()
+            return {word.decode(): count for word, count in zip(words.tolist(), tallies.tolist())}
+        return {format(value, f'0{self.width}b') if self.width else '': count
+                for value, count in zip(values.tolist(), tallies.tolist())}
+
+    def process(self, outcomes, counts=None) -> Dict[str, int]:
+        """
+        Count outcomes and get the counts of the projected bitstrings.
+        """
+        return self.add(outcomes, counts).counts()
@@ -0,0 +1,119 @@
+from typing import Dict, List
+
+from math import pi
+
+
+class PauliEliminator:
+    """
+    Batched Pauli measurement elimination of a graph state.
+    The adjacency is held as GF(2) rows packed into big-ints, so a local complementation is one XOR of the
+    neighbourhood mask per neighbour row and a Z measurement clears a single bit per neighbour row.
+    Measurements follow GraphState.measure node by node in the same order and with the same pivots, so the
+    result is the same as eliminate_pauli(batched=False); the geometry and the dependency layer are only
+    written back once the whole batch is eliminated. The nodes are not eliminated as one bulk GF(2) row
+    reduction since each measurement rotates the bases of the neighbourhoods the later ones read.
+    X measurements pivot about the neighbour of lowest degree, the smallest label among ties, which keeps
+    the reduced geometry sparse.
+    """
+
+    def __init__(self, graph_state):
+        self.graph_state = graph_state
+        self.bases = graph_state.bases
+        self.dependency = graph_state.dependency
+        self.outputs = set(graph_state.output_layer)
+
+        self.labels: List[any] = list(graph_state.geometry.label_register())
+        self.label2idx: Dict[any, int] = {label: i for i, label in enumerate(self.labels)}
+        self.rows: List[int] = list(graph_state.geometry.adjacency_rows())
+        self.alive: int = (1 << len(self.labels)) - 1
+        self.measured: List[any] = []
+
+    @staticmethod
+    def _indices(mask: int):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def local_complement(self, i: int, direction: int = 1) -> None:
+        """
+        Local complement the rows about the node of the given index and update the bases accordingly.
+        :param i: index of the node to perform local complementation about.
+        :param direction: direction of the basis rotations.
+        """
+        neighbourhood = self.rows[i]
+        label = self.labels[i]
+        self.bases.rotate_sqrt_x(label, direction)
+        self.dependency.rotate_sqrt_x(label, direction)
+        for j in self._indices(neighbourhood):
+            self.rows[j] ^= neighbourhood ^ (1 << j)
+            self.bases.rotate_sqrt_z(self.labels[j], -direction)
+            self.dependency.rotate_sqrt_z(self.labels[j], -direction)
+
+    def z_measurement(self, i: int) -> None:
+        label = self.labels[i]
+        direction = self.bases.pauli_sign(label)
+        bit = 1 << i
+        for j in self._indices(self.rows[i]):
+            self.rows[j] ^= bit
+            if direction == -1:
+                self.bases.rotate(self.labels[j], pi, 'z')
+        self.rows[i] = 0
+        self.alive ^= bit
+        self.bases.cutoff(label)
+        self.measured.append(label)
+
+    def x_measurement(self, i: int) -> None:
+        neighbourhood = self.rows[i]
+        if neighbourhood == 0:
+            self.z_measurement(i)
+        else:
+            b = min(self._indices(neighbourhood), key=lambda j: (self.rows[j].bit_count(), self.labels[j]))
+            self.local_complement(b, -1)
+            self.measure(i)
+            self.local_complement(b)
+
+    def measure(self, i: int) -> bool:
+        """
+        Eliminate the node of the given index if it is a non-output node measured in a Pauli base.
+        :param i: index of the node.
+        :return: true if the node is eliminated
+        """
+        label = self.labels[i]
+        if label in self.outputs:
+            return False
+        base = self.bases.pauli_base(label)
+        if base == 'x':
+            self.x_measurement(i)
+        elif base == 'y':
+            self.local_complement(i)
+            self.measure(i)
+        elif base == 'z':
+            self.z_measurement(i)
+        else:
+            return False
+        return True
+
+    def run(self) -> bool:
+        """
+        Eliminate all Pauli measured nodes and write the result back to the graph state.
+        :return: true if any node is eliminated
+        """
+        original = list(self.rows)
+        for i in range(len(self.labels)):
+            self.measure(i)
+
+        # Write back the geometry, toggling only the edges that changed among the remaining nodes
+        geometry = self.graph_state.geometry
+        for label in self.measured:
+            geometry.cutoff(label)
+        for i in self._indices(self.alive):
+            changed = (original[i] & self.alive) ^ self.rows[i]
+            for j in self._indices(changed >> (i + 1) << (i + 1)):
+                if self.rows[i] >> j & 1:
+                    geometry.add_edge(self.labels[i], self.labels[j])
+                else:
+                    geometry.remove_edge(self.labels[i], self.labels[j])
+        self.dependency.cutoff_nodes(self.measured)
+
+        return len(self.measured) > 0
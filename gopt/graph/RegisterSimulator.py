@@ -0,0 +1,176 @@
+from typing import Dict, List
+
+import networkx as nx
+import numpy as np
+
+from .OutcomeCounter import OutcomeCounter
+
+_X = np.array([[0, 1], [1, 0]], dtype=complex)
+_Y = np.array([[0, -1j], [1j, 0]], dtype=complex)
+_Z = np.array([[1, 0], [0, -1]], dtype=complex)
+_H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+_CORRECTIONS = {'x': _X, 'y': _Y}
+
+
+def _rx(angle: float) -> np.ndarray:
+    return np.array([[np.cos(angle / 2), -1j * np.sin(angle / 2)],
+                     [-1j * np.sin(angle / 2), np.cos(angle / 2)]])
+
+
+def _ry(angle: float) -> np.ndarray:
+    return np.array([[np.cos(angle / 2), -np.sin(angle / 2)],
+                     [np.sin(angle / 2), np.cos(angle / 2)]], dtype=complex)
+
+
+def _rz(angle: float) -> np.ndarray:
+    return np.diag([np.exp(-0.5j * angle), np.exp(0.5j * angle)])
+
+
+class RegisterSimulator:
+    """
+    Statevector simulator of a graph state that executes its measurement sequence directly.
+    It mirrors GraphState.compile: the nodes are measured in scheduled order, a node and its unmeasured
+    neighbours are allocated in |+> and entangled right before the node is measured, and each
+    dependency source measured 1 applies the correction of the node once. So at most reg_size qubits are
+    alive at any time. Shots are simulated together as branches that each carry a number of shots:
+    a measurement splits every branch in two and draws the number of shots of each outcome from
+    the binomial of its probability. The state is a (branches, 2, ..., 2) array. The branches are
+    chunked so that it never exceeds max_amplitudes entries.
+    """
+
+    def __init__(self, graph_state, sequence: List[any] = None, seed=None, max_amplitudes: int = 1 << 22):
+        """
+        :param graph_state: the graph state to simulate.
+        :param sequence: measurement sequence, the schedule of the graph state if None.
+        :param seed: seed or generator of the outcomes.
+        :param max_amplitudes: largest number of amplitudes held over all branches.
+        """
+        self.graph_state = graph_state
+        if sequence is None:
+            sequence, reg_size = graph_state.schedule()
+        else:
+            reg_size = None
+        self.sequence: List[any] = list(sequence)
+        self.max_amplitudes = max_amplitudes
+        self.rng = np.random.default_rng(seed)
+
+        bases = graph_state.bases
+        dependency = graph_state.dependency
+        self.geometry: nx.Graph = graph_state.geometry.G
+        self.outputs: List[any] = list(graph_state.output_layer)
+        # Measurement basis change of each node, mirroring compile
+        self.rotations: Dict[any, np.ndarray] = dict()
+        for node in self.sequence:
+            plane, angle = bases.measurement_plane(node), bases.angle(node)
+            if plane == "xy":
+                self.rotations[node] = _H @ _rz(-angle)
+            elif plane == "zy":
+                self.rotations[node] = _rx(angle)
+            else:
+                self.rotations[node] = _H @ _ry(angle)
+        self.corrections: Dict[any, np.ndarray] = {
+            node: _CORRECTIONS.get(dependency.correction_base(node), _Z) for node in dependency.dep_map}
+        self.sources: Dict[any, List[any]] = {node: list(sources) for node, sources in dependency.dep_map.items()
+                                              if sources}
+        # Only the outcomes of sources and outputs are kept
+        kept = set(self.outputs)
+        for sources in self.sources.values():
+            kept.update(sources)
+        self.columns: Dict[any, int] = {node: i for i, node in enumerate(node for node in self.sequence
+                                                                         if node in kept)}
+        self.reg_size: int = reg_size if reg_size is not None else self.register_size()
+
+    def register_size(self) -> int:
+        """
+        Compute the register size needed by the measurement sequence.
+        """
+        alive, retval = set(), 0
+        geometry = self.geometry.copy()
+        for node in self.sequence:
+            alive.add(node)
+            alive.update(geometry.neighbors(node))
+            retval = max(retval, len(alive))
+            alive.discard(node)
+            geometry.remove_node(node)
+        return retval
+
+    @staticmethod
+    def _apply(state: np.ndarray, gate: np.ndarray, axis: int) -> np.ndarray:
+        return np.moveaxis(np.tensordot(state, gate, axes=([axis], [1])), -1, axis)
+
+    def _chunk(self) -> int:
+        width = max(1, len(self.columns))
+        return max(1, min(self.max_amplitudes >> self.reg_size, self.max_amplitudes // width))
+
+    def sample(self, shots: int) -> np.ndarray:
+        """
+        Sample the outcomes of the kept nodes, the sources and the outputs.
+        :param shots: number of shots.
+        :return: (shots, kept nodes) array of outcome bits, columns as in self.columns
+        """
+        chunk = self._chunk()
+        outcomes = []
+        for start in range(0, shots, chunk):
+            bits, counts = self._branches(min(chunk, shots - start))
+            outcomes.append(np.repeat(bits, counts, axis=0))
+        if not outcomes:
+            return np.zeros((0, len(self.columns)), dtype=np.uint8)
+        return np.concatenate(outcomes)
+
+    def _branches(self, shots: int) -> (np.ndarray, np.ndarray):
+        """
+        Simulate a number of shots together.
+        :return: outcome bits of each branch and its number of shots
+        """
+        state = np.ones((1,), dtype=complex)
+        counts = np.array([shots], dtype=np.int64)
+        bits = np.zeros((1, len(self.columns)), dtype=np.uint8)
+        alive: List[any] = []
+        measured = set()
+        for node in self.sequence:
+            neighbours = [next_node for next_node in self.geometry.neighbors(node) if next_node not in measured]
+            # Allocate the node and its neighbours in |+>
+            for next_node in [node, *neighbours]:
+                if next_node not in alive:
+                    alive.append(next_node)
+                    state = np.stack([state, state], axis=-1) / np.sqrt(2)
+            axis = 1 + alive.index(node)
+            # Construct partial graph state, the edges to measured nodes are already there
+            for next_node in neighbours:
+                index = [slice(None)] * state.ndim
+                index[axis] = 1
+                index[1 + alive.index(next_node)] = 1
+                state[tuple(index)] *= -1
+            # Process correction on the parity of the source outcomes
+            if node in self.sources:
+                flip = np.bitwise_xor.reduce(bits[:, [self.columns[source] for source in self.sources[node]]],
+                                             axis=1).astype(bool)
+                if flip.any():
+                    state[flip] = self._apply(state[flip], self.corrections[node], axis)
+            # Measure node
+            state = self._apply(state, self.rotations[node], axis)
+            one = np.take(state, 1, axis=axis)
+            p1 = np.sum(np.abs(one.reshape(len(counts), -1)) ** 2, axis=1)
+            p1 = np.clip(p1, 0, 1)
+            n1 = self.rng.binomial(counts, p1)
+            n0 = counts - n1
+            zero, one = np.take(state, 0, axis=axis)[n0 > 0], one[n1 > 0]
+            shape = (-1,) + (1,) * (state.ndim - 2)
+            state = np.concatenate([zero / np.sqrt(1 - p1[n0 > 0]).reshape(shape),
+                                    one / np.sqrt(p1[n1 > 0]).reshape(shape)])
+            outcome = np.concatenate([np.zeros(np.count_nonzero(n0), dtype=np.uint8),
+                                      np.ones(np.count_nonzero(n1), dtype=np.uint8)])
+            bits = np.concatenate([bits[n0 > 0], bits[n1 > 0]])
+            if node in self.columns:
+                bits[:, self.columns[node]] = outcome
+            counts = np.concatenate([n0[n0 > 0], n1[n1 > 0]])
+            alive.remove(node)
+            measured.add(node)
+        return bits, counts
+
+    def run(self, shots: int) -> Dict[str, int]:
+        """
+        Sample the outputs, counted by bitstrings as GraphState.process_outcomes, the first output last.
+        """
+        outcomes = self.sample(shots)
+        return OutcomeCounter([self.columns[node] for node in self.outputs]).process(outcomes)
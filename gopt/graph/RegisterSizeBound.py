@@ -0,0 +1,105 @@
+import heapq
+from typing import Dict, Set
+
+import networkx as nx
+
+from .GeometryLayer import GeometryLayer
+
+
+class RegisterSizeBound:
+    """
+    Provable lower bounds on the register size of any measurement sequence of a geometry.
+    After measuring a set S the register holds the unmeasured neighbours of S plus the node just measured,
+    so the register size of the best sequence is one more than the vertex separation number, which
+    equals the pathwidth and is at least the treewidth. Treewidth lower bounds thus give register bounds:
+    min_degree: the minimum degree, the cheapest bound.
+    degeneracy: the largest minimum degree of any subgraph.
+    mmd+: the largest minimum degree of any minor met by contracting a minimum degree node into its
+    neighbour of minimum degree (MMD+ min-d), at least the degeneracy.
+    Dependencies are ignored, which only weakens the bounds.
+    """
+    METHODS = ("min_degree", "degeneracy", "mmd+")
+
+    def __init__(self, method: str = "mmd+"):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown bound {method}")
+        self.method = method
+
+    def __call__(self, geometry) -> int:
+        """
+        Compute the lower bound of a geometry.
+        :param geometry: GeometryLayer or networkx graph.
+        :return: lower bound on the register size
+        """
+        if self.method == "min_degree":
+            return self.min_degree(geometry)
+        elif self.method == "degeneracy":
+            return self.degeneracy(geometry)
+        return self.mmd_plus(geometry)
+
+    @staticmethod
+    def _adjacency(geometry) -> Dict[any, Set[any]]:
+        if isinstance(geometry, nx.Graph):
+            geometry = GeometryLayer(geometry)
+        return {node: geometry.neighbours(node) for node in geometry.nodes()}
+
+    @staticmethod
+    def min_degree(geometry) -> int:
+        if isinstance(geometry, nx.Graph):
+            geometry = GeometryLayer(geometry)
+        nodes = geometry.nodes()
+        if not nodes:
+            return 0
+        return 1 + min(geometry.degree(node) for node in nodes)
+
+    @staticmethod
+    def degeneracy(geometry) -> int:
+        adjacency = RegisterSizeBound._adjacency(geometry)
+        if not adjacency:
+            return 0
+        degrees = {node: len(neighbours) for node, neighbours in adjacency.items()}
+        heap = [(degree, i, node) for i, (node, degree) in enumerate(degrees.items())]
+        heapq.heapify(heap)
+        order = {node: i for i, (_, _, node) in enumerate(heap)}
+        removed = set()
+        retval = 0
+        while heap:
+            degree, _, node = heapq.heappop(heap)
+            if node in removed or degree != degrees[node]:
+                continue
+            retval = max(retval, degree)
+            removed.add(node)
+            for neighbour in adjacency[node]:
+                if neighbour not in removed:
+                    degrees[neighbour] -= 1
+                    heapq.heappush(heap, (degrees[neighbour], order[neighbour], neighbour))
+        return 1 + retval
+
+    @staticmethod
+    def mmd_plus(geometry) -> int:
+        adjacency = RegisterSizeBound._adjacency(geometry)
+        if not adjacency:
+            return 0
+        order = {node: i for i, node in enumerate(adjacency)}
+        heap = [(len(neighbours), order[node], node) for node, neighbours in adjacency.items()]
+        heapq.heapify(heap)
+        retval = 0
+        while heap:
+            degree, _, node = heapq.heappop(heap)
+            if node not in adjacency or degree != len(adjacency[node]):
+                continue
+            retval = max(retval, degree)
+            neighbours = adjacency.pop(node)
+            if not neighbours:
+                continue
+            # Contract the edge to the neighbour of minimum degree
+            target = min(neighbours, key=lambda neighbour: (len(adjacency[neighbour]), order[neighbour]))
+            for neighbour in neighbours:
+                adjacency[neighbour].discard(node)
+            for neighbour in neighbours:
+                if neighbour != target and neighbour not in adjacency[target]:
+                    adjacency[target].add(neighbour)
+                    adjacency[neighbour].add(target)
+            for neighbour in neighbours:
+                heapq.heappush(heap, (len(adjacency[neighbour]), order[neighbour], neighbour))
+        return 1 + retval
@@ -0,0 +1,450 @@
+from typing import Dict, List
+
+import numpy as np
+
+from gopt.core.PauliFrame import quarter_turns
+from .OutcomeCounter import OutcomeCounter
+from .RegisterSimulator import RegisterSimulator
+
+
+def _phase_bits(x1: np.ndarray, z1: np.ndarray, x2: np.ndarray, z2: np.ndarray) -> np.ndarray:
+    """
+    Get the sign bit picked up by multiplying a Pauli row into each of some rows, rowsum of Aaronson and Gottesman.
+    :return: True where the product gains a minus sign
+    """
+    x1, z1, x2, z2 = (bits.astype(np.int8) for bits in (x1, z1, x2, z2))
+    g = np.where(x1 & z1, z2 - x2, np.where(x1, z2 * (2 * x2 - 1), np.where(z1, x2 * (1 - 2 * z2), 0)))
+    return np.mod(g.sum(axis=-1), 4) == 2
+
+
+class StabilizerSimulator(RegisterSimulator):
+    """
+    Stabilizer tableau simulator of a graph state measured in Pauli bases only.
+    The measurement sequence is executed once on a tableau of reg_size qubits, following Aaronson and
+    Gottesman, whose signs are kept symbolic: each sign is an affine form over GF(2) in the outcomes of
+    the random measurements, stored as an int whose bit 0 is the constant and bit v the v-th random outcome.
+    Every outcome is then an affine form too, the outcomes of the kept nodes are uniformly distributed over
+    an affine subspace and shots are sampled by XOR of its basis vectors, without any further simulation.
+    With a few non-Clifford measurements, t of them, the state is instead a sum of at most 2^t stabilizer
+    terms: the coordinates of the state in the orthonormal basis D^a|psi> of the tableau, D^a the product
+    of the destabilizers picked by a. Clifford gates and Pauli corrections only act on the tableau, each
+    non-Clifford rotation cos I - i sin Z at most doubles the terms and a random measurement maps them into
+    the updated tableau. Shots are simulated as branches as in RegisterSimulator, with the signs of the
+    tableau and the coordinates per branch. This is used when the terms are fewer than the 2^reg_size
+    amplitudes of the statevector of RegisterSimulator, which remains the fallback otherwise.
+    """
+
+    def __init__(self, graph_state, sequence: List[any] = None, seed=None, max_amplitudes: int = 1 << 22,
+                 max_terms: int = 1 << 12):
+        """
+        :param max_terms: largest number of stabilizer terms of a graph state with non-Clifford measurements.
+        """
+        super().__init__(graph_state, sequence, seed, max_amplitudes)
+        bases = graph_state.bases
+        self.angles: Dict[any, float] = {node: bases.angle(node) for node in self.sequence}
+        self.turns: Dict[any, int] = {node: quarter_turns(self.angles[node]) for node in self.sequence}
+        self.planes: Dict[any, str] = {node: bases.measurement_plane(node) for node in self.sequence}
+        self.non_clifford: int = sum(turns is None for turns in self.turns.values())
+        self.clifford: bool = self.non_clifford == 0
+        n = self.reg_size
+        self.sum_over_terms: bool = 0 < self.non_clifford and (1 << self.non_clifford) <= max_terms and \
+            (1 << self.non_clifford) + 4 * n * n < (1 << n)
+        self._forms: Dict[any, int] = None
+
+    def _init_tableau(self) -> None:
+        n = self.reg_size
+        # Destabilizers X_i then stabilizers Z_i, every qubit in |0>
+        self.x = np.zeros((2 * n, n), dtype=np.uint8)
+        self.z = np.zeros((2 * n, n), dtype=np.uint8)
+        self.x[np.arange(n), np.arange(n)] = 1
+        self.z[n + np.arange(n), np.arange(n)] = 1
+        self.r = np.zeros(2 * n, dtype=object)
+        self.variables = 0
+
+    def _h(self, a: int) -> None:
+        self.r[(self.x[:, a] & self.z[:, a]).astype(bool)] ^= 1
+        self.x[:, a], self.z[:, a] = self.z[:, a], self.x[:, a].copy()
+
+    def _s(self, a: int, turns: int = 1) -> None:
+        for _ in range(turns % 4):
+            self.r[(self.x[:, a] & self.z[:, a]).astype(bool)] ^= 1
+            self.z[:, a] ^= self.x[:, a]
+
+    def _cz(self, a: int, b: int) -> None:
+        # H(b) CNOT(a, b) H(b)
+        self._h(b)
+        x, z = self.x, self.z
+        self.r[(x[:, a] & z[:, b] & (x[:, b] ^ z[:, a] ^ 1)).astype(bool)] ^= 1
+        x[:, b] ^= x[:, a]
+        z[:, a] ^= z[:, b]
+        self._h(b)
+
+    def _pauli(self, a: int, base: str, form: int) -> None:
+        """
+        Apply a Pauli on a qubit conditioned on an affine form, flipping the signs it anticommutes with.
+        """
+        if not np.any(form):
+            return
+        if base == 'x':
+            rows = self.z[:, a]
+        elif base == 'y':
+            rows = self.x[:, a] ^ self.z[:, a]
+        else:
+            rows = self.x[:, a]
+        self.r[rows.astype(bool)] ^= form
+
+    def _measure_z(self, a: int) -> int:
+        """
+        Measure a qubit in Z base.
+        :return: the affine form of the outcome
+        """
+        n = self.reg_size
+        x, z = self.x, self.z
+        stabilizers = np.flatnonzero(x[n:, a]) + n
+        if len(stabilizers):
+            p = int(stabilizers[0])
+            rows = np.flatnonzero(x[:, a])
+            rows = rows[rows != p]
+            bits = _phase_bits(x[p], z[p], x[rows], z[rows])
+            self.r[rows] ^= self.r[p]
+            self.r[rows[bits]] ^= 1
+            x[rows] ^= x[p]
+            z[rows] ^= z[p]
+            x[p - n], z[p - n], self.r[p - n] = x[p], z[p], self.r[p]
+            x[p], z[p] = 0, 0
+            z[p, a] = 1
+            self.variables += 1
+            self.r[p] = 1 << self.variables
+            return self.r[p]
+        # Deterministic outcome, the sign of the product of the stabilizers paired with the destabilizers
+        x_row, z_row, form = np.zeros(n, dtype=np.uint8), np.zeros(n, dtype=np.uint8), 0
+        for i in np.flatnonzero(x[:n, a]):
+            form ^= self.r[i + n] ^ int(_phase_bits(x[i + n], z[i + n], x_row, z_row))
+            x_row ^= x[i + n]
+            z_row ^= z[i + n]
+        return form
+
+    def _rz(self, a: int, node, direction: int = 1) -> None:
+        """
+        Rotate a qubit about Z by the angle of a node, in quarter turns or as a sum of stabilizer terms.
+        """
+        if self.turns[node] is not None:
+            self._s(a, direction * self.turns[node])
+        else:
+            self._expand_z(a, direction * self.angles[node])
+
+    def _rotate(self, a: int, node) -> None:
+        """
+        Rotate the measurement base of a node onto Z, mirroring GraphState.compile.
+        """
+        if self.planes[node] == "xy":
+            # H Rz(-angle)
+            self._rz(a, node, -1)
+            self._h(a)
+        elif self.planes[node] == "zy":
+            # Rx(angle) = H Rz(angle) H
+            self._h(a)
+            self._rz(a, node)
+            self._h(a)
+        else:
+            # H Ry(angle), Ry(angle) = S Rx(angle) S^-1
+            self._s(a, 3)
+            self._h(a)
+            self._rz(a, node)
+            self._h(a)
+            self._s(a)
+            self._h(a)
+
+    # Sum over stabilizer terms
+    def _decompose(self, x: np.ndarray, z: np.ndarray) -> (np.ndarray, np.ndarray, int):
+        """
+        Decompose the Pauli X^x Z^z into rows of the tableau: the destabilizers paired with the stabilizers it
+        anticommutes with, then the stabilizers paired with the destabilizers it anticommutes with.
+        :return: the destabilizer rows, the stabilizer rows and e such that the Pauli is i^e times their
+        product, signs of the rows aside
+        """
+        n = self.reg_size
+        anticommute = (self.x.astype(np.int64) @ z + self.z.astype(np.int64) @ x) % 2
+        destabilizers = np.flatnonzero(anticommute[n:])
+        stabilizers = np.flatnonzero(anticommute[:n]) + n
+        rows = np.concatenate([destabilizers, stabilizers])
+        # A row is i^(x.z) X^x Z^z, and X^x1 Z^z1 X^x2 Z^z2 = (-1)^(z1.x2) X^(x1 + x2) Z^(z1 + z2)
+        xs, zs = self.x[rows].astype(np.int64), self.z[rows].astype(np.int64)
+        before = np.bitwise_xor.accumulate(zs, axis=0) ^ zs
+        e = int((xs & zs).sum() + 2 * (before & xs).sum())
+        return destabilizers, stabilizers, -e % 4
+
+    def _phase(self, rows: np.ndarray, e: int) -> np.ndarray:
+        """
+        Get the phase i^e of a product of signed rows in each branch.
+        """
+        signs = self.r[rows].sum(axis=0) % 2 if len(rows) else np.zeros(self.r.shape[1], dtype=np.int64)
+        return 1j ** e * (1 - 2 * signs.astype(np.int64))
+
+    def _expand_z(self, a: int, angle: float) -> None:
+        """
+        Rotate a qubit about Z by a non-Clifford angle, Rz(angle) = cos(angle / 2) I - i sin(angle / 2) Z.
+        """
+        z = np.zeros(self.reg_size, dtype=np.int64)
+        z[a] = 1
+        destabilizers, stabilizers, e = self._decompose(np.zeros_like(z), z)
+        flip = sum(1 << int(i) for i in destabilizers)
+        signs = sum(1 << int(i) for i in stabilizers - self.reg_size)
+        omega = self._phase(np.concatenate([destabilizers, stabilizers]), e)
+        # Z D^a|psi> = omega (-1)^(signs.a) D^(a + flip)|psi>
+        coordinates = self.coordinates + [c ^ flip for c in self.coordinates if c ^ flip not in self._index]
+        index = {c: i for i, c in enumerate(coordinates)}
+        amplitudes = np.zeros((len(self.amplitudes), len(coordinates)), dtype=complex)
+        amplitudes[:, :len(self.coordinates)] = np.cos(angle / 2) * self.amplitudes
+        parity = np.array([1 - 2 * ((c & signs).bit_count() & 1) for c in self.coordinates])
+        target = [index[c ^ flip] for c in self.coordinates]
+        amplitudes[:, target] += -1j * np.sin(angle / 2) * omega[:, None] * parity * self.amplitudes
+        self._set_terms(coordinates, amplitudes)
+
+    def _set_terms(self, coordinates: List[int], amplitudes: np.ndarray) -> None:
+        # Drop the terms no branch holds any more
+        kept = np.flatnonzero(np.abs(amplitudes).max(axis=0, initial=0) > 1e-12)
+        self.coordinates = [coordinates[i] for i in kept]
+        self._index = {c: i for i, c in enumerate(self.coordinates)}
+        self.amplitudes = amplitudes[:, kept]
+
+    def _measure_terms(self, a: int, counts: np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Measure a qubit in Z base in every branch, splitting each branch by outcome.
+        :param counts: number of shots of each branch.
+        :return: the branch each new branch comes from, its outcome and its number of shots
+        """
+        n = self.reg_size
+        x, z, r = self.x, self.z, self.r
+        coordinates, amplitudes = self.coordinates, self.amplitudes
+        stabilizers = np.flatnonzero(x[n:, a]) + n
+        if not len(stabilizers):
+            # Every term is an eigenstate of Z
+            _, rows, e = self._decompose(np.zeros(n, dtype=np.int64), np.eye(1, n, a, dtype=np.int64)[0])
+            signs = sum(1 << int(i) for i in rows - n)
+            parity = np.array([1 - 2 * ((c & signs).bit_count() & 1) for c in coordinates])
+            eigenvalues = self._phase(rows, e).real[:, None] * parity
+            zero = np.where(eigenvalues > 0, amplitudes, 0)
+            one = amplitudes - zero
+            p = None
+        else:
+            p = int(stabilizers[0])
+            d = p - n
+            # The terms with destabilizer d become O = D_d S_p^x[d, a] on the measured tableau
+            x_o, z_o, s_o = x[d].astype(np.int64), z[d].astype(np.int64), r[d].astype(np.int64)
+            e_o = int((x_o & z_o).sum())
+            if x[d, a]:
+                e_o += int((x[p] & z[p]).sum()) + 2 * int((z_o & x[p]).sum())
+                x_o, z_o, s_o = x_o ^ x[p], z_o ^ z[p], s_o ^ r[p]
+            # Destabilizers moved by S_p anticommute with D_d
+            moved = sum(1 << i for i in range(n) if i != d and x[i, a])
+            # Measure on the tableau, the stabilizer p becoming +Z
+            rows = np.flatnonzero(x[:, a])
+            rows = rows[rows != p]
+            bits = _phase_bits(x[p], z[p], x[rows], z[rows])
+            r[rows] ^= r[p]
+            r[rows[bits]] ^= 1
+            x[rows] ^= x[p]
+            z[rows] ^= z[p]
+            x[d], z[d], r[d] = x[p], z[p], r[p]
+            x[p], z[p], r[p] = 0, 0, 0
+            z[p, a] = 1
+            destabilizers, stabilizers, e = self._decompose(x_o, z_o)
+            flip = sum(1 << int(i) for i in destabilizers)
+            omega = self._phase(np.concatenate([destabilizers, stabilizers]), e + e_o) * (1 - 2 * s_o)
+            # Projecting onto outcome m leaves (U + (-1)^m V) / sqrt(2), U from the terms without d
+            images = [c if not c >> d & 1 else c ^ (1 << d) ^ flip for c in coordinates]
+            coordinates = list(dict.fromkeys(images))
+            index = {c: i for i, c in enumerate(coordinates)}
+            u = np.zeros((len(amplitudes), len(coordinates)), dtype=complex)
+            v = np.zeros_like(u)
+            own = [j for j, c in enumerate(self.coordinates) if not c >> d & 1]
+            u[:, [index[images[j]] for j in own]] = amplitudes[:, own]
+            other = [j for j, c in enumerate(self.coordinates) if c >> d & 1]
+            parity = np.array([1 - 2 * ((self.coordinates[j] & moved).bit_count() & 1) for j in other])
+            v[:, [index[images[j]] for j in other]] = omega[:, None] * parity * amplitudes[:, other]
+            zero, one = (u + v) / np.sqrt(2), (u - v) / np.sqrt(2)
+        norm0, norm1 = np.sum(np.abs(zero) ** 2, axis=1), np.sum(np.abs(one) ** 2, axis=1)
+        p1 = np.clip(norm1 / (norm0 + norm1), 0, 1)
+        n1 = self.rng.binomial(counts, p1)
+        n0 = counts - n1
+        index = np.concatenate([np.flatnonzero(n0), np.flatnonzero(n1)])
+        outcome = np.concatenate([np.zeros(np.count_nonzero(n0), dtype=np.uint8),
+                                  np.ones(np.count_nonzero(n1), dtype=np.uint8)])
+        self.r = self.r[:, index]
+        if p is not None:
+            # Outcome 1 leaves the stabilizer -Z
+            self.r[p, np.count_nonzero(n0):] = 1
+        self._set_terms(coordinates, np.concatenate([zero[n0 > 0] / np.sqrt(norm0[n0 > 0])[:, None],
+                                                     one[n1 > 0] / np.sqrt(norm1[n1 > 0])[:, None]]))
+        return index, outcome, np.concatenate([n0[n0 > 0], n1[n1 > 0]])
+
+    def _chunk(self) -> int:
+        if not self.sum_over_terms:
+            return super()._chunk()
+        return max(1, self.max_amplitudes // ((1 << self.non_clifford) + self.reg_size))
+
+    def _branches(self, shots: int) -> (np.ndarray, np.ndarray):
+        """
+        Simulate a number of shots together as a sum of stabilizer terms, see RegisterSimulator._branches.
+        """
+        if not self.sum_over_terms:
+            return super()._branches(shots)
+        self._init_tableau()
+        self.r = np.zeros((2 * self.reg_size, 1), dtype=np.uint8)
+        self._set_terms([0], np.ones((1, 1), dtype=complex))
+        counts = np.array([shots], dtype=np.int64)
+        bits = np.zeros((1, len(self.columns)), dtype=np.uint8)
+        free_qubit = list(range(self.reg_size))
+        qreg_map, measured = dict(), set()
+        for node in self.sequence:
+            neighbours = [next_node for next_node in self.geometry.neighbors(node) if next_node not in measured]
+            for next_node in [node, *neighbours]:
+                if next_node not in qreg_map:
+                    qreg_map[next_node] = free_qubit.pop()
+                    self._h(qreg_map[next_node])
+            a = qreg_map[node]
+            for next_node in neighbours:
+                self._cz(a, qreg_map[next_node])
+            if node in self.sources:
+                flip = np.bitwise_xor.reduce(bits[:, [self.columns[source] for source in self.sources[node]]],
+                                             axis=1)
+                self._pauli(a, self.graph_state.dependency.correction_base(node), flip)
+            self._rotate(a, node)
+            index, outcome, counts = self._measure_terms(a, counts)
+            bits = bits[index]
+            if node in self.columns:
+                bits[:, self.columns[node]] = outcome
+            self._pauli(a, 'x', outcome)
+            free_qubit.append(qreg_map.pop(node))
+            measured.add(node)
+        return bits, counts
+
+    def forms(self) -> Dict[any, int]:
+        """
+        Run the measurement sequence on the tableau.
+        :return: the affine form of the outcome of each kept node
+        """
+        if self._forms is not None:
+            return self._forms
+        if not self.clifford:
+            raise ValueError("The graph state has non-Clifford measurements")
+        self._init_tableau()
+        free_qubit = list(range(self.reg_size))
+        qreg_map, outcomes, measured = dict(), dict(), set()
+        for node in self.sequence:
+            neighbours = [next_node for next_node in self.geometry.neighbors(node) if next_node not in measured]
+            # Allocate the node and its neighbours in |+>
+            for next_node in [node, *neighbours]:
+                if next_node not in qreg_map:
+                    qreg_map[next_node] = free_qubit.pop()
+                    self._h(qreg_map[next_node])
+            a = qreg_map[node]
+            for next_node in neighbours:
+                self._cz(a, qreg_map[next_node])
+            # Process correction on the parity of the source outcomes
+            if node in self.sources:
+                parity = 0
+                for source in self.sources[node]:
+                    parity ^= outcomes[source]
+                self._pauli(a, self.graph_state.dependency.correction_base(node), parity)
+            self._rotate(a, node)
+            outcome = self._measure_z(a)
+            if node in self.columns:
+                outcomes[node] = outcome
+            # Reset to |0> before the qubit is reused
+            self._pauli(a, 'x', outcome)
+            free_qubit.append(qreg_map.pop(node))
+            measured.add(node)
+        self._forms = outcomes
+        return outcomes
+
+    def affine(self, nodes: List[any]) -> (int, List[int]):
+        """
+        Get the affine subspace the outcomes of some nodes are uniformly distributed over.
+        :param nodes: nodes of the sample, node i is bit i of the words.
+        :return: the offset word and a basis of words
+        """
+        forms = self.forms()
+        offset, directions = 0, dict()
+        for i, node in enumerate(nodes):
+            form = forms[node]
+            offset |= (form & 1) << i
+            form >>= 1
+            v = 0
+            while form:
+                if form & 1:
+                    directions[v] = directions.get(v, 0) | (1 << i)
+                form >>= 1
+                v += 1
+        # Gaussian elimination over GF(2), keyed by leading bit
+        basis: Dict[int, int] = dict()
+        for word in directions.values():
+            while word:
+                lead = word.bit_length() - 1
+                if lead not in basis:
+                    basis[lead] = word
+                    break
+                word ^= basis[lead]
+        return offset, list(basis.values())
+
+    def _sample(self, nodes: List[any], shots: int) -> np.ndarray:
+        """
+        Sample the outcomes of some nodes.
+        :return: (shots, nodes) array of outcome bits
+        """
+        offset, basis = self.affine(nodes)
+        offset_bits = np.array([(offset >> i) & 1 for i in range(len(nodes))], dtype=np.float32)
+        basis_bits = np.array([[(word >> i) & 1 for i in range(len(nodes))] for word in basis],
+                              dtype=np.float32).reshape(len(basis), len(nodes))
+        chunk = max(1, self.max_amplitudes // max(1, len(nodes), len(basis)))
+        outcomes = []
+        for start in range(0, shots, chunk):
+            coefficients = self.rng.integers(0, 2, size=(min(chunk, shots - start), len(basis))).astype(np.float32)
+            # Exact in float32 as long as there are fewer than 2^24 basis words
+            outcomes.append(np.mod(coefficients @ basis_bits + offset_bits, 2).astype(np.uint8))
+        if not outcomes:
+            return np.zeros((0, len(nodes)), dtype=np.uint8)
+        return np.concatenate(outcomes)
+
+    def sample(self, shots: int) -> np.ndarray:
+        if not self.clifford:
+            return super().sample(shots)
+        return self._sample(list(self.columns), shots)
+
+    @staticmethod
+    def _tables(basis: List[int]) -> List[np.ndarray]:
+        """
+        Tabulate the XOR of every subset of each byte of the basis words.
+        """
+        tables = []
+        for k in range(0, len(basis), 8):
+            words = basis[k:k + 8]
+            table = np.zeros(1 << len(words), dtype=np.int64)
+            for i in range(1, len(table)):
+                low = (i & -i).bit_length() - 1
+                table[i] = table[i & (i - 1)] ^ words[low]
+            tables.append(table)
+        return tables
+
+    def run(self, shots: int) -> Dict[str, int]:
+        if not self.clifford:
+            return super().run(shots)
+        width = len(self.outputs)
+        counter = OutcomeCounter(list(range(width)))
+        if width >= 63:
+            chunk = max(1, self.max_amplitudes // width)
+            for start in range(0, shots, chunk):
+                counter.add(self._sample(self.outputs, min(chunk, shots - start)))
+            return counter.counts()
+        # A random word of basis coefficients per shot, mapped through the tables a byte at a time
+        offset, basis = self.affine(self.outputs)
+        tables = self._tables(basis)
+        for start in range(0, shots, self.max_amplitudes):
+            coefficients = self.rng.integers(0, 1 << len(basis), size=min(self.max_amplitudes, shots - start),
+                                             dtype=np.int64)
+            words = np.full(len(coefficients), offset, dtype=np.int64)
+            for k, table in enumerate(tables):
+                words ^= table[(coefficients >> (8 * k)) & (len(table) - 1)]
+            counter.add(words)
+        return counter.counts()
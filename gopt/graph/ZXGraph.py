@@ -69,11 +69,11 @@ class ZXGraph:
         self.geometry.cutoff(node)
         self.geometry.cutoff(node_u)
         for exclusive_neighbour in exclusive_neighbours:
-            self.geometry.G.add_edge(exclusive_neighbour, node_v)
+            self.geometry.add_edge(exclusive_neighbour, node_v)
         for common_neighbour in common_neighbours:
-            self.geometry.G.remove_edge(common_neighbour, node_v)
+            self.geometry.remove_edge(common_neighbour, node_v)
         if self.geometry.G.has_edge(node_v, node_v):
-            self.geometry.G.remove_edge(node_v, node_v)
+            self.geometry.remove_edge(node_v, node_v)
         # Angle transformations
         self._add_radius(node_v, self.angle_map.pop(node_u))
         self.angle_map.pop(node)
@@ -0,0 +1,147 @@
+import random
+import time
+from collections import deque
+from math import exp, sqrt
+from typing import Dict, List, Tuple
+
+from ..graph import GraphState
+from ..graph.IncrementalScheduler import IncrementalScheduler
+from .Objective import Objective
+
+
+class AnnealingOptimizer:
+    """
+    Simulated annealing over local complementations with a tabu list and restarts.
+    Each step proposes the LC about a random node. The edge count and degree metrics of the proposal are
+    derived from the neighbourhood of the node alone through GeometryLayer.lc_delta, the register size
+    has no such delta and is obtained by applying the LC and rescheduling.
+    Worse proposals are accepted with probability exp(-delta / temperature), recently complemented nodes
+    are tabu unless the proposal beats the best graph, and each restart resumes from the best graph found.
+    """
+
+    def __init__(self,
+                 graph_state: GraphState,
+                 objective='edge_size',
+                 steps: int = 10000,
+                 temperature: float = 1.0,
+                 cooling=0.999,
+                 tabu_size: int = 8,
+                 restarts: int = 0,
+                 time_limit: float = None,
+                 seed: int = None):
+        self.graph_state = graph_state
+        self.current_geometry = graph_state.geometry
+        self.scheduler = IncrementalScheduler(graph_state)
+        self.objective: Objective = Objective.resolve(objective)
+
+        self.steps = steps  # steps per restart
+        self.temperature = temperature  # initial temperature of each restart
+        self.cooling = cooling  # geometric cooling factor, or a function of the step giving the temperature
+        self.tabu_size = tabu_size
+        self.restarts = restarts
+        self.time_limit = time_limit  # seconds
+        self.random = random.Random(seed)
+
+        self.nodes: List[any] = self.current_geometry.nodes()
+
+        self.sequence: List[any] = []  # LC sequence leading to the current graph
+        self.metrics: Dict[str, float] = dict()
+        self.best_sequence: List[any] = []
+        self.best_metrics: Dict[str, float] = dict()
+        self.min_objective = None
+        self.track: List[Tuple[int, float]] = []  # (step, objective) at each improvement
+        self.step = 0
+
+    def _proposal_metrics(self, node: any) -> Dict[str, float]:
+        edge_delta, degree_delta, max_degree = self.current_geometry.lc_delta(node)
+        metrics = dict()
+        needed = self.objective.metrics
+        if "edge_size" in needed:
+            metrics["edge_size"] = self.current_geometry.edge_size() + edge_delta
+        if "degree_norm" in needed:
+            square_norm = self.current_geometry.degree_square_sum()
+            for u, delta in degree_delta.items():
+                square_norm += delta * (2 * self.current_geometry.degree(u) + delta)
+            metrics["degree_norm"] = sqrt(square_norm)
+        if "max_degree" in needed:
+            metrics["max_degree"] = max_degree
+        if "reg_size" in needed:
+            checkpoint = self.scheduler.checkpoint()
+            self.scheduler.local_complement(node)
+            metrics["reg_size"] = self.scheduler.schedule()[1]
+            self.scheduler.rollback(checkpoint)
+        return metrics
+
+    def _current_metrics(self) -> Dict[str, float]:
+        metrics = dict()
+        for metric in self.objective.metrics:
+            if metric == "reg_size":
+                metrics[metric] = self.scheduler.schedule()[1]
+            else:
+                metrics[metric] = getattr(self.current_geometry, metric)()
+        return metrics
+
+    def _apply(self, node: any) -> None:
+        self.scheduler.local_complement(node)
+        # The scheduler only complements the geometry, where the same node twice in a row is the identity
+        if self.sequence and self.sequence[-1] == node:
+            self.sequence.pop()
+        else:
+            self.sequence.append(node)
+
+    def _move_to(self, sequence: List[any]) -> None:
+        for node in reversed(self.sequence):
+            self.scheduler.local_complement(node)
+        for node in sequence:
+            self.scheduler.local_complement(node)
+        self.sequence = list(sequence)
+        self.metrics = self._current_metrics()
+
+    def _temperature(self, step: int) -> float:
+        if callable(self.cooling):
+            return self.cooling(step)
+        return self.temperature * self.cooling ** step
+
+    # Search
+    def execute(self):
+        start_time = time.time()
+        self.metrics = self._current_metrics()
+        self.best_metrics = dict(self.metrics)
+        self.min_objective = self.objective(self.metrics)
+
+        for _ in range(self.restarts + 1):
+            self._move_to(self.best_sequence)
+            tabu = deque(maxlen=self.tabu_size)
+            current = self.objective(self.metrics)
+            for step in range(self.steps):
+                if self.time_limit is not None and time.time() - start_time > self.time_limit:
+                    break
+                self.step += 1
+                node = self.random.choice(self.nodes)
+                if self.current_geometry.degree(node) < 2:
+                    continue
+
+                metrics = self._proposal_metrics(node)
+                value = self.objective(metrics)
+                if node in tabu and value >= self.min_objective:
+                    continue
+                delta = value - current
+                temperature = self._temperature(step)
+                if delta > 0 and (temperature <= 0 or self.random.random() >= exp(-delta / temperature)):
+                    continue
+
+                self._apply(node)
+                self.metrics = metrics
+                current = value
+                tabu.append(node)
+                if value < self.min_objective:
+                    self.min_objective = value
+                    self.best_metrics = dict(metrics)
+                    self.best_sequence = list(self.sequence)
+                    self.track.append((self.step, value))
+
+        # Leave the graph state as it was, the optimum is replayed from optimized_lc_sequence
+        self._move_to([])
+
+    def optimized_lc_sequence(self) -> List[any]:
+        return list(self.best_sequence)
@@ -0,0 +1,104 @@
+import sys
+from typing import Dict, List, Tuple
+
+import networkx as nx
+
+from ..graph.GraphSnapshot import GraphSnapshot
+
+
+class IsomorphismIndex:
+    """
+    Visited-state register of the LC search optimizers.
+    Graphs are bucketed by a Weisfeiler-Lehman colour refinement certificate so that the exact
+    isomorphism test only runs against the few registered graphs sharing the same certificate.
+    Registered graphs are kept as compact snapshots over the label order of the first graph added;
+    the very same labelled graph is looked up by snapshot in constant time.
+    """
+
+    def __init__(self, iterations: int = 3):
+        self.iterations = iterations
+        self.buckets: Dict[int, List[Tuple[any, GraphSnapshot]]] = dict()
+        self.exact: Dict[GraphSnapshot, any] = dict()
+        self.labels: Tuple[any, ...] = None
+        self.label2idx: Dict[any, int] = None
+        self.size = 0
+
+    def snapshot(self, G: nx.Graph) -> GraphSnapshot:
+        """
+        Snapshot a graph over the shared label order if it has the same nodes.
+        """
+        if self.labels is None:
+            self.labels = tuple(G.nodes())
+            self.label2idx = {label: i for i, label in enumerate(self.labels)}
+        elif len(G) != len(self.labels) or any(node not in self.label2idx for node in G):
+            return GraphSnapshot.from_graph(G)
+        return GraphSnapshot.from_graph(G, self.labels, self.label2idx)
+
+    def certificate(self, G: nx.Graph) -> int:
+        """
+        Compute the isomorphism-invariant certificate of a graph.
+        Nodes start coloured by their degree and are recoloured by the multiset of their neighbours' colours.
+        :param G: graph to hash.
+        :return: hash of the refined colour histogram
+        """
+        colours = {node: degree for node, degree in G.degree()}
+        for _ in range(self.iterations):
+            colours = {node: hash((colours[node], tuple(sorted(colours[n] for n in G.neighbors(node)))))
+                       for node in colours}
+        return hash((G.number_of_nodes(), G.number_of_edges(), tuple(sorted(colours.values()))))
+
+    def find(self, G: nx.Graph, certificate: int = None, snapshot: GraphSnapshot = None) -> any:
+        """
+        Search for a registered graph isomorphic to the given one.
+        :param G: graph to look up.
+        :param certificate: precomputed certificate of G, if any.
+        :param snapshot: precomputed snapshot of G, if any.
+        :return: key of the isomorphic graph or None if there is none
+        """
+        # Revisited states are usually the very same labelled graph, which is cheaper to check first
+        if snapshot is None:
+            snapshot = self.snapshot(G)
+        if snapshot in self.exact:
+            return self.exact[snapshot]
+        if certificate is None:
+            certificate = self.certificate(G)
+        for key, H in self.buckets.get(certificate, []):
+            if nx.is_isomorphic(G, H.graph()):
+                return key
+        return None
+
+    def add(self, key: any, G: nx.Graph, certificate: int = None, snapshot: GraphSnapshot = None) -> None:
+        """
+        Register a graph under the given key.
+        :param key: key returned by find for graphs isomorphic to G.
+        :param G: graph to register, copied into a snapshot.
+        :param certificate: precomputed certificate of G, if any.
+        :param snapshot: precomputed snapshot of G, if any.
+        """
+        if certificate is None:
+            certificate = self.certificate(G)
+        if snapshot is None:
+            snapshot = self.snapshot(G)
+        if certificate not in self.buckets:
+            self.buckets[certificate] = []
+        self.buckets[certificate].append((key, snapshot))
+        self.exact[snapshot] = key
+        self.size += 1
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the registered graphs and the index structures.
+        """
+        retval = sys.getsizeof(self.buckets) + sys.getsizeof(self.exact)
+        for bucket in self.buckets.values():
+            retval += sys.getsizeof(bucket) + sum(sys.getsizeof(entry) + entry[1].nbytes for entry in bucket)
+        if self.labels is not None:
+            retval += sys.getsizeof(self.labels) + sys.getsizeof(self.label2idx)
+        return retval
+
+    def __contains__(self, G: nx.Graph) -> bool:
+        return self.find(G) is not None
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,360 @@
+import json
+import sys
+from math import sqrt
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..graph import GraphState
+from ..graph.IncrementalScheduler import IncrementalScheduler
+from ..graph.RegisterSizeBound import RegisterSizeBound
+from .IsomorphismIndex import IsomorphismIndex
+from .Objective import METRICS, Objective
+from .ParallelEvaluator import ParallelEvaluator
+from .SearchStrategy import DepthFirst
+
+
+class LCSearch:
+    """
+    Search over the local complementation orbit of a graph state.
+    Every graph evaluated is numbered in evaluation order, the root being 0, and remembered by its parent
+    and the node complemented about, so any graph is reached again by replaying its LC sequence.
+    Expanding a graph evaluates the LC about each candidate node, in the order of the nodes of the graph
+    state so that serial and parallel runs agree; candidates improving the split metric
+    are visited first ordered by the objective, followed by those worsening it, while those leaving it
+    unchanged are skipped. Without a split metric all candidates are ordered by the objective.
+    Graphs isomorphic to a visited one are not expanded again. The strategy decides which graph to
+    expand next, and the search stops once max_depth graphs have been evaluated.
+    With a prefilter, a candidate whose register size lower bound exceeds the smallest register size
+    found is not scheduled; the bound is recorded under reg_size_bound instead of reg_size, and when the
+    objective reads the register size the candidate is ranked after all others, by its bound.
+    With several processes the candidates are evaluated by a ParallelEvaluator whose pool only lives
+    for the duration of execute.
+    """
+
+    def __init__(self,
+                 graph_state: GraphState,
+                 objective='edge_size',
+                 strategy=None,
+                 max_depth: int = 100,
+                 traverse_all: bool = False,
+                 split: str = 'edge_size',
+                 rev: bool = False,
+                 metrics=METRICS,
+                 processes: int = 1,
+                 prefilter=None):
+        self.graph_state = graph_state
+        self.current_geometry = graph_state.geometry
+        self.scheduler = IncrementalScheduler(graph_state)
+
+        self.objective: Objective = Objective.resolve(objective)
+        self.strategy = strategy if strategy is not None else DepthFirst()
+        self.split = split
+        self.metrics = tuple(metric for metric in METRICS
+                             if metric in metrics or metric in self.objective.metrics or metric == split)
+
+        self.max_depth = max_depth
+        self.depth = 0  # number of graphs evaluated
+        self.traverse_all = traverse_all
+        self.rev = rev
+
+        self.lc_map: Dict[int, Tuple[int, any]] = dict()  # graph -> (parent graph, LC node)
+        self.path: List[int] = []  # graphs from the root to the current one
+        self.current = 0
+
+        self.track: Dict[int, Dict[str, float]] = dict()
+        self.min_values: Dict[str, float] = dict()
+        self.min_indices: Dict[str, int] = dict()
+        self.min_objective = np.inf
+        self.optimized_idx = 0
+
+        self.graph_reg = IsomorphismIndex()
+        self.isomorphism_reg: Dict[int, List[int]] = dict()  # visited graph -> isomorphic graphs met later
+
+        self.node_order: Dict[any, int] = {node: i for i, node in enumerate(self.current_geometry.nodes())}
+        self.processes = processes
+        self.evaluator: ParallelEvaluator = None
+        self.prefilter = RegisterSizeBound(prefilter) if isinstance(prefilter, str) else prefilter
+        self.pruned = 0  # candidates not scheduled thanks to the prefilter
+
+        root = self.measure()
+        for metric, value in root.items():
+            self.min_values[metric] = value
+            self.min_indices[metric] = 0
+        self.min_objective = self.objective(root)
+
+    # Metrics
+    def measure_metric(self, metric: str) -> float:
+        """
+        Measure a metric on the current graph.
+        """
+        if metric == "reg_size":
+            return self.scheduler.schedule()[1]
+        elif metric == "max_degree":
+            return self.current_geometry.max_degree()
+        elif metric == "degree_norm":
+            return self.current_geometry.degree_norm()
+        elif metric == "edge_size":
+            return self.current_geometry.edge_size()
+        raise ValueError(f"Unknown metric {metric}")
+
+    def measure(self) -> Dict[str, float]:
+        return {metric: self.measure_metric(metric) for metric in self.metrics}
+
+    def measure_candidate(self, node: any) -> Dict[str, float]:
+        """
+        Measure the graph obtained by local complementing the current graph about a node.
+        Edge and degree metrics are derived from the neighbourhood of the node without applying the LC,
+        only the register size requires applying it and rescheduling.
+        :param node: candidate node.
+        :return: metrics of the candidate
+        """
+        edge_delta, degree_delta, max_degree = self.current_geometry.lc_delta(node)
+        retval = dict()
+        for metric in self.metrics:
+            if metric == "reg_size":
+                checkpoint = self.scheduler.checkpoint()
+                self.scheduler.local_complement(node)
+                bound = self.prefilter(self.current_geometry) if self.prefilter is not None else 0
+                if bound > self.min_values[metric]:
+                    retval["reg_size_bound"] = bound
+                    self.pruned += 1
+                else:
+                    retval[metric] = self.scheduler.schedule()[1]
+                self.scheduler.rollback(checkpoint)
+            elif metric == "max_degree":
+                retval[metric] = max_degree
+            elif metric == "degree_norm":
+                square_norm = self.current_geometry.degree_square_sum()
+                for u, delta in degree_delta.items():
+                    square_norm += delta * (2 * self.current_geometry.degree(u) + delta)
+                retval[metric] = sqrt(square_norm)
+            elif metric == "edge_size":
+                retval[metric] = self.current_geometry.edge_size() + edge_delta
+        return retval
+
+    def evaluate_candidates(self, nodes: List[any]) -> List[Dict[str, float]]:
+        """
+        Measure the graphs obtained by local complementing the current graph about each node.
+        :param nodes: candidate nodes.
+        :return: metrics of each candidate, in order
+        """
+        if self.evaluator is None or "reg_size" not in self.metrics:
+            return [self.measure_candidate(node) for node in nodes]
+
+        evaluations = self.evaluator.evaluate(self.current_geometry, nodes, self.min_values["reg_size"])
+        retval = []
+        for evaluation in evaluations:
+            metrics = {metric: evaluation[METRICS.index(metric)] for metric in self.metrics}
+            if evaluation[-1]:
+                metrics["reg_size_bound"] = metrics.pop("reg_size")
+                self.pruned += 1
+            retval.append(metrics)
+        return retval
+
+    def rank(self, metrics: Dict[str, float], objective: Objective = None) -> Tuple[bool, float]:
+        """
+        Get the key ordering an evaluated graph among others, smaller is better.
+        :param metrics: metrics of the graph.
+        :param objective: objective to rank by, the objective of the search if None.
+        :return: whether the objective is unknown as the graph was pruned, and the objective or else the bound
+        """
+        objective = objective if objective is not None else self.objective
+        if "reg_size" in objective.metrics and "reg_size" not in metrics:
+            return True, metrics["reg_size_bound"]
+        return False, objective(metrics)
+
+    def register(self, node: any, metrics: Dict[str, float]) -> int:
+        """
+        Number an evaluated graph as a child of the current graph and record its metrics.
+        :param node: node the current graph is complemented about.
+        :param metrics: metrics of the graph.
+        :return: number of the graph
+        """
+        self.depth += 1
+        self.lc_map[self.depth] = (self.current, node)
+        self.track[self.depth] = {"depth": self.depth, **metrics}
+        for metric, value in metrics.items():
+            if metric in self.min_values and value < self.min_values[metric]:
+                self.min_values[metric] = value
+                self.min_indices[metric] = self.depth
+        pruned, value = self.rank(metrics)
+        if not pruned and value < self.min_objective:
+            self.min_objective = value
+            self.optimized_idx = self.depth
+        return self.depth
+
+    # Traversal
+    def exhausted(self) -> bool:
+        return self.depth >= self.max_depth
+
+    def candidates(self):
+        if self.traverse_all:
+            return self.current_geometry.nodes()
+        max_degree_nodes, _ = self.current_geometry.max_degree_nodes()
+        return self.current_geometry.boundary_nodes(max_degree_nodes).union(max_degree_nodes)
+
+    def expand(self) -> List[int]:
+        """
+        Evaluate the candidates of the current graph.
+        :return: numbers of the children to visit, in order
+        """
+        current = self.measure_metric(self.split) if self.split is not None else None
+        nodes = sorted(self.candidates(), key=self.node_order.__getitem__)
+        less: List[Tuple[Tuple[bool, float], int]] = []
+        more: List[Tuple[Tuple[bool, float], int]] = []
+        for node, metrics in zip(nodes, self.evaluate_candidates(nodes)):
+            idx = self.register(node, metrics)
+            if self.split is None or metrics.get(self.split, np.inf) < current:
+                less.append((self.rank(metrics), idx))
+            elif self.split not in metrics or metrics[self.split] > current:
+                # A split metric pruned away exceeds the smallest register size found
+                more.append((self.rank(metrics), idx))
+
+        less.sort(key=lambda child: child[0])
+        if self.rev:
+            more.sort(key=lambda child: child[0])
+        return [idx for _, idx in less + more]
+
+    def descend(self, idx: int) -> None:
+        """
+        Move from the current graph to one of its children.
+        """
+        self.scheduler.local_complement(self.lc_map[idx][1])
+        self.path.append(idx)
+        self.current = idx
+
+    def ascend(self) -> None:
+        """
+        Move from the current graph back to its parent.
+        """
+        idx = self.path.pop()
+        self.scheduler.local_complement(self.lc_map[idx][1])
+        self.current = self.path[-1] if self.path else 0
+
+    def lineage(self, idx: int) -> List[int]:
+        """
+        Get the graphs from the root to the given one, excluding the root.
+        """
+        retval = []
+        while idx != 0:
+            retval.append(idx)
+            idx = self.lc_map[idx][0]
+        return retval[::-1]
+
+    def move_to(self, idx: int) -> None:
+        """
+        Move to any evaluated graph through their closest common ancestor.
+        """
+        lineage = self.lineage(idx)
+        common = 0
+        while common < min(len(lineage), len(self.path)) and lineage[common] == self.path[common]:
+            common += 1
+        while len(self.path) > common:
+            self.ascend()
+        for child in lineage[common:]:
+            self.descend(child)
+
+    def visit(self) -> bool:
+        """
+        Register the current graph as visited.
+        :return: false if an isomorphic graph has been visited before
+        """
+        G = self.current_geometry.G
+        certificate = self.graph_reg.certificate(G)
+        snapshot = self.graph_reg.snapshot(G)
+        iso = self.graph_reg.find(G, certificate, snapshot)
+        if iso is not None:
+            self.isomorphism_reg[iso].append(self.current)
+            return False
+        self.graph_reg.add(self.current, G, certificate, snapshot)
+        self.isomorphism_reg[self.current] = []
+        return True
+
+    def execute(self):
+        if self.current == 0 and 0 not in self.isomorphism_reg:
+            self.visit()
+        self.evaluator = ParallelEvaluator(self.graph_state, self.processes, prefilter=self.prefilter) \
+            if self.processes != 1 else None
+        try:
+            self.strategy.search(self)
+        finally:
+            if self.evaluator is not None:
+                self.evaluator.close()
+                self.evaluator = None
+        self.move_to(0)
+
+    # Results
+    def optimized_lc_sequence(self, idx: int = None) -> List[any]:
+        """
+        Get the LC sequence leading from the root to a graph.
+        :param idx: number of the graph, the optimum of the objective if None.
+        :return: nodes to local complement about, in order
+        """
+        if idx is None:
+            idx = self.optimized_idx
+        return [self.lc_map[i][1] for i in self.lineage(idx)]
+
+    @property
+    def min_reg_size(self):
+        return self.min_values.get("reg_size", np.inf)
+
+    @property
+    def min_edge_size(self):
+        return self.min_values.get("edge_size", np.inf)
+
+    @property
+    def minimax_degree(self):
+        return self.min_values.get("max_degree", np.inf)
+
+    @property
+    def min_degree_norm(self):
+        return self.min_values.get("degree_norm", np.inf)
+
+    @property
+    def optimized_reg_size_idx(self):
+        return self.min_indices.get("reg_size", 0)
+
+    @property
+    def optimized_edge_size_idx(self):
+        return self.min_indices.get("edge_size", 0)
+
+    @property
+    def optimized_max_degree_idx(self):
+        return self.min_indices.get("max_degree", 0)
+
+    @property
+    def optimized_degree_norm_idx(self):
+        return self.min_indices.get("degree_norm", 0)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Approximate memory held by the search, in bytes.
+        :return: bytes held by the visited graph register, the LC tree and the metric track
+        """
+        retval = {
+            "graph_reg": self.graph_reg.nbytes,
+            "lc_map": sys.getsizeof(self.lc_map) + sum(sys.getsizeof(entry) for entry in self.lc_map.values()),
+            "track": sys.getsizeof(self.track) + sum(sys.getsizeof(entry) for entry in self.track.values()),
+            "isomorphism_reg": sys.getsizeof(self.isomorphism_reg) +
+                               sum(sys.getsizeof(ids) for ids in self.isomorphism_reg.values()),
+        }
+        retval["total"] = sum(retval.values())
+        return retval
+
+    def save_track(self, filename):
+        with open(filename, 'w') as f:
+            track = dict(self.track)
+            track["node_size"] = len(self.current_geometry.nodes())
+            track["min_reg_size"] = self.min_reg_size
+            track["min_edge_size"] = self.min_edge_size
+            track["minimax_degree"] = self.minimax_degree
+            track["min_degree_norm"] = self.min_degree_norm
+
+            track["min_reg_size_idx"] = self.optimized_reg_size_idx
+            track["min_edge_size_idx"] = self.optimized_edge_size_idx
+            track["minimax_degree_idx"] = self.optimized_max_degree_idx
+            track["min_degree_norm_idx"] = self.optimized_degree_norm_idx
+
+            track["isomorphic_track"] = {key: {idx: 0 for idx in ids} for key, ids in self.isomorphism_reg.items()}
+            json.dump(track, f)
@@ -0,0 +1,66 @@
+from typing import Dict
+
+# Metrics measured on every graph evaluated by the LC search
+METRICS = ("reg_size", "max_degree", "degree_norm", "edge_size")
+
+
+class Objective:
+    """
+    Objective of the LC search over the metrics of a graph, smaller is better.
+    """
+    metrics: tuple = ()  # metrics the objective reads
+
+    def __call__(self, metrics: Dict[str, float]) -> float:
+        raise NotImplementedError
+
+    @staticmethod
+    def resolve(objective) -> 'Objective':
+        """
+        Resolve an objective given as a metric name, a dictionary of metric weights or an Objective.
+        :param objective: objective to resolve.
+        :return: the objective
+        """
+        if isinstance(objective, Objective):
+            return objective
+        elif isinstance(objective, str):
+            return MetricObjective(objective)
+        elif isinstance(objective, dict):
+            return WeightedObjective(objective)
+        raise ValueError(f"Unknown objective {objective}")
+
+
+class MetricObjective(Objective):
+    """
+    Minimize a single metric.
+    """
+
+    def __init__(self, metric: str):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric}")
+        self.metric = metric
+        self.metrics = (metric,)
+
+    def __call__(self, metrics: Dict[str, float]) -> float:
+        return metrics[self.metric]
+
+    def __repr__(self):
+        return self.metric
+
+
+class WeightedObjective(Objective):
+    """
+    Minimize a weighted sum of metrics.
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        for metric in weights:
+            if metric not in METRICS:
+                raise ValueError(f"Unknown metric {metric}")
+        self.weights = dict(weights)
+        self.metrics = tuple(weights)
+
+    def __call__(self, metrics: Dict[str, float]) -> float:
+        return sum(weight * metrics[metric] for metric, weight in self.weights.items())
+
+    def __repr__(self):
+        return " + ".join(f"{weight} * {metric}" for metric, weight in self.weights.items())
@@ -0,0 +1,103 @@
+import multiprocessing
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from ..graph.BitGeometryLayer import BitGeometryLayer
+from ..graph.MeasurementSequenceScheduler import MeasurementSequenceScheduler
+
+# Worker state, shipped once when the pool starts
+_labels: List[any] = []
+_dep_map: Dict[any, Set[any]] = dict()
+_prefilter = None
+
+
+def _init_worker(labels: List[any], dep_map: Dict[any, Set[any]], prefilter) -> None:
+    global _labels, _dep_map, _prefilter
+    _labels = labels
+    _dep_map = dep_map
+    _prefilter = prefilter
+
+
+def _evaluate(rows: List[int], indices: List[int], limit: float) -> List[Tuple[int, float, int, int, bool]]:
+    geometry = BitGeometryLayer.from_rows(_labels, rows)
+    scheduler = MeasurementSequenceScheduler(geometry, _dep_map)
+    retval = []
+    for i in indices:
+        geometry.local_complement(_labels[i])
+        bound = _prefilter(geometry) if _prefilter is not None else 0
+        pruned = bound > limit
+        if pruned:
+            reg_size = bound
+        else:
+            scheduler.prepare()
+            _, reg_size = scheduler.schedule()
+        degrees = [row.bit_count() for row in geometry.rows]
+        retval.append((reg_size, max(degrees, default=0), np.linalg.norm(degrees), sum(degrees) // 2, pruned))
+        geometry.local_complement(_labels[i])
+    return retval
+
+
+class ParallelEvaluator:
+    """
+    Process pool evaluating the LC candidates of the DFS optimizers.
+    Labels and dependencies are shipped to the workers once; each batch only ships the adjacency packed
+    into one big-int row per node. Results come back in candidate order so that the optimizers merge
+    them exactly as in a serial run.
+    The pool is released by close, or on leaving a with block.
+    """
+
+    def __init__(self, graph_state, processes: int = None, chunks_per_process: int = 4, prefilter=None):
+        """
+        :param graph_state: graph state whose labels and dependencies the workers keep.
+        :param processes: number of workers, the number of CPUs if None.
+        :param chunks_per_process: number of chunks each batch of candidates is split into per worker.
+        :param prefilter: register size lower bound, a candidate above the limit of its batch is not scheduled.
+        """
+        self.labels: List[any] = graph_state.geometry.nodes()
+        self.label2idx: Dict[any, int] = {label: i for i, label in enumerate(self.labels)}
+        self.processes: int = processes or multiprocessing.cpu_count()
+        self.chunks_per_process = chunks_per_process
+        self.pool = multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                         initargs=(self.labels, graph_state.dependency.dep_map, prefilter))
+
+    def __enter__(self) -> 'ParallelEvaluator':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def pack(self, geometry) -> List[int]:
+        """
+        Pack the adjacency of a geometry layer into bit rows in label order.
+        :param geometry: geometry layer over the labels of the pool.
+        :return: adjacency row of each node
+        """
+        rows = []
+        for label in self.labels:
+            row = 0
+            for node in geometry.neighbours(label):
+                row |= 1 << self.label2idx[node]
+            rows.append(row)
+        return rows
+
+    def evaluate(self, geometry, nodes: List[any],
+                 limit: float = np.inf) -> List[Tuple[int, float, int, int, bool]]:
+        """
+        Evaluate the graphs obtained by local complementing the geometry about each of the given nodes.
+        :param geometry: current geometry layer.
+        :param nodes: candidate nodes.
+        :param limit: register size above which a candidate whose prefilter bound exceeds it is not scheduled.
+        :return: register size, max degree, degree norm, edge size and whether it was pruned, of each
+        candidate in order, the register size of a pruned candidate being its bound
+        """
+        rows = self.pack(geometry)
+        indices = [self.label2idx[node] for node in nodes]
+        chunk_size = max(1, -(-len(indices) // (self.processes * self.chunks_per_process)))
+        chunks = [indices[i:i + chunk_size] for i in range(0, len(indices), chunk_size)]
+        results = self.pool.starmap(_evaluate, [(rows, chunk, limit) for chunk in chunks])
+        return [result for chunk in results for result in chunk]
+
+    def close(self) -> None:
+        self.pool.terminate()
+        self.pool.join()
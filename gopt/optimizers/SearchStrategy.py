@@ -0,0 +1,116 @@
+import heapq
+from collections import deque
+
+from .Objective import Objective
+
+
+class SearchStrategy:
+    """
+    Order in which an LCSearch expands the graphs of the LC orbit.
+    """
+
+    def search(self, search) -> None:
+        raise NotImplementedError
+
+
+class DepthFirst(SearchStrategy):
+    """
+    Expand the first unvisited child of the current graph before its siblings.
+    """
+
+    def search(self, search) -> None:
+        if search.exhausted():
+            return
+        # Explicit stack of child iterators, deep orbits exceed the recursion limit
+        stack = [iter(search.expand())]
+        while stack:
+            idx = next(stack[-1], None)
+            if idx is None:
+                stack.pop()
+                if stack:
+                    search.ascend()
+                    if search.exhausted():
+                        return
+                continue
+            search.descend(idx)
+            if search.visit() and not search.exhausted():
+                stack.append(iter(search.expand()))
+            else:
+                search.ascend()
+                if search.exhausted():
+                    return
+
+
+class BreadthFirst(SearchStrategy):
+    """
+    Expand the graphs level by level, in the order they are visited.
+    """
+
+    def search(self, search) -> None:
+        queue = deque([search.current])
+        while queue and not search.exhausted():
+            search.move_to(queue.popleft())
+            for idx in search.expand():
+                search.descend(idx)
+                if search.visit():
+                    queue.append(idx)
+                search.ascend()
+
+
+class BeamSearch(SearchStrategy):
+    """
+    Expand the graphs level by level, keeping only the width best new graphs of each level.
+    The frontier holds graph numbers only, the graphs themselves are reached by replaying their LC sequence.
+    """
+
+    def __init__(self, width: int = 8, key=None):
+        self.width = width
+        self.key = key  # objective ranking the beam, the objective of the search if None
+        self.peak_frontier = 0
+
+    def search(self, search) -> None:
+        key = Objective.resolve(self.key) if self.key is not None else search.objective
+        beam = [search.current]
+        while beam and not search.exhausted():
+            level = []
+            for parent in beam:
+                search.move_to(parent)
+                for idx in search.expand():
+                    search.descend(idx)
+                    if search.visit():
+                        level.append((search.rank(search.track[idx], key), idx))
+                    search.ascend()
+                if search.exhausted():
+                    break
+            level.sort(key=lambda child: child[0])
+            beam = [idx for _, idx in level[:self.width]]
+            self.peak_frontier = max(self.peak_frontier, len(level))
+
+
+class GreedyBestFirst(SearchStrategy):
+    """
+    Always expand the unexpanded graph of smallest key, ties going to the shorter LC sequence.
+    The search is greedy: graphs are ranked by their own key alone, without a cost to reach them or an
+    admissible estimate, so it is not A* and the first graph reaching a value is not known to be optimal.
+    The frontier is trimmed back to its max_frontier best graphs whenever it grows past twice that size.
+    """
+
+    def __init__(self, key=None, max_frontier: int = 4096):
+        self.key = key  # objective ranking the frontier, the objective of the search if None
+        self.max_frontier = max_frontier
+        self.peak_frontier = 0
+
+    def search(self, search) -> None:
+        key = Objective.resolve(self.key) if self.key is not None else search.objective
+        frontier = [((False, 0), 0, search.current)]
+        while frontier and not search.exhausted():
+            _, length, parent = heapq.heappop(frontier)
+            search.move_to(parent)
+            for idx in search.expand():
+                search.descend(idx)
+                if search.visit():
+                    heapq.heappush(frontier, (search.rank(search.track[idx], key), length + 1, idx))
+                search.ascend()
+            self.peak_frontier = max(self.peak_frontier, len(frontier))
+            if len(frontier) > 2 * self.max_frontier:
+                frontier = heapq.nsmallest(self.max_frontier, frontier)
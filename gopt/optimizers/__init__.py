@@ -1 +1,3 @@
-from .GeometryOptimizer import GeometryOptimizer
\ No newline at end of file
+from .GeometryOptimizer import GeometryOptimizer
+from .LCSearch import LCSearch
+from .AnnealingOptimizer import AnnealingOptimizer
@@ -0,0 +1,73 @@
+import random
+from math import pi
+
+from gopt.circuit import Circuit
+
+
+def random_gates(size: int, depth: int, seed: int):
+    """
+    Generate a random sequence of Circuit gates mixing Clifford and non-Clifford rotations.
+    :return: generator of tuples of a Circuit method name and its arguments
+    """
+    rng = random.Random(seed)
+    for _ in range(depth):
+        kind = rng.random()
+        wire = rng.randrange(size)
+        if kind < 0.25 and size > 1:
+            yield ('cnot', *rng.sample(range(size), 2))
+        elif kind < 0.4 and size > 1:
+            yield ('cz', *rng.sample(range(size), 2))
+        elif kind < 0.6:
+            yield 'h', wire
+        elif kind < 0.75:
+            yield 't', wire
+        elif kind < 0.85:
+            yield 's', wire
+        else:
+            yield 'rx', wire, rng.choice([pi / 4, pi / 2, pi, 0.3])
+
+
+def build(circuit, gates):
+    for name, *args in gates:
+        getattr(circuit, name)(*args)
+    return circuit
+
+
+def graph_state(seed: int, size: int = 4, depth: int = 40):
+    """
+    Build the Pauli eliminated graph state of a random circuit.
+    """
+    retval = build(Circuit(size), random_gates(size, depth, seed)).to_graph_state()
+    retval.eliminate_pauli()
+    return retval
+
+
+def state_of(graph_state):
+    """
+    Get the geometry, the bases and the corrections of a graph state in comparable form.
+    """
+    nodes = sorted(graph_state.geometry.nodes())
+    edges = {frozenset(edge) for edge in graph_state.geometry.G.edges()}
+    bases = []
+    for node in nodes:
+        base = graph_state.bases.save(node)
+        bases.append(base if base is None or isinstance(base, int) else tuple(base.tolist()))
+    corrections = [graph_state.dependency.save(node) for node in nodes]
+    return nodes, edges, bases, corrections
+
+
+def register_size(G, dep_map, sequence) -> int:
+    """
+    Check that a measurement sequence measures every node after its dependencies and get its register size,
+    measuring a node requiring its unmeasured closed neighbourhood in the register.
+    """
+    assert sorted(sequence) == sorted(G.nodes())
+    measured, qreg, size = set(), set(), 0
+    for node in sequence:
+        assert all(source in measured for source in dep_map.get(node, ())), node
+        qreg.update(neighbour for neighbour in G.neighbors(node) if neighbour not in measured)
+        qreg.add(node)
+        size = max(size, len(qreg))
+        qreg.remove(node)
+        measured.add(node)
+    return size
@@ -0,0 +1,73 @@
+from functools import reduce
+from math import pi
+
+import numpy as np
+
+I = np.eye(2)
+X = np.array([[0, 1], [1, 0]])
+Y = np.array([[0, -1j], [1j, 0]])
+Z = np.diag([1, -1])
+H = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
+P0, P1 = np.diag([1, 0]), np.diag([0, 1])
+
+
+def rx(angle):
+    return np.cos(angle / 2) * I - 1j * np.sin(angle / 2) * X
+
+
+def ry(angle):
+    return np.cos(angle / 2) * I - 1j * np.sin(angle / 2) * Y
+
+
+def rz(angle):
+    return np.diag([np.exp(-0.5j * angle), np.exp(0.5j * angle)])
+
+
+def embed(size, operators):
+    """
+    Tensor single qubit operators on some qubits, qubit 0 as the least significant bit.
+    """
+    return reduce(np.kron, [operators.get(qubit, I) for qubit in reversed(range(size))])
+
+
+def controlled(size, controls, target, operator):
+    projector = embed(size, {control: P1 for control in controls})
+    return np.eye(1 << size) - projector + embed(size, {**{control: P1 for control in controls}, target: operator})
+
+
+# Unitary of the gates of Circuit
+CIRCUIT_GATES = {
+    'h': lambda size, q: embed(size, {q: H}),
+    'x': lambda size, q: embed(size, {q: X}),
+    'z': lambda size, q: embed(size, {q: Z}),
+    's': lambda size, q: embed(size, {q: rz(pi / 2)}),
+    's_dagger': lambda size, q: embed(size, {q: rz(-pi / 2)}),
+    't': lambda size, q: embed(size, {q: rz(pi / 4)}),
+    't_dagger': lambda size, q: embed(size, {q: rz(-pi / 4)}),
+    'rx': lambda size, q, angle: embed(size, {q: rx(angle)}),
+    'rz': lambda size, q, angle: embed(size, {q: rz(angle)}),
+    'cnot': lambda size, c, t: controlled(size, [c], t, X),
+    'cz': lambda size, c, t: controlled(size, [c], t, Z),
+}
+
+
+def probabilities(size: int, gates) -> dict:
+    """
+    Compute the output distribution of Circuit gates applied to |0>^size.
+    :param size: number of qubits
+    :param gates: tuples of a Circuit method name and its arguments
+    :return: dict of output bitstrings, qubit 0 rightmost, to their probabilities
+    """
+    state = np.zeros(1 << size, dtype=complex)
+    state[0] = 1
+    for name, *args in gates:
+        state = CIRCUIT_GATES[name](size, *args) @ state
+    return {format(index, f'0{size}b'): p for index, p in enumerate(np.abs(state) ** 2) if p > 1e-12}
+
+
+def distance(counts: dict, expected: dict) -> float:
+    """
+    Get the total variation distance between sampled counts and a distribution.
+    """
+    shots = sum(counts.values())
+    return sum(abs(counts.get(key, 0) / shots - expected.get(key, 0)) for key in set(counts) | set(expected)) / 2
@@ -0,0 +1,31 @@
+import pytest
+
+from gopt.optimizers import AnnealingOptimizer
+from . import graph_state, state_of
+
+
+def value(optimizer, state):
+    return optimizer.objective({"edge_size": state.geometry.edge_size(), "reg_size": state.schedule()[1]})
+
+
+@pytest.mark.parametrize("objective", ["edge_size", "reg_size"])
+def test_optimum_replays(objective):
+    state = graph_state(2, 5, 60)
+    before = state_of(state)
+    optimizer = AnnealingOptimizer(state, objective, steps=300, restarts=1, seed=0)
+    optimizer.execute()
+    # The graph state is left as it was
+    assert state_of(state) == before
+    assert optimizer.min_objective <= value(optimizer, state)
+    for node in optimizer.optimized_lc_sequence():
+        state.geometry.local_complement(node)
+    assert value(optimizer, state) == optimizer.min_objective
+
+
+def test_seeded():
+    runs = []
+    for _ in range(2):
+        optimizer = AnnealingOptimizer(graph_state(3, 5, 60), "edge_size", steps=200, seed=7)
+        optimizer.execute()
+        runs.append((optimizer.optimized_lc_sequence(), optimizer.track))
+    assert runs[0] == runs[1]
@@ -0,0 +1,59 @@
+from math import pi
+
+import numpy as np
+import pytest
+
+from gopt.circuit import Circuit, ArrayCircuit
+from . import random_gates, build
+
+
+def assert_same_graph_state(expected, actual):
+    assert sorted(expected.geometry.nodes()) == sorted(actual.geometry.nodes())
+    assert {frozenset(edge) for edge in expected.geometry.G.edges()} == \
+        {frozenset(edge) for edge in actual.geometry.G.edges()}
+    assert {node: set(sources) for node, sources in expected.dependency.dep_map.items()} == \
+        {node: set(sources) for node, sources in actual.dependency.dep_map.items()}
+    assert list(expected.output_layer) == list(actual.output_layer)
+    for node in expected.geometry.nodes():
+        base, other = expected.bases.save(node), actual.bases.save(node)
+        if base is None or isinstance(base, int):
+            assert base == other, node
+        else:
+            assert np.allclose(base, other), node
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_gates(seed):
+    size = 1 + seed % 5
+    gates = list(random_gates(size, 60, seed))
+    assert_same_graph_state(build(Circuit(size), gates).to_graph_state(),
+                            build(ArrayCircuit(size), gates).to_graph_state())
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_layers(seed):
+    size = 6
+    rng = np.random.default_rng(seed)
+    circuit, array_circuit = Circuit(size), ArrayCircuit(size)
+    parity = 0
+    for _ in range(5):
+        angles = rng.choice([0, pi / 4, pi / 2, pi, -pi / 4, 0.3], (size, 2))
+        for wire in range(size):
+            circuit.add_rotation_sequence(wire, angles[wire].tolist())
+        array_circuit.add_layer(angles)
+        pairs = [(wire, wire + 1) for wire in range(parity, size - 1, 2)]
+        for pair in pairs:
+            circuit.cz(*pair)
+        array_circuit.cz_layer(pairs)
+        parity ^= 1
+    wires = [4, 1]
+    angles = [[pi / 4], [0.3]]
+    for wire, wire_angles in zip(wires, angles):
+        circuit.add_rotation_sequence(wire, wire_angles)
+    array_circuit.add_layer(angles, wires)
+    assert_same_graph_state(circuit.to_graph_state(), array_circuit.to_graph_state())
+
+
+def test_repeated_wires():
+    with pytest.raises(ValueError):
+        ArrayCircuit(2).add_layer([[0], [pi]], [1, 1])
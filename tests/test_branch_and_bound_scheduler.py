@@ -0,0 +1,50 @@
+import itertools
+import random
+
+import networkx as nx
+import pytest
+
+from gopt.graph.BranchAndBoundScheduler import BranchAndBoundScheduler
+from gopt.graph.MeasurementSequenceScheduler import MeasurementSequenceScheduler
+from . import graph_state, register_size
+
+
+def random_instance(seed: int, size: int = 7):
+    """
+    Random geometry with random dependencies along a hidden order, so that they are acyclic.
+    """
+    rng = random.Random(seed)
+    G = nx.gnp_random_graph(size, 0.4, seed=seed)
+    order = rng.sample(range(size), size)
+    dep_map = {node: {source for source in order[:order.index(node)] if rng.random() < 0.15} for node in G}
+    return G, dep_map
+
+
+def brute_force(G, dep_map) -> int:
+    return min(register_size(G, dep_map, sequence) for sequence in itertools.permutations(G.nodes())
+               if all(sequence.index(source) < sequence.index(node)
+                      for node, sources in dep_map.items() for source in sources))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_optimal(seed):
+    G, dep_map = random_instance(seed)
+    scheduler = BranchAndBoundScheduler(G, dep_map)
+    sequence, size = scheduler.schedule()
+    assert register_size(G, dep_map, sequence) == size == brute_force(G, dep_map)
+    assert scheduler.lower_bound <= size
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_no_worse_than_greedy(seed):
+    state = graph_state(seed, 3, 30)
+    sequence, size, lower_bound = state.schedule_exact(time_limit=10)
+    assert lower_bound <= size <= state.schedule()[1]
+    assert register_size(state.geometry.G, state.dependency.dep_map, sequence) == size
+    assert size <= MeasurementSequenceScheduler(state.geometry, state.dependency.dep_map, True).schedule()[1]
+
+
+def test_cyclic_dependencies():
+    G = nx.path_graph(4)
+    with pytest.raises(ValueError, match="Cyclic"):
+        BranchAndBoundScheduler(G, {0: {2}, 2: {1}, 1: {0}}).schedule()
@@ -0,0 +1,129 @@
+import importlib.util
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from gopt.graph.GeometryLayer import GeometryLayer
+from gopt.graph.BitGeometryLayer import BitGeometryLayer
+
+
+def random_graph(seed: int, size: int = 24, p: float = 0.2) -> nx.Graph:
+    # Tuple labels as built by Circuit
+    return nx.relabel_nodes(nx.gnp_random_graph(size, p, seed=seed), {i: (i % 5, i // 5) for i in range(size)})
+
+
+def edges(geometry) -> set:
+    return {frozenset(edge) for edge in geometry.G.edges()}
+
+
+def mutate(geometry, rng: random.Random) -> None:
+    """
+    Apply a random local complementation, edge toggle or cutoff.
+    """
+    nodes = geometry.nodes()
+    kind = rng.random()
+    if kind < 0.6:
+        geometry.local_complement(rng.choice(nodes))
+    elif kind < 0.9:
+        u, v = rng.sample(nodes, 2)
+        if v in geometry.neighbours(u):
+            geometry.remove_edge(u, v)
+        else:
+            geometry.add_edge(u, v)
+    elif len(nodes) > 4:
+        geometry.cutoff(rng.choice(nodes))
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_bit_packed_as_networkx(seed):
+    G = random_graph(seed)
+    reference, packed = GeometryLayer(nx.Graph(G)), BitGeometryLayer(G)
+    rng, packed_rng = random.Random(seed), random.Random(seed)
+    for _ in range(40):
+        mutate(reference, rng)
+        mutate(packed, packed_rng)
+        assert reference.nodes() == packed.nodes()
+        assert edges(reference) == edges(packed)
+        for node in reference.nodes():
+            assert reference.neighbours(node) == packed.neighbours(node)
+            assert reference.degree(node) == packed.degree(node)
+            assert reference.isolated(node) == packed.isolated(node)
+        nodes = set(rng.sample(reference.nodes(), 3))
+        packed_rng.sample(packed.nodes(), 3)
+        assert reference.boundary_nodes(nodes) == packed.boundary_nodes(nodes)
+        assert reference.max_degree_nodes() == packed.max_degree_nodes()
+        assert reference.max_degree_nodes(nodes) == packed.max_degree_nodes(nodes)
+
+
+def test_bit_packed_from_rows():
+    packed = BitGeometryLayer(random_graph(0))
+    rebuilt = BitGeometryLayer.from_rows(packed.nodes(), packed.adjacency_rows())
+    assert edges(rebuilt) == edges(packed)
+
+
+def test_bit_packed_view_is_frozen():
+    packed = BitGeometryLayer(random_graph(0))
+    with pytest.raises(nx.NetworkXError):
+        packed.G.add_edge(*packed.nodes()[:2])
+
+
+@pytest.mark.parametrize("layer", [GeometryLayer, BitGeometryLayer])
+@pytest.mark.parametrize("seed", range(6))
+def test_lc_delta_as_applied(layer, seed):
+    geometry = layer(random_graph(seed, p=0.3))
+    for node in geometry.nodes():
+        edge_delta, degree_delta, max_degree = geometry.lc_delta(node)
+        edge_size = geometry.edge_size()
+        degrees = {other: geometry.degree(other) for other in geometry.nodes()}
+        geometry.local_complement(node)
+        assert geometry.edge_size() == edge_size + edge_delta == geometry.G.number_of_edges()
+        assert geometry.max_degree() == max_degree == max(dict(geometry.G.degree()).values())
+        for other in geometry.nodes():
+            assert geometry.degree(other) == degrees[other] + degree_delta.get(other, 0)
+        geometry.local_complement(node)
+
+
+@pytest.mark.parametrize("layer", [GeometryLayer, BitGeometryLayer])
+@pytest.mark.parametrize("seed", range(6))
+def test_degree_index_maintained(layer, seed):
+    geometry = layer(random_graph(seed))
+    rng = random.Random(seed)
+    # Build the index first, then keep it through the mutations
+    geometry.degree_histogram()
+    for _ in range(60):
+        mutate(geometry, rng)
+        degrees = dict(geometry.G.degree())
+        histogram = dict()
+        for degree in degrees.values():
+            histogram[degree] = histogram.get(degree, 0) + 1
+        assert {degree: count for degree, count in geometry.degree_histogram().items() if count} == histogram
+        assert geometry.max_degree() == max(degrees.values())
+        assert geometry.max_degree_nodes() == ({node for node, degree in degrees.items()
+                                                if degree == max(degrees.values())}, max(degrees.values()))
+        assert geometry.edge_size() == geometry.G.number_of_edges()
+        assert geometry.degree_square_sum() == sum(degree * degree for degree in degrees.values())
+
+
+@pytest.mark.parametrize("layer", [GeometryLayer, BitGeometryLayer])
+@pytest.mark.parametrize("seed", range(4))
+def test_adjacency_exports(layer, seed):
+    geometry = layer(random_graph(seed))
+    rng = random.Random(seed)
+    for _ in range(5):
+        labels = geometry.label_register()
+        expected = nx.to_numpy_array(geometry.G, nodelist=list(labels), dtype=np.uint8)
+        assert np.array_equal(geometry.adjacency_dense(), expected)
+        assert np.array_equal(np.unpackbits(geometry.adjacency_packed(), axis=1, count=len(labels),
+                                            bitorder='little'), expected)
+        rows = geometry.adjacency_rows()
+        assert [[row >> j & 1 for j in range(len(labels))] for row in rows] == expected.tolist()
+        matrix, register = geometry.extract_edge_matrix()
+        assert np.array_equal(matrix, expected) and register == list(labels)
+        if importlib.util.find_spec("scipy") is not None:
+            assert np.array_equal(geometry.adjacency_csr().toarray(), expected)
+        # Exports are read-only and rebuilt after a mutation
+        with pytest.raises(ValueError):
+            geometry.adjacency_dense()[0, 0] = 1
+        mutate(geometry, rng)
@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from gopt.graph.GraphSnapshot import GraphSnapshot
+from . import graph_state, state_of
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_restore(seed):
+    state = graph_state(seed)
+    before = state_of(state)
+    snapshot = state.snapshot()
+    assert state.bases.bases, "no non-Pauli base to restore"
+    rng = random.Random(seed)
+    for _ in range(6):
+        state.local_complement(rng.choice(state.geometry.nodes()), rng.choice([1, -1]))
+    state.restore(snapshot)
+    assert state_of(state) == before
+    assert state.snapshot() == snapshot
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_equality(seed):
+    state = graph_state(seed)
+    snapshot = state.snapshot()
+    assert snapshot == state.snapshot() and hash(snapshot) == hash(state.snapshot())
+    node = state.geometry.nodes()[0]
+    state.local_complement(node)
+    state.local_complement(node)
+    # Same geometry, rotated frames
+    assert GraphSnapshot.from_graph(state.geometry.G, snapshot.labels).edges == snapshot.edges
+    assert state.snapshot() != snapshot
+
+
+def test_graph():
+    state = graph_state(0)
+    snapshot = state.snapshot()
+    assert {frozenset(edge) for edge in snapshot.graph().edges()} == \
+        {frozenset(edge) for edge in state.geometry.G.edges()}
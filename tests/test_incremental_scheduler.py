@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from gopt.graph.IncrementalScheduler import IncrementalScheduler
+from gopt.graph.MeasurementSequenceScheduler import MeasurementSequenceScheduler
+from . import graph_state
+
+
+@pytest.mark.parametrize("arrival_order", [False, True])
+@pytest.mark.parametrize("seed", range(8))
+def test_same_as_schedule_after_local_complementations(seed, arrival_order):
+    state = graph_state(seed)
+    scheduler = IncrementalScheduler(state, arrival_order)
+    rng = random.Random(seed)
+    for _ in range(12):
+        expected = MeasurementSequenceScheduler(state.geometry, state.dependency.dep_map, arrival_order).schedule()
+        assert scheduler.schedule() == expected
+        scheduler.local_complement(rng.choice(state.geometry.nodes()))
+    assert scheduler.schedule() == \
+        MeasurementSequenceScheduler(state.geometry, state.dependency.dep_map, arrival_order).schedule()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_same_as_schedule_after_rollback(seed):
+    state = graph_state(seed)
+    scheduler = IncrementalScheduler(state)
+    expected = state.schedule()
+    assert scheduler.schedule() == expected
+    rng = random.Random(seed)
+    checkpoint = scheduler.checkpoint()
+    for _ in range(5):
+        scheduler.local_complement(rng.choice(state.geometry.nodes()))
+    assert scheduler.schedule() == state.schedule()
+    scheduler.rollback(checkpoint)
+    assert scheduler.schedule() == expected
+
+
+def test_same_as_schedule_after_touch():
+    state = graph_state(0)
+    scheduler = IncrementalScheduler(state)
+    scheduler.schedule()
+    node = state.geometry.nodes()[0]
+    scheduler.touch(state.geometry.neighbours(node))
+    # Local complementation outside of the scheduler
+    state.geometry.local_complement(node)
+    assert scheduler.schedule() == state.schedule()
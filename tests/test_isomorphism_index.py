@@ -0,0 +1,40 @@
+import random
+
+import networkx as nx
+import pytest
+
+from gopt.graph.GeometryLayer import GeometryLayer
+from gopt.optimizers.IsomorphismIndex import IsomorphismIndex
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_as_linear_scan(seed):
+    rng = random.Random(seed)
+    geometry = GeometryLayer(nx.gnp_random_graph(9, 0.35, seed=seed))
+    index = IsomorphismIndex()
+    registered = dict()
+    for key in range(120):
+        geometry.local_complement(rng.choice(geometry.nodes()))
+        G = geometry.G
+        if rng.random() < 0.3:
+            # Same graph under other labels
+            nodes = list(G.nodes())
+            G = nx.relabel_nodes(G, dict(zip(nodes, rng.sample(nodes, len(nodes)))))
+        expected = next((other for other, H in registered.items() if nx.is_isomorphic(G, H)), None)
+        found = index.find(G)
+        assert (found is None) == (expected is None)
+        if found is None:
+            index.add(key, G)
+            registered[key] = nx.Graph(G)
+        else:
+            assert nx.is_isomorphic(G, registered[found])
+    assert index.size == len(registered) > 1
+
+
+def test_certificate_invariant():
+    rng = random.Random(0)
+    index = IsomorphismIndex()
+    G = nx.gnp_random_graph(12, 0.3, seed=0)
+    nodes = list(G.nodes())
+    H = nx.relabel_nodes(G, dict(zip(nodes, rng.sample(nodes, len(nodes)))))
+    assert index.certificate(G) == index.certificate(H)
@@ -0,0 +1,105 @@
+import importlib
+import multiprocessing
+from math import sqrt
+
+import pytest
+
+from gopt.optimizers import LCSearch
+from gopt.optimizers.SearchStrategy import DepthFirst, BreadthFirst, BeamSearch, GreedyBestFirst
+from . import graph_state, state_of
+
+
+def replayed_metrics(state, sequence):
+    """
+    Recompute the metrics of the graph reached by an LC sequence from scratch, then undo the sequence.
+    """
+    for node in sequence:
+        state.geometry.local_complement(node)
+    degrees = dict(state.geometry.G.degree())
+    retval = {"reg_size": state.schedule()[1], "max_degree": max(degrees.values()),
+              "degree_norm": sqrt(sum(degree * degree for degree in degrees.values())),
+              "edge_size": state.geometry.G.number_of_edges()}
+    for node in reversed(sequence):
+        state.geometry.local_complement(node)
+    return retval
+
+
+def assert_track_replays(search, state):
+    for idx, metrics in search.track.items():
+        expected = replayed_metrics(state, search.optimized_lc_sequence(idx))
+        for metric in search.metrics:
+            if metric in metrics:
+                assert metrics[metric] == pytest.approx(expected[metric]), (idx, metric)
+            else:
+                # Pruned, the bound must not exceed the register size
+                assert metrics["reg_size_bound"] <= expected["reg_size"]
+
+
+@pytest.mark.parametrize("objective", ["edge_size", "max_degree", "degree_norm", "reg_size"])
+@pytest.mark.parametrize("seed", range(3))
+def test_track_replays(objective, seed):
+    state = graph_state(seed, 5, 60)
+    before = state_of(state)
+    search = LCSearch(state, objective, max_depth=60, split=objective)
+    search.execute()
+    # Back at the root
+    assert state_of(state) == before
+    assert_track_replays(search, state)
+    optimum = replayed_metrics(state, search.optimized_lc_sequence())
+    assert optimum[objective] == pytest.approx(search.min_values[objective])
+    assert search.min_values[objective] <= replayed_metrics(state, [])[objective]
+
+
+@pytest.mark.parametrize("name, objective", [("EdgeOptimizerDFS", "edge_size"),
+                                             ("DegreeNormOptimizerDFS", "degree_norm"),
+                                             ("MaxDegreeOptimizerDFS", "max_degree"),
+                                             ("RegisterSizeOptimizerDFS", "reg_size")])
+def test_optimizers_are_lc_search(name, objective):
+    optimizer = getattr(importlib.import_module(f"gopt.optimizers.{name}"), name)(graph_state(1, 5, 60),
+                                                                                  max_depth=40)
+    optimizer.execute()
+    assert repr(optimizer.objective) == objective
+    search = LCSearch(graph_state(1, 5, 60), objective, max_depth=40, metrics=optimizer.metrics,
+                      split=optimizer.split)
+    search.execute()
+    assert optimizer.track == search.track
+    assert optimizer.optimized_lc_sequence() == search.optimized_lc_sequence()
+
+
+@pytest.mark.parametrize("prefilter", [None, "degeneracy"])
+def test_parallel_as_serial(prefilter):
+    runs = []
+    for processes in (1, 2):
+        search = LCSearch(graph_state(2, 5, 60), "reg_size", max_depth=40, split="reg_size",
+                          processes=processes, prefilter=prefilter)
+        search.execute()
+        assert search.evaluator is None
+        runs.append((search.track, search.optimized_lc_sequence(), search.pruned))
+    assert runs[0] == runs[1]
+    assert not multiprocessing.active_children()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_strategies_exhaust_the_orbit(seed):
+    state = graph_state(seed, 3, 16)
+    minima = []
+    for strategy in (DepthFirst(), BreadthFirst(), BeamSearch(width=10 ** 6), GreedyBestFirst()):
+        search = LCSearch(state, "edge_size", strategy, max_depth=10 ** 6, traverse_all=True, split=None)
+        search.execute()
+        assert search.exhausted() is False
+        assert_track_replays(search, state)
+        minima.append(search.min_edge_size)
+    assert len(set(minima)) == 1
+
+
+@pytest.mark.parametrize("strategy", [BeamSearch(width=2), BeamSearch(width=3, key="max_degree"),
+                                      GreedyBestFirst(key={"edge_size": 1, "max_degree": 2}, max_frontier=4)])
+def test_bounded_strategies(strategy):
+    state = graph_state(4, 5, 60)
+    before = state_of(state)
+    search = LCSearch(state, "edge_size", strategy, max_depth=80, metrics=("edge_size", "max_degree"))
+    search.execute()
+    assert state_of(state) == before
+    assert search.depth >= 80
+    assert_track_replays(search, state)
+    assert search.min_edge_size <= replayed_metrics(state, [])["edge_size"]
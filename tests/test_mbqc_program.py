@@ -0,0 +1,202 @@
+import sys
+
+import numpy as np
+import pytest
+
+from gopt.circuit import Circuit
+from gopt.graph.MBQCProgram import ALLOC, CZ, FREE, MEASURE, PAULI, PAULIS, PLANES, ROTATE, MBQCProgram
+from gopt.graph.RegisterSimulator import RegisterSimulator
+
+from . import build, graph_state
+from .statevector import H, X, Y, Z, distance, probabilities, rx, ry, rz
+from .test_register_simulator import CIRCUITS
+
+ROTATIONS = {'xy': lambda angle: H @ rz(-angle), 'zy': rx, 'xz': lambda angle: H @ ry(angle)}
+
+
+def execute(program, shots: int, seed: int = 0) -> np.ndarray:
+    """
+    Interpret the instructions of a program on a statevector, one shot at a time.
+    :return: (shots, creg_size) bit matrix of the classical bits
+    """
+    rng = np.random.default_rng(seed)
+    size = program.reg_size
+
+    def apply(state, gate, qubit):
+        axis = size - 1 - qubit
+        return np.moveaxis(np.tensordot(gate, state, axes=([1], [axis])), 0, axis)
+
+    retval = np.zeros((shots, program.creg_size), dtype=np.uint8)
+    for shot in range(shots):
+        state = np.zeros((2,) * size, dtype=complex)
+        state[(0,) * size] = 1
+        for i in range(len(program)):
+            op, q, arg = program.ops[i], program.qubits[i], program.args[i]
+            if op == ALLOC:
+                state = apply(state, H, q)
+            elif op == CZ:
+                index = [slice(None)] * size
+                index[size - 1 - q], index[size - 1 - arg] = 1, 1
+                state[tuple(index)] *= -1
+            elif op == PAULI:
+                if np.bitwise_xor.reduce(retval[shot, program.condition(i)], initial=0):
+                    state = apply(state, {'x': X, 'y': Y, 'z': Z}[PAULIS[arg]], q)
+            elif op == ROTATE:
+                state = apply(state, ROTATIONS[PLANES[arg]](program.angles[i]), q)
+            elif op == MEASURE:
+                one = np.take(state, 1, axis=size - 1 - q)
+                outcome = int(rng.random() < np.sum(np.abs(one) ** 2))
+                index = [slice(None)] * size
+                index[size - 1 - q] = 1 - outcome
+                state[tuple(index)] = 0
+                state /= np.linalg.norm(state)
+                retval[shot, arg] = outcome
+                # Bring the measured qubit back to |0> for its next allocation
+                if outcome:
+                    state = apply(state, X, q)
+    return retval
+
+
+def test_structure():
+    for seed in range(6):
+        state = graph_state(seed)
+        sequence, reg_size = state.schedule()
+        program, creg_map = state.compile()
+        assert program.reg_size == reg_size and program.creg_size == len(sequence)
+        assert [creg_map[node] for node in sequence] == list(range(len(sequence)))
+        ops = list(program.ops)
+        assert ops.count(ALLOC) == ops.count(FREE) == ops.count(MEASURE) == len(sequence)
+        assert ops.count(CZ) == state.geometry.G.number_of_edges()
+        alive, measured = set(), set()
+        for i, op in enumerate(ops):
+            q = program.qubits[i]
+            if op == ALLOC:
+                assert q not in alive
+                alive.add(q)
+            elif op == FREE:
+                alive.remove(q)
+            else:
+                assert q in alive
+            if op == CZ:
+                assert program.args[i] in alive
+            elif op == PAULI:
+                assert all(clbit in measured for clbit in program.condition(i))
+            elif op == MEASURE:
+                measured.add(program.args[i])
+            assert len(alive) <= reg_size
+
+
+def test_qasm3():
+    state = graph_state(0)
+    program, creg_map = state.compile()
+    lines = program.to_qasm3().splitlines()
+    assert lines[:4] == ['OPENQASM 3.0;', 'include "stdgates.inc";',
+                         f'qubit[{program.reg_size}] q;', f'bit[{program.creg_size}] c;']
+    assert sum(' = measure q[' in line for line in lines) == len(creg_map)
+    assert sum(line.startswith('cz ') for line in lines) == state.geometry.G.number_of_edges()
+    assert sum(line.startswith('reset ') for line in lines) == len(creg_map)
+
+
+def test_compile_without_qiskit(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'qiskit', None)
+    program, creg_map = graph_state(1).compile()
+    assert program.to_qasm3().startswith('OPENQASM 3.0;')
+
+
+def test_to_qiskit():
+    pytest.importorskip('qiskit')
+    state = graph_state(2)
+    program, creg_map = state.compile()
+    ops = program.to_qiskit().count_ops()
+    assert ops['measure'] == ops['reset'] == len(creg_map)
+    assert ops['cz'] == state.geometry.G.number_of_edges()
+
+
+@pytest.mark.parametrize('size, gates', CIRCUITS)
+def test_program_samples_statevector(size, gates):
+    state = build(Circuit(size), gates).to_graph_state()
+    state.eliminate_pauli()
+    program, creg_map = state.compile()
+    counts = state.process_outcomes(execute(program, 1000), creg_map)
+    assert distance(counts, probabilities(size, gates)) < 0.06
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_program_samples_as_register_simulator(seed):
+    state = graph_state(seed, size=3, depth=30)
+    program, creg_map = state.compile()
+    counts = state.process_outcomes(execute(program, 1000, seed), creg_map)
+    expected = RegisterSimulator(state, seed=seed).run(20000)
+    assert distance(counts, {key: count / 20000 for key, count in expected.items()}) < 0.08
+
+
+def parity_program(sources) -> MBQCProgram:
+    """
+    Measure two qubits as 1, then |+> measured in X after a Z on the parity of some of their bits.
+    """
+    retval = MBQCProgram(1, 3)
+    for clbit in (0, 1):
+        retval.alloc(0)
+        retval.rotate(0, 'xz', np.pi)
+        retval.measure(0, clbit)
+        retval.free(0)
+    retval.alloc(0)
+    retval.pauli(0, 'z', sources)
+    retval.rotate(0, 'xy', 0)
+    retval.measure(0, 2)
+    retval.free(0)
+    return retval
+
+
+def test_one_parity_correction_per_node():
+    for seed in range(6):
+        state = graph_state(seed)
+        program, creg_map = state.compile()
+        corrections = {}
+        for i in range(len(program)):
+            if program.ops[i] == PAULI:
+                clbit = program.args[program.ops.tolist().index(MEASURE, i)]
+                assert clbit not in corrections
+                corrections[clbit] = (PAULIS[program.args[i]], program.condition(i))
+        expected = {creg_map[node]: (state.dependency.correction_base(node) or 'z',
+                                     sorted(creg_map[source] for source in sources))
+                    for node, sources in state.dependency.dep_map.items() if sources}
+        assert corrections == expected
+    assert any(len(sources) > 1 for _, sources in corrections.values())
+
+
+def test_qasm3_parity():
+    program, creg_map = graph_state(0).compile()
+    lines = program.to_qasm3().splitlines()
+    for i in range(len(program)):
+        if program.ops[i] == PAULI:
+            clbits = program.condition(i)
+            parity = ' ^ '.join(f'c[{clbit}]' for clbit in clbits)
+            parity = parity if len(clbits) == 1 else f'({parity})'
+            assert f'if ({parity} == 1) {PAULIS[program.args[i]]} q[{program.qubits[i]}];' in lines
+    assert parity_program([0, 1]).to_qasm3().splitlines()[-1] == 'c[2] = measure q[0];'
+
+
+@pytest.mark.parametrize('sources, expected', [([0, 1], '011'), ([0], '111'), ([], '011')])
+def test_flips_cancel(sources, expected):
+    program = parity_program(sources)
+    assert {''.join(map(str, reversed(bits))) for bits in execute(program, 20).tolist()} == {expected}
+
+
+@pytest.mark.parametrize('sources, expected', [([0, 1], '011'), ([0], '111')])
+def test_qiskit_flips_cancel(sources, expected):
+    pytest.importorskip('qiskit_aer')
+    from qiskit import transpile
+    from qiskit_aer import AerSimulator
+
+    simulator = AerSimulator()
+    circuit = transpile(parity_program(sources).to_qiskit(), simulator)
+    assert simulator.run(circuit, shots=20).result().get_counts() == {expected: 20}
+
+
+@pytest.mark.parametrize('size, gates', CIRCUITS)
+def test_qiskit_samples_statevector(size, gates):
+    pytest.importorskip('qiskit_aer')
+    state = build(Circuit(size), gates).to_graph_state()
+    state.eliminate_pauli()
+    assert distance(state.run(4000, backend='qiskit'), probabilities(size, gates)) < 0.04
@@ -0,0 +1,56 @@
+import numpy as np
+import networkx as nx
+import pytest
+
+from gopt.graph.MeasurementSequenceScheduler import MeasurementSequenceScheduler
+from . import graph_state, register_size
+
+
+def baseline_schedule(G: nx.Graph, dep_map):
+    """
+    The set scanning greedy scheduler GraphState.schedule was before the heap-based one.
+    """
+    geometry = nx.Graph.copy(G)
+    dep_map = {node: sources.copy() for node, sources in dep_map.items()}
+    qreg, queue, sequence, size = set(), set(), [], 0
+    while len(geometry.nodes()) > 0:
+        for node in geometry.nodes():
+            if node not in dep_map or len(dep_map[node]) == 0:
+                queue.add(node)
+        delta, node_min, delta_set_min = np.inf, None, set()
+        for node in queue:
+            delta_set = set(geometry.neighbors(node))
+            delta_set.add(node)
+            delta_set = delta_set.difference(qreg)
+            if len(delta_set) == 0 and (node_min is None or geometry.degree(node) > geometry.degree(node_min)):
+                node_min = node
+                delta = 0
+            elif len(delta_set) < delta:
+                delta = len(delta_set)
+                node_min = node
+                delta_set_min = delta_set
+        size = max(size, len(qreg) + delta)
+        qreg.update(delta_set_min)
+        for node in geometry.nodes():
+            if node in dep_map and node_min in dep_map[node]:
+                dep_map[node].remove(node_min)
+        geometry.remove_node(node_min)
+        qreg.remove(node_min)
+        queue.remove(node_min)
+        sequence.append(node_min)
+    return sequence, size
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_as_baseline(seed):
+    state = graph_state(seed, 3 + seed % 3, 30 + 4 * seed)
+    sequence, size = state.schedule()
+    assert (sequence, size) == baseline_schedule(state.geometry.G, state.dependency.dep_map)
+    assert register_size(state.geometry.G, state.dependency.dep_map, sequence) <= size
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_arrival_order(seed):
+    state = graph_state(seed, 3 + seed % 3, 30 + 4 * seed)
+    sequence, size = MeasurementSequenceScheduler(state.geometry, state.dependency.dep_map, True).schedule()
+    assert register_size(state.geometry.G, state.dependency.dep_map, sequence) == size
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from gopt.graph.OutcomeCounter import OutcomeCounter
+
+
+def bitstring(bits):
+    # Classical bit 0 rightmost as qiskit reports them
+    return ''.join(str(bit) for bit in reversed(bits))
+
+
+def test_bitstring_order():
+    # Outputs on classical bits 2 and 0: output 0 is bit 2, the last character
+    counts = OutcomeCounter([2, 0]).process({'100': 3, '001': 5, '110': 1})
+    assert counts == {'01': 4, '10': 5}
+
+
+def test_first_first():
+    counts = OutcomeCounter([2, 0], first_last=False).process({'100': 3, '001': 5, '110': 1})
+    assert counts == {'10': 4, '01': 5}
+
+
+def test_spaces_between_registers():
+    assert OutcomeCounter([0, 3]).process({'1 000': 2, '0 001': 1}) == {'10': 2, '01': 1}
+
+
+@pytest.mark.parametrize("registers", [[2, 0], [0, 1, 2], [5, 3, 4], [1, 2, 3]])
+@pytest.mark.parametrize("first_last", [True, False])
+def test_inputs_agree(registers, first_last):
+    rng = np.random.default_rng(len(registers))
+    bits = rng.integers(0, 2, (200, 6)).astype(np.uint8)
+    words = (bits.astype(np.int64) << np.arange(6)).sum(axis=1)
+    strings = [bitstring(row) for row in bits]
+    expected = dict()
+    for row in bits:
+        key = ''.join(str(row[register]) for register in registers)
+        key = key[::-1] if first_last else key
+        expected[key] = expected.get(key, 0) + 1
+
+    assert OutcomeCounter(registers, first_last).process(bits) == expected
+    assert OutcomeCounter(registers, first_last).process(words) == expected
+    assert OutcomeCounter(registers, first_last).process(strings) == expected
+    unique, counts = np.unique(words, return_counts=True)
+    assert OutcomeCounter(registers, first_last).process(unique, counts) == expected
+
+
+def test_chunks():
+    counter = OutcomeCounter([0, 1])
+    counter.consume([np.array([1, 2, 3]), (np.array([1]), np.array([4])), ['10']])
+    assert counter.shots == 8
+    assert counter.counts() == {'01': 5, '10': 2, '11': 1}
+
+
+@pytest.mark.parametrize("width", [24, 70])
+def test_wide(width):
+    # Wider than the dense table, and than a packed word
+    rng = np.random.default_rng(width)
+    bits = rng.integers(0, 2, (50, width)).astype(np.uint8)
+    bits[10:20] = bits[0]
+    registers = list(range(width))[::-1]
+    counts = OutcomeCounter(registers).process(bits)
+    assert sum(counts.values()) == 50
+    assert counts[''.join(str(bit) for bit in bits[0])] == 11
+    assert counts == OutcomeCounter(registers).process([bitstring(row) for row in bits])
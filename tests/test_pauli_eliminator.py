@@ -0,0 +1,23 @@
+import pytest
+
+from gopt.circuit import Circuit
+from . import random_gates, build, state_of
+
+
+@pytest.mark.parametrize("seed", range(16))
+def test_batched_as_unbatched(seed):
+    size = 2 + seed % 4
+    gates = list(random_gates(size, 30 + 5 * seed, seed))
+    batched = build(Circuit(size), gates).to_graph_state()
+    unbatched = build(Circuit(size), gates).to_graph_state()
+    assert batched.eliminate_pauli() == unbatched.eliminate_pauli(batched=False)
+    assert state_of(batched) == state_of(unbatched)
+    assert {node: set(sources) for node, sources in batched.dependency.dep_map.items()} == \
+        {node: set(sources) for node, sources in unbatched.dependency.dep_map.items()}
+
+
+def test_only_pauli_nodes_left_are_outputs():
+    state = build(Circuit(4), random_gates(4, 60, 3)).to_graph_state()
+    state.eliminate_pauli()
+    for node in state.geometry.nodes():
+        assert node in state.output_layer or state.bases.pauli_base(node) not in ('x', 'y', 'z')
@@ -0,0 +1,66 @@
+import random
+from math import pi
+
+import numpy as np
+import pytest
+
+from gopt.core.BlochSphere import BlochSphere
+from gopt.core.PauliFrame import PauliFrame, ROTATIONS, H
+
+
+def step(rng: random.Random):
+    """
+    Draw a random Clifford operation, named after the methods shared by PauliFrame and BlochSphere.
+    """
+    kind = rng.choice(['rotate', 'rotate_sqrt', 'flip', 'rotate_h'])
+    base = rng.choice('xyz')
+    if kind == 'rotate':
+        return 'rotate', (rng.choice([-pi, -pi / 2, 0, pi / 2, pi, 3 * pi / 2]), base)
+    elif kind == 'rotate_sqrt':
+        return f'rotate_sqrt_{base}', (rng.choice([1, -1]),)
+    elif kind == 'flip':
+        return f'flip_{base}', ()
+    return 'rotate_h', ()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_as_bloch_sphere(seed):
+    rng = random.Random(seed)
+    frame = PauliFrame()
+    spheres = dict()
+    for label, base in enumerate('xyz'):
+        frame.add(label, base)
+        spheres[label] = BlochSphere(base)
+    for _ in range(50):
+        name, args = step(rng)
+        for label, sphere in spheres.items():
+            getattr(frame, name)(label, *args)
+            getattr(sphere, name)(*args)
+            assert np.allclose(frame.vector(label), sphere.vector)
+            assert frame.pauli_base(label) == sphere.pauli_base()
+            assert frame.pauli_sign(label) == sphere.pauli_sign()
+            assert frame.plane(label) == sphere.plane()
+            # Up to a turn, pi and -pi alike
+            assert np.isclose(np.exp(1j * frame.plane_angle(label)), np.exp(1j * sphere.plane_angle()))
+
+
+def test_transform_whole_frame():
+    rng = random.Random(0)
+    frame, expected = PauliFrame(), PauliFrame()
+    for label in range(30):
+        base, sign = rng.choice('xyz'), rng.choice([1, -1])
+        frame.add(label, base, sign)
+        expected.add(label, base, sign)
+    frame.pop(3)
+    expected.pop(3)
+    for table in (H, ROTATIONS['z'][1], ROTATIONS['x'][3]):
+        frame.transform(table)
+        expected.transform(table, list(expected.keys()))
+    assert {label: frame.code(label) for label in frame.keys()} == \
+        {label: expected.code(label) for label in expected.keys()}
+
+
+def test_non_clifford_rotation():
+    frame = PauliFrame({0: 'x'})
+    with pytest.raises(Exception):
+        frame.rotate(0, pi / 4, 'z')
@@ -0,0 +1,91 @@
+from math import pi
+
+import numpy as np
+import pytest
+
+from gopt.circuit import Circuit, QasmImporter
+from .statevector import CIRCUIT_GATES, H, X, Y, Z, controlled, embed, rx, ry, rz
+
+
+def unitary(source):
+    """
+    Multiply the gates of Circuit the importer decomposes a source into.
+    """
+    importer = QasmImporter()
+    gates = list(importer.gates(source.splitlines()))
+    retval = np.eye(1 << importer.size, dtype=complex)
+    for name, *args in gates:
+        retval = CIRCUIT_GATES[name](importer.size, *args) @ retval
+    return retval
+
+
+def assert_equal_up_to_phase(expected, actual):
+    index = np.unravel_index(np.argmax(np.abs(expected)), expected.shape)
+    phase = actual[index] / expected[index]
+    assert np.isclose(abs(phase), 1)
+    assert np.allclose(actual, phase * expected)
+
+
+def u3(theta, phi, lam):
+    return np.array([[np.cos(theta / 2), -np.exp(1j * lam) * np.sin(theta / 2)],
+                     [np.exp(1j * phi) * np.sin(theta / 2), np.exp(1j * (phi + lam)) * np.cos(theta / 2)]])
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ('h q[1];', embed(2, {1: H})),
+    ('y q[0];', embed(2, {0: Y})),
+    ('sx q[1];', embed(2, {1: rx(pi / 2)})),
+    ('sxdg q[0];', embed(2, {0: rx(-pi / 2)})),
+    ('ry(0.7) q[0];', embed(2, {0: ry(0.7)})),
+    ('rz(-pi/3) q[1];', embed(2, {1: rz(-pi / 3)})),
+    ('p(0.4) q[0];', embed(2, {0: np.diag([1, np.exp(0.4j)])})),
+    ('u1(0.4) q[1];', embed(2, {1: np.diag([1, np.exp(0.4j)])})),
+    ('u2(0.3, -0.8) q[0];', embed(2, {0: u3(pi / 2, 0.3, -0.8)})),
+    ('u3(0.5, 1.1, -0.2) q[1];', embed(2, {1: u3(0.5, 1.1, -0.2)})),
+    ('U(0.5, 1.1, -0.2) q[0];', embed(2, {0: u3(0.5, 1.1, -0.2)})),
+    ('cx q[1], q[0];', controlled(2, [1], 0, X)),
+    ('cy q[0], q[1];', controlled(2, [0], 1, Y)),
+    ('cz q[0], q[1];', controlled(2, [0], 1, Z)),
+    ('crz(0.9) q[0], q[1];', controlled(2, [0], 1, rz(0.9))),
+    ('cp(0.9) q[1], q[0];', controlled(2, [1], 0, np.diag([1, np.exp(0.9j)]))),
+    ('swap q[0], q[1];', np.eye(4)[[0, 2, 1, 3]]),
+])
+def test_gate(statement, expected):
+    assert_equal_up_to_phase(expected, unitary(f'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[2];\n{statement}'))
+
+
+def test_ccx():
+    assert_equal_up_to_phase(controlled(3, [0, 2], 1, X), unitary('qreg q[3];\nccx q[0], q[2], q[1];'))
+
+
+def test_definition_and_broadcast():
+    source = """
+    OPENQASM 3.0;
+    qubit[2] a;
+    qubit b;
+    gate rot(theta, phi) x, y { rz(theta / 2) x; cx x, y; ry(phi) y; }
+    rot(pi / 4, 2 * 0.3) a[1], b;
+    h a;
+    """
+    expected = embed(3, {0: H, 1: H}) @ embed(3, {2: ry(0.6)}) @ controlled(3, [1], 2, X) @ embed(3, {1: rz(pi / 8)})
+    assert_equal_up_to_phase(expected, unitary(source))
+
+
+def test_load_builds_circuit():
+    circuit = QasmImporter().loads('qreg q[3];\nmeasure q[0] -> c[0];\nt q;')
+    assert isinstance(circuit, Circuit)
+    assert circuit.size == 3
+
+
+@pytest.mark.parametrize("source", [
+    'qreg q[1];\nfoo q[0];',
+    'qreg q[1];\nrx q[0];',
+    'qreg q[2];\ncx q[0], q[0];',
+    'qreg q[1];\nreset q[0];',
+    'qreg q[1];\nh q[1];',
+    'qreg q[1];\nh q[0];\nqreg r[1];',
+    'qreg q[1];\nrz(__import__) q[0];',
+])
+def test_invalid(source):
+    with pytest.raises(ValueError):
+        QasmImporter().loads(source)
@@ -0,0 +1,53 @@
+from math import pi
+
+import pytest
+
+from gopt.circuit import Circuit
+from gopt.graph.RegisterSimulator import RegisterSimulator
+
+from . import build, graph_state, register_size
+from .statevector import distance, probabilities
+
+CIRCUITS = [
+    (2, [('h', 0), ('cnot', 0, 1)]),
+    (3, [('h', 0), ('cnot', 0, 1), ('cnot', 1, 2), ('t', 2), ('h', 2)]),
+    (2, [('rx', 0, 0.3), ('h', 1), ('t', 1), ('h', 1), ('cz', 0, 1), ('rx', 1, pi / 2)]),
+    (1, [('h', 0), ('t', 0), ('h', 0), ('s', 0), ('rx', 0, 0.3)]),
+    (3, [('rx', 0, 0.3), ('cnot', 0, 1), ('h', 1), ('t', 1), ('h', 1), ('cnot', 1, 2), ('rx', 2, pi / 4)]),
+]
+
+
+@pytest.mark.parametrize('size, gates', CIRCUITS)
+def test_samples_statevector(size, gates):
+    state = build(Circuit(size), gates).to_graph_state()
+    state.eliminate_pauli()
+    counts = RegisterSimulator(state, seed=0).run(20000)
+    assert distance(counts, probabilities(size, gates)) < 0.02
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_samples_as_qiskit(seed):
+    pytest.importorskip('qiskit_aer')
+    state = graph_state(seed, size=3, depth=30)
+    expected = state.run(4000, backend='qiskit')
+    counts = RegisterSimulator(state, seed=seed).run(4000)
+    assert distance(counts, {key: count / 4000 for key, count in expected.items()}) < 0.06
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_register_size(seed):
+    state = graph_state(seed)
+    sequence, reg_size = state.schedule()
+    simulator = RegisterSimulator(state, sequence=list(reversed(sequence)))
+    assert simulator.reg_size == register_size(state.geometry.G, {}, simulator.sequence)
+    assert RegisterSimulator(state).reg_size == reg_size
+
+
+def test_chunks_bounded_by_max_amplitudes():
+    state = graph_state(0, size=3, depth=30)
+    simulator = RegisterSimulator(state, seed=0, max_amplitudes=1 << state.schedule()[1])
+    assert simulator._chunk() == 1
+    assert simulator.sample(37).shape == (37, len(simulator.columns))
+    counts = simulator.run(2000)
+    expected = RegisterSimulator(state, seed=1).run(20000)
+    assert distance(counts, {key: count / 20000 for key, count in expected.items()}) < 0.06
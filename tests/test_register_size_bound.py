@@ -0,0 +1,38 @@
+import pytest
+
+from gopt.graph.BranchAndBoundScheduler import BranchAndBoundScheduler
+from gopt.graph.RegisterSizeBound import RegisterSizeBound
+from gopt.optimizers import LCSearch
+from .test_branch_and_bound_scheduler import random_instance
+from .test_lc_search import assert_track_replays
+from . import graph_state
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_bounds_below_optimum(seed):
+    G, dep_map = random_instance(seed, 8)
+    optimum = BranchAndBoundScheduler(G, dep_map).schedule()[1]
+    bounds = [RegisterSizeBound(method)(G) for method in RegisterSizeBound.METHODS]
+    # min_degree <= degeneracy <= mmd+ <= optimum
+    assert bounds == sorted(bounds)
+    assert bounds[-1] <= optimum
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        RegisterSizeBound("treewidth")
+
+
+@pytest.mark.parametrize("prefilter", ["min_degree", "degeneracy", "mmd+"])
+def test_prefilter_keeps_optimum(prefilter):
+    # Exhaustive searches, so the pruned candidates cannot hide a smaller register
+    state = graph_state(0, 3, 16)
+    reference = LCSearch(state, "reg_size", max_depth=10 ** 6, traverse_all=True, split=None)
+    reference.execute()
+    search = LCSearch(state, "reg_size", max_depth=10 ** 6, traverse_all=True, split=None, prefilter=prefilter)
+    search.execute()
+    assert_track_replays(search, state)
+    assert search.min_reg_size == reference.min_reg_size
+    for metrics in search.track.values():
+        if "reg_size_bound" in metrics:
+            assert "reg_size" not in metrics and metrics["reg_size_bound"] > search.min_reg_size
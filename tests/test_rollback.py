@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from gopt.graph.IncrementalScheduler import IncrementalScheduler
+from . import graph_state, state_of
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_rollback_is_exact(seed):
+    state = graph_state(seed)
+    before = state_of(state)
+    rng = random.Random(seed)
+    checkpoint = state.checkpoint()
+    for _ in range(10):
+        state.local_complement(rng.choice(state.geometry.nodes()), rng.choice([1, -1]))
+    state.rollback(checkpoint)
+    assert state_of(state) == before
+    assert state.recording
+    state.commit()
+    assert not state.recording
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_nested_rollback(seed):
+    state = graph_state(seed)
+    rng = random.Random(seed)
+    outer = state.checkpoint()
+    state.apply([rng.choice(state.geometry.nodes()) for _ in range(4)])
+    middle = state_of(state)
+    inner = state.checkpoint()
+    moves = [rng.choice(state.geometry.nodes()) for _ in range(4)]
+    state.apply(moves)
+    # Latest first
+    assert state.rollback(inner) == moves[::-1]
+    assert state_of(state) == middle
+    state.rollback(outer)
+    assert state_of(state) == state_of(graph_state(seed))
+
+
+def test_rollback_without_checkpoint():
+    state = graph_state(0)
+    with pytest.raises(ValueError):
+        state.rollback()
+    with pytest.raises(ValueError):
+        IncrementalScheduler(state).rollback(0)
+
+
+@pytest.mark.parametrize("recording", [False, True])
+def test_scheduler_leaves_frames(recording):
+    state = graph_state(1)
+    before = state_of(state)
+    if recording:
+        state.checkpoint()
+    scheduler = IncrementalScheduler(state)
+    rng = random.Random(1)
+    nodes = [rng.choice(state.geometry.nodes()) for _ in range(5)]
+    for node in nodes:
+        scheduler.local_complement(node)
+    # Geometry only, whether or not the graph state records
+    assert state_of(state)[2:] == before[2:]
+    for node in reversed(nodes):
+        scheduler.local_complement(node)
+    assert state_of(state) == before
+    if recording:
+        assert state.rollback() == []
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_scheduler_rollback_inside_open_checkpoint(seed):
+    state = graph_state(seed)
+    before = state_of(state)
+    rng = random.Random(seed)
+    # The caller holds a checkpoint with nothing logged yet
+    outer = state.checkpoint()
+    scheduler = IncrementalScheduler(state)
+    first = scheduler.checkpoint()
+    second = scheduler.checkpoint()
+    assert first == second == 0
+    for _ in range(3):
+        scheduler.local_complement(rng.choice(state.geometry.nodes()))
+    scheduler.rollback(second)
+    scheduler.local_complement(rng.choice(state.geometry.nodes()))
+    scheduler.rollback(first)
+    assert state_of(state) == before
+    assert scheduler.schedule() == state.schedule()
+    state.apply([rng.choice(state.geometry.nodes()) for _ in range(3)])
+    state.rollback(outer)
+    assert state_of(state) == before
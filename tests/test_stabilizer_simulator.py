@@ -0,0 +1,78 @@
+import itertools
+from math import pi
+
+import pytest
+
+from gopt.circuit import Circuit
+from gopt.graph.RegisterSimulator import RegisterSimulator
+from gopt.graph.StabilizerSimulator import StabilizerSimulator
+
+from . import build, graph_state, random_gates
+from .statevector import distance, probabilities
+from .test_register_simulator import CIRCUITS
+
+
+def clifford_state(seed: int, size: int = 3, depth: int = 40):
+    gates = [gate for gate in random_gates(size, depth, seed)
+             if gate[0] != 't' and not (gate[0] == 'rx' and gate[2] not in (pi / 2, pi))]
+    retval = build(Circuit(size), gates).to_graph_state()
+    retval.eliminate_pauli()
+    return retval
+
+
+def frequencies(counts: dict) -> dict:
+    shots = sum(counts.values())
+    return {key: count / shots for key, count in counts.items()}
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_clifford_samples_as_register_simulator(seed):
+    state = clifford_state(seed)
+    simulator = StabilizerSimulator(state, seed=seed)
+    assert simulator.clifford and not simulator.sum_over_terms
+    expected = RegisterSimulator(state, seed=seed + 1).run(20000)
+    assert distance(simulator.run(4000), frequencies(expected)) < 0.05
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_clifford_samples_as_qiskit(seed):
+    pytest.importorskip('qiskit_aer')
+    state = clifford_state(seed)
+    expected = state.run(4000, backend='qiskit')
+    counts = StabilizerSimulator(state, seed=seed).run(4000)
+    assert distance(counts, frequencies(expected)) < 0.06
+
+
+@pytest.mark.parametrize('size, gates', CIRCUITS)
+def test_sum_over_terms_samples_statevector(size, gates):
+    state = build(Circuit(size), gates).to_graph_state()
+    state.eliminate_pauli()
+    simulator = StabilizerSimulator(state, seed=0)
+    # Take the sum over stabilizer terms whatever the register size
+    simulator.sum_over_terms = not simulator.clifford
+    assert distance(simulator.run(20000), probabilities(size, gates)) < 0.02
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_sum_over_terms_samples_as_qiskit(seed):
+    pytest.importorskip('qiskit_aer')
+    state = graph_state(seed, size=3, depth=30)
+    expected = state.run(4000, backend='qiskit')
+    simulator = StabilizerSimulator(state, seed=seed)
+    simulator.sum_over_terms = True
+    assert simulator.non_clifford > 0
+    assert distance(simulator.run(4000), frequencies(expected)) < 0.06
+
+
+def test_routing():
+    size = 10
+    cz = [('cz', a, b) for a, b in itertools.combinations(range(size), 2)]
+    gates = [('h', q) for q in range(size)] + cz + [('t', 0)] + cz + [('h', q) for q in range(size)]
+    state = build(Circuit(size), gates).to_graph_state()
+    state.eliminate_pauli()
+    simulator = StabilizerSimulator(state, seed=0)
+    assert simulator.non_clifford == 1 and simulator.sum_over_terms
+    assert sum(simulator.run(100).values()) == 100
+    assert not StabilizerSimulator(state, max_terms=1).sum_over_terms
+    # Small registers are cheaper as statevectors
+    assert not StabilizerSimulator(graph_state(0, size=3, depth=30)).sum_over_terms
@@ -0,0 +1,36 @@
+import pytest
+
+from gopt.circuit import Circuit, StreamingCircuit
+
+from . import build, random_gates
+from .statevector import distance
+
+
+def circuits(seed: int, depth: int):
+    size = 1 + seed % 3
+    gates = list(random_gates(size, depth, seed))
+    whole = build(Circuit(size), gates).to_graph_state()
+    whole.eliminate_pauli()
+    streaming = StreamingCircuit(size, horizon=2 + seed % 3, batch=1 + seed % 4).consume(gates)
+    return whole, streaming
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_same_nodes_and_dependencies(seed):
+    whole, streaming = circuits(seed, 200)
+    graph_state = streaming.to_graph_state()
+    assert set(graph_state.geometry.nodes()) == set(whole.geometry.nodes())
+    assert {node: set(sources) for node, sources in graph_state.dependency.dep_map.items()} == \
+           {node: set(sources) for node, sources in whole.dependency.dep_map.items()}
+
+
+def test_deep_circuits_fold():
+    assert all(circuits(seed, 200)[1]._parity_count > 0 for seed in range(8))
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_samples_as_whole_circuit(seed):
+    whole, streaming = circuits(seed, 80)
+    expected = whole.run(4000, seed=seed)
+    counts = streaming.to_graph_state().run(4000, seed=seed + 1)
+    assert distance(counts, {key: count / 4000 for key, count in expected.items()}) < 0.06